@@ -0,0 +1,23 @@
+"""
+Health probes.
+"""
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.services import startup
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get(
+    "/ready",
+    summary="Readiness probe",
+    description=(
+        "200 once the store is initialized and warm-up has finished, 503 before "
+        "(and after shutdown has begun). The body reports startup progress."
+    ),
+    responses={200: {"description": "Ready"}, 503: {"description": "Starting or warming up"}},
+)
+async def readiness() -> JSONResponse:
+    ready, progress = startup.readiness()
+    return JSONResponse(status_code=200 if ready else 503, content=progress)
@@ -0,0 +1,23 @@
+"""
+Prometheus scrape endpoint.
+"""
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.metrics import render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get(
+    "/metrics",
+    summary="Prometheus metrics",
+    description=(
+        "Per-stage search latency histograms (`search_stage_duration_seconds`), "
+        "labelled by stage, org and filter shape, search response counts and "
+        "startup phase durations, in Prometheus text format."
+    ),
+    response_class=PlainTextResponse,
+)
+async def prometheus_metrics() -> PlainTextResponse:
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
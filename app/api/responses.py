@@ -0,0 +1,52 @@
+"""
+Fast JSON encoding and conditional-GET helpers for search responses.
+
+Items are already projected, in org column order, by the search service,
+so they can be encoded directly. This skips the second pydantic validation
+and serialization pass that FastAPI applies for `response_model`; the route
+keeps `response_model` so the OpenAPI schema is unchanged.
+"""
+import json
+
+from fastapi.responses import Response
+
+from app.schemas.employee import EmployeeSearchResponse
+
+try:  # Optional accelerator; the stdlib encoder produces the same bytes.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+_FIELDS = tuple(EmployeeSearchResponse.model_fields)
+
+
+def _dumps(payload: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(
+        payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def encode_search_response(response: EmployeeSearchResponse) -> bytes:
+    """JSON bytes for `response`, field for field like the response_model output."""
+    return _dumps({field: getattr(response, field) for field in _FIELDS})
+
+
+def fast_search_response(response: EmployeeSearchResponse) -> Response:
+    """Pre-encoded `application/json` response for `response`."""
+    return Response(content=encode_search_response(response), media_type="application/json")
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header value matches `etag` (weak comparison, per RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def not_modified(headers: dict[str, str]) -> Response:
+    """Empty 304 response carrying the validator and caching headers."""
+    return Response(status_code=304, headers=headers)
@@ -0,0 +1,54 @@
+"""
+Operational endpoints (cache statistics and similar diagnostics).
+"""
+from fastapi import APIRouter, Query
+
+from app.services.employee_search import EmployeeSearchService
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get(
+    "/search-cache",
+    summary="Search cache statistics",
+    description="Hit, miss, eviction and expiry counters of the in-process search result cache.",
+)
+async def search_cache_stats() -> dict[str, int]:
+    return EmployeeSearchService.cache_stats()
+
+
+@router.get(
+    "/search-coalescing",
+    summary="Search coalescing statistics",
+    description=(
+        "Searches executed, searches that joined an identical one already running "
+        "(coalesced), and searches running now."
+    ),
+)
+async def search_coalescing_stats() -> dict[str, int]:
+    return EmployeeSearchService.coalescing_stats()
+
+
+@router.get(
+    "/name-index",
+    summary="Autocomplete index statistics",
+    description="Loaded orgs, indexed entries, loads and LRU evictions of the name autocomplete index.",
+)
+async def name_index_stats() -> dict[str, int]:
+    return EmployeeSearchService.name_index_stats()
+
+
+@router.get(
+    "/slow-queries",
+    summary="Slow store queries",
+    description=(
+        "Recent store queries over `StoreConfig.slow_query_ms`, newest first, with the "
+        "normalized SQL, parameter types, row count, duration and EXPLAIN QUERY PLAN. "
+        "`full_scan` marks plans that read the employees table without an index."
+    ),
+)
+async def slow_queries(
+    full_scan_only: bool = Query(False, description="Only queries with a full table scan"),
+    limit: int = Query(50, ge=1, le=1000, description="Maximum entries"),
+) -> dict:
+    return EmployeeSearchService.slow_queries(full_scan_only, limit)
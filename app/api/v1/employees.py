@@ -1,18 +1,45 @@
 """
 Search Employee API.
 """
+import math
+
 from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import Response, StreamingResponse
 
-from app.middleware.rate_limit import check_rate_limit
-from app.schemas.employee import EmployeeSearchRequest, EmployeeSearchResponse
+from app import metrics
+from app.api.responses import etag_matches, fast_search_response, not_modified
+from app.config import RATE_LIMIT_CONFIG, RESPONSE_CONFIG
+from app.middleware.rate_limit import check_rate_limit_async
+from app.schemas.employee import (
+    CountMode,
+    EmployeeAutocompleteRequest,
+    EmployeeAutocompleteResponse,
+    EmployeeBatchSearchRequest,
+    EmployeeBatchSearchResponse,
+    EmployeeExportRequest,
+    EmployeeFacetsRequest,
+    EmployeeFacetsResponse,
+    EmployeeSearchRequest,
+    EmployeeSearchResponse,
+    FacetField,
+    MatchMode,
+    SortField,
+    SortOrder,
+)
 from app.services.employee_search import EmployeeSearchService
 
 router = APIRouter(prefix="/employees", tags=["employees"])
 
 
+async def _rate_limit(request: Request, org_id: str, cost: int = 1) -> None:
+    """Charge `cost` requests to the org's rate limit, timed as the `rate_limit` stage."""
+    with metrics.stage("rate_limit"):
+        await check_rate_limit_async(request, org_id, cost)
+
+
 async def verify_rate_limit(request: Request, org_id: str = Query(...)) -> str:
     """Dependency: check rate limit by org_id, return org_id for route."""
-    check_rate_limit(request, org_id)
+    await _rate_limit(request, org_id)
     return org_id
 
 
@@ -23,11 +50,16 @@ async def verify_rate_limit(request: Request, org_id: str = Query(...)) -> str:
     description="Search employees with filters. Returns only columns configured for the organization.",
     responses={
         200: {"description": "Success"},
+        304: {"description": "Not modified since the page with the If-None-Match ETag"},
+        400: {"description": "Invalid cursor or sort, or fuzzy match without a name"},
         429: {"description": "Rate limit exceeded"},
+        503: {"description": "Search backend overloaded"},
+        504: {"description": "Search ran past its time budget and was cancelled"},
     },
 )
 async def search_employees(
     request: Request,
+    response: Response,
     org_id: str = Depends(verify_rate_limit),
     name: str | None = Query(None, description="Partial match on name"),
     department: str | None = Query(None, description="Exact match on department"),
@@ -35,7 +67,15 @@ async def search_employees(
     position: str | None = Query(None, description="Exact match on position"),
     limit: int = Query(20, ge=1, le=100, description="Page size"),
     offset: int = Query(0, ge=0, description="Offset for pagination"),
-) -> EmployeeSearchResponse:
+    cursor: str | None = Query(None, description="Keyset cursor from a previous next_cursor"),
+    count: CountMode = Query("exact", description="Total count mode: exact, estimate or none"),
+    match: MatchMode = Query("substring", description="Name matching: substring or fuzzy"),
+    sort: SortField = Query("id", description="Sort column (ties broken by id)"),
+    order: SortOrder = Query("asc", description="Sort direction: asc or desc"),
+    timeout_ms: int | None = Query(
+        None, ge=1, description="Time budget in ms; can only tighten the server default"
+    ),
+) -> EmployeeSearchResponse | Response:
     """
     Search employees within an organization.
 
@@ -43,6 +83,18 @@ async def search_employees(
     - **name**: Optional partial match (case-insensitive).
     - **department**, **location**, **position**: Optional exact match.
     - **limit**, **offset**: Pagination.
+    - **cursor**: Keyset pagination; pass the previous page's `next_cursor`.
+    - **count**: `exact` (COUNT query), `estimate` (cached statistics) or `none` (skip; use `has_more`).
+    - **match**: `substring` (default) or `fuzzy`: typo-tolerant, ranked by name similarity then id;
+      page with offset (no cursor).
+    - **sort**, **order**: Order by `id` (default), `name`, `department`, `location` or
+      `position` (ties by id), `asc` or `desc`; only columns the organization shows.
+      Cursors continue in the same order.
+    - **timeout_ms**: Time budget; store queries still running when it is spent are
+      cancelled and the API answers 504. Capped by the server's `search_timeout_ms`.
+
+    Responses carry an `ETag`; send it back as `If-None-Match` to get `304 Not Modified`
+    (no body, no search work) while the org's data and the page are unchanged.
 
     Response fields depend on organization column config.
     """
@@ -54,5 +106,168 @@ async def search_employees(
         position=position,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        count=count,
+        match=match,
+        sort=sort,
+        order=order,
+        timeout_ms=timeout_ms,
+    )
+    headers = {}
+    if RESPONSE_CONFIG.cache_control:
+        headers["Cache-Control"] = RESPONSE_CONFIG.cache_control
+    if RESPONSE_CONFIG.etag:
+        # Taken before the search runs, so the page is never older than its ETag.
+        headers["ETag"] = await EmployeeSearchService.search_etag_async(req)
+        if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return not_modified(headers)
+    result = await EmployeeSearchService.search_async(req)
+    # Encoding (here or by FastAPI after we return) runs until the response starts.
+    metrics.start_stage("serialize")
+    if RESPONSE_CONFIG.fast_json:
+        fast = fast_search_response(result)
+        fast.headers.update(headers)
+        return fast
+    response.headers.update(headers)
+    return result
+
+
+@router.post(
+    "/search/batch",
+    response_model=EmployeeBatchSearchResponse,
+    summary="Batch search employees",
+    description=(
+        "Run up to 50 searches for one organization in a single request. "
+        "Results are returned in request order."
+    ),
+    responses={
+        200: {"description": "Success"},
+        400: {"description": "Entry for another organization, or invalid cursor"},
+        429: {"description": "Rate limit exceeded"},
+        503: {"description": "Search backend overloaded"},
+        504: {"description": "Batch ran past its time budget and was cancelled"},
+    },
+)
+async def batch_search_employees(
+    request: Request,
+    body: EmployeeBatchSearchRequest,
+    org_id: str = Query(..., description="Organization ID; every search must use it"),
+) -> EmployeeBatchSearchResponse:
+    """
+    Search employees with several filter sets at once.
+
+    Each entry takes the same fields as `/search` and gets the same response.
+    The batch is charged one request per `batch_searches_per_request`
+    searches (rounded up) against the org's rate limit.
+    """
+    cost = math.ceil(len(body.searches) / RATE_LIMIT_CONFIG.batch_searches_per_request)
+    await _rate_limit(request, org_id, cost)
+    return await EmployeeSearchService.search_batch_async(org_id, body.searches)
+
+
+@router.get(
+    "/autocomplete",
+    response_model=EmployeeAutocompleteResponse,
+    summary="Autocomplete employee names",
+    description=(
+        "Up to `limit` employees with a name word starting with `q`, served from "
+        "an in-memory per-org index. Returns only columns configured for the organization."
+    ),
+    responses={
+        200: {"description": "Success"},
+        400: {"description": "Name not visible to the organization"},
+        429: {"description": "Rate limit exceeded"},
+        503: {"description": "Search backend overloaded"},
+    },
+)
+async def autocomplete_employees(
+    org_id: str = Depends(verify_rate_limit),
+    q: str = Query(..., min_length=1, max_length=100, description="Prefix of any word of the name"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum suggestions"),
+) -> EmployeeAutocompleteResponse:
+    """
+    Typeahead for people-pickers: `smi` matches "John Smith", `john s` too.
+    Whole-name prefix matches come first, then later-word matches.
+    """
+    req = EmployeeAutocompleteRequest(org_id=org_id, q=q, limit=limit)
+    return await EmployeeSearchService.autocomplete_async(req)
+
+
+@router.get(
+    "/export",
+    summary="Export employees as NDJSON",
+    description=(
+        "Stream every employee matching the filters as newline-delimited JSON. "
+        "Returns only columns configured for the organization."
+    ),
+    response_class=StreamingResponse,
+    responses={
+        200: {"description": "NDJSON stream", "content": {"application/x-ndjson": {}}},
+        429: {"description": "Rate limit exceeded"},
+        503: {"description": "Every export connection is busy, or the backend is overloaded"},
+    },
+)
+async def export_employees(
+    org_id: str = Depends(verify_rate_limit),
+    name: str | None = Query(None, description="Partial match on name"),
+    department: str | None = Query(None, description="Exact match on department"),
+    location: str | None = Query(None, description="Exact match on location"),
+    position: str | None = Query(None, description="Exact match on position"),
+) -> StreamingResponse:
+    """
+    Export the whole filtered result set for an organization.
+
+    The export is read through one server-side cursor on a connection
+    reserved for exports and streamed in batches, and counts as a single
+    request against the rate limit.
+    """
+    req = EmployeeExportRequest(
+        org_id=org_id,
+        name=name,
+        department=department,
+        location=location,
+        position=position,
+    )
+    return StreamingResponse(
+        await EmployeeSearchService.export_ndjson_async(req), media_type="application/x-ndjson"
+    )
+
+
+@router.get(
+    "/facets",
+    response_model=EmployeeFacetsResponse,
+    summary="Facet counts",
+    description=(
+        "Count matching employees per department, location and/or position "
+        "in a single pass. Only fields visible to the organization can be counted."
+    ),
+    responses={
+        200: {"description": "Success"},
+        400: {"description": "Facet field not visible to the organization"},
+        429: {"description": "Rate limit exceeded"},
+        503: {"description": "Search backend overloaded"},
+        504: {"description": "Counting ran past its time budget and was cancelled"},
+    },
+)
+async def employee_facets(
+    org_id: str = Depends(verify_rate_limit),
+    name: str | None = Query(None, description="Partial match on name"),
+    department: str | None = Query(None, description="Exact match on department"),
+    location: str | None = Query(None, description="Exact match on location"),
+    position: str | None = Query(None, description="Exact match on position"),
+    fields: list[FacetField] | None = Query(
+        None, description="Facet fields to count (repeatable); defaults to all visible ones"
+    ),
+) -> EmployeeFacetsResponse:
+    """
+    Facet histograms for filter sidebars, over the same filters as search.
+    """
+    req = EmployeeFacetsRequest(
+        org_id=org_id,
+        name=name,
+        department=department,
+        location=location,
+        position=position,
+        fields=fields,
     )
-    return EmployeeSearchService.search(req)
+    return await EmployeeSearchService.facets_async(req)
@@ -9,6 +9,174 @@ class RateLimitConfig:
     # You can edit these constants directly if needed.
     requests_per_minute: int = 2
     window_seconds: int = 60
+    # "sliding_window" (exact, one timestamp per request) or "gcra"
+    # (constant memory per key, lock-striped).
+    algorithm: str = "sliding_window"
+    # Lock stripes for the gcra limiter.
+    shards: int = 16
+    # How often the background sweeper evicts idle keys.
+    idle_sweep_interval_seconds: float = 60.0
+    # Where limiter state lives: "memory" (per process) or "sqlite" (shared by
+    # all workers on the host, GCRA only, survives restarts).
+    backend: str = "memory"
+    # SQLite file for the shared backend; empty means a file in the temp dir.
+    shared_db_path: str = ""
+    # How long a shared-backend check waits on a locked database. Checks run
+    # on a worker thread, but each one holds it for up to this long.
+    shared_busy_timeout_ms: int = 50
+    # When the shared database stays locked or fails: True admits the
+    # request (an outage never blocks traffic), False rejects it with 429.
+    shared_fail_open: bool = True
+    # A batch search is charged ceil(searches / batch_searches_per_request)
+    # requests against the quota.
+    batch_searches_per_request: int = 25
+
+
+@dataclass(frozen=True)
+class StoreConfig:
+    """SQLite store settings (hard-coded defaults)."""
+
+    # Read engine: "sqlite" (queries run in SQLite) or "memory" (orgs are
+    # loaded into columnar, bitmap-indexed segments; SQLite keeps the data).
+    engine: str = "sqlite"
+    # The memory engine keeps the segments of the most recently used orgs, up
+    # to both limits. An org over memory_max_rows is still served, not kept.
+    memory_max_orgs: int = 256
+    memory_max_rows: int = 5_000_000
+    # Number of long-lived read-only connections kept open by the pool.
+    pool_size: int = 8
+    # Seconds to wait for a free pooled connection before giving up.
+    pool_timeout_seconds: float = 5.0
+    # Streaming exports hold a connection until the client has read the whole
+    # stream, so they get their own connections, separate from pool_size and
+    # the query executor. More concurrent exports wait this long, then get 503.
+    export_pool_size: int = 2
+    export_pool_timeout_seconds: float = 1.0
+    # Prepared statements cached per connection (sqlite3 `cached_statements`).
+    statement_cache_size: int = 256
+    # PRAGMA values applied to every pooled connection.
+    mmap_size_bytes: int = 256 * 1024 * 1024
+    cache_size_kib: int = 64 * 1024
+    busy_timeout_ms: int = 5000
+    # Queries run on a dedicated thread pool sized like the connection pool.
+    # Requests beyond pool_size running + executor_queue_limit waiting get 503.
+    executor_queue_limit: int = 64
+    # Bulk loads keep the secondary indexes in place until they have written
+    # more than max(bulk_rebuild_min_rows, bulk_rebuild_fraction * rows already
+    # in the table); past that they drop them and rebuild once at the end.
+    bulk_rebuild_min_rows: int = 100_000
+    bulk_rebuild_fraction: float = 0.2
+    # Serve unfiltered facet counts from cached per-org statistics
+    # (invalidated by writes).
+    facet_cache: bool = True
+    # Queries taking at least this many milliseconds are kept, with their
+    # EXPLAIN QUERY PLAN, in a ring buffer of slow_query_log_size entries
+    # (GET /api/v1/admin/slow-queries). None disables the log.
+    slow_query_ms: float | None = 100.0
+    slow_query_log_size: int = 200
+    # Time budget of a search request, queueing included. Store queries still
+    # running when it is spent are interrupted and the API answers 504.
+    # Requests may ask for less with `timeout_ms`. None disables it.
+    search_timeout_ms: float | None = 5000.0
+    # SQLite VM instructions between deadline checks (progress handler period).
+    deadline_check_ops: int = 10_000
+
+
+@dataclass(frozen=True)
+class SearchCacheConfig:
+    """In-process search result cache (hard-coded defaults)."""
+
+    enabled: bool = True
+    max_entries: int = 10_000
+    # Approximate memory cap for cached result pages.
+    max_bytes: int = 64 * 1024 * 1024
+    ttl_seconds: float = 30.0
+
+
+@dataclass(frozen=True)
+class SearchCoalescingConfig:
+    """Single-flight settings for identical concurrent searches (hard-coded defaults)."""
+
+    # Searches with the same normalized filters, count/match mode and data
+    # version that arrive while one is running wait for and share its result.
+    enabled: bool = True
+
+
+@dataclass(frozen=True)
+class AutocompleteConfig:
+    """Name autocomplete index settings (hard-coded defaults)."""
+
+    # Per-org prefix indexes are kept for the most recently used orgs, up to
+    # both limits (an entry is one word start of one employee's name).
+    max_orgs: int = 256
+    max_entries: int = 2_000_000
+
+
+@dataclass(frozen=True)
+class FuzzySearchConfig:
+    """Typo-tolerant name search settings (hard-coded defaults)."""
+
+    # Minimum trigram Dice similarity for a name to match.
+    min_similarity: float = 0.3
+    # Per-org trigram indexes kept in memory (an entry is one name trigram).
+    max_orgs: int = 32
+    max_entries: int = 50_000_000
+
+
+@dataclass(frozen=True)
+class ResponseConfig:
+    """Response serialization settings (hard-coded defaults)."""
+
+    # Opt-in: encode search responses straight to JSON bytes instead of
+    # re-validating them through the pydantic response_model.
+    fast_json: bool = False
+    # Search responses carry a strong ETag derived from the org's data
+    # version; a matching If-None-Match is answered with 304 Not Modified.
+    etag: bool = True
+    # Cache-Control sent with search responses (and 304s); "" sends none.
+    # "no-cache" lets clients store pages but revalidate them with the ETag.
+    cache_control: str = "private, no-cache"
+
+
+@dataclass(frozen=True)
+class MetricsConfig:
+    """Per-stage search latency metrics (hard-coded defaults)."""
+
+    # Time the stages of each search (rate limit, executor queue, connection
+    # acquire, COUNT, page query, projection, serialization) into histograms
+    # served at /metrics.
+    enabled: bool = True
+    # Opt-in: send each request's stage breakdown back in a Server-Timing header.
+    server_timing: bool = False
+    # Orgs get their own label values up to this many; the rest share "other".
+    max_org_labels: int = 100
+    # Histogram bucket upper bounds, in seconds.
+    buckets: tuple[float, ...] = (
+        0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+    )
+
+
+@dataclass(frozen=True)
+class StartupConfig:
+    """Store initialization and warm-up at startup (hard-coded defaults)."""
+
+    # After the DB is initialized, warm the largest orgs: read their index
+    # ranges, cache their statistics and compile their column projections.
+    warmup: bool = True
+    # How many of the largest orgs to warm, after any listed in warmup_orgs.
+    warmup_top_orgs: int = 20
+    warmup_orgs: tuple[str, ...] = ()
+    # Warm in a background thread: requests are served meanwhile and
+    # /health/ready answers 503 until warm-up has finished.
+    warmup_in_background: bool = True
 
 
 RATE_LIMIT_CONFIG = RateLimitConfig()
+STORE_CONFIG = StoreConfig()
+SEARCH_CACHE_CONFIG = SearchCacheConfig()
+SEARCH_COALESCING_CONFIG = SearchCoalescingConfig()
+AUTOCOMPLETE_CONFIG = AutocompleteConfig()
+FUZZY_SEARCH_CONFIG = FuzzySearchConfig()
+RESPONSE_CONFIG = ResponseConfig()
+METRICS_CONFIG = MetricsConfig()
+STARTUP_CONFIG = StartupConfig()
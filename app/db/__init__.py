@@ -1,3 +1,15 @@
-from app.db.sqlite_store import SQLiteEmployeeStore, get_employee_store
+from app.db.filters import SearchFilters
+from app.db.memory_store import InMemoryEmployeeStore
+from app.db.sqlite_store import (
+    SQLiteEmployeeStore,
+    close_employee_store,
+    get_employee_store,
+)
 
-__all__ = ["SQLiteEmployeeStore", "get_employee_store"]
+__all__ = [
+    "InMemoryEmployeeStore",
+    "SearchFilters",
+    "SQLiteEmployeeStore",
+    "close_employee_store",
+    "get_employee_store",
+]
@@ -0,0 +1,99 @@
+"""
+Async facade over the blocking SQLite store.
+
+Queries run on a dedicated thread pool with one worker per pooled
+connection, so a worker never waits for a connection and the event loop
+never blocks on `sqlite3`. Work beyond the running workers plus a bounded
+queue is rejected with `StoreOverloaded` instead of piling up latency.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from app import metrics
+from app.config import STORE_CONFIG, StoreConfig
+from app.db.sqlite_store import SearchFilters, SQLiteEmployeeStore, get_employee_store
+from app.models.employee import Employee
+
+T = TypeVar("T")
+
+
+class StoreOverloaded(Exception):
+    """Raised when the query executor's queue is full."""
+
+
+class AsyncEmployeeStore:
+    """Runs store calls on a bounded executor; awaitable from the event loop."""
+
+    def __init__(self, store: SQLiteEmployeeStore, config: StoreConfig = STORE_CONFIG) -> None:
+        self.store = store
+        self.max_workers = config.pool_size
+        self.capacity = config.pool_size + config.executor_queue_limit
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="employee-store"
+        )
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        """Calls currently running or queued."""
+        return self._in_flight
+
+    def _release(self, _future: object = None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run `fn(*args)` on the store executor, or raise StoreOverloaded."""
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                raise StoreOverloaded()
+            self._in_flight += 1
+        try:
+            # Carry the request context (stage timings) onto the worker thread.
+            future = self._executor.submit(metrics.propagate(fn), *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    async def search(self, filters: SearchFilters) -> tuple[list[Employee], int | None]:
+        return await self.run(self.store.search, filters)
+
+    async def estimate_count(self, filters: SearchFilters) -> int | None:
+        return await self.run(self.store.estimate_count, filters)
+
+    def close(self) -> None:
+        """Stop accepting work and wait for running queries."""
+        self._executor.shutdown(wait=True)
+
+
+_async_store: AsyncEmployeeStore | None = None
+_async_store_lock = threading.Lock()
+
+
+def get_async_employee_store() -> AsyncEmployeeStore:
+    """Singleton async facade over `get_employee_store()`."""
+    global _async_store
+    store = get_employee_store()
+    if _async_store is None or _async_store.store is not store:
+        with _async_store_lock:
+            if _async_store is None or _async_store.store is not store:
+                if _async_store is not None:
+                    _async_store._executor.shutdown(wait=False)
+                _async_store = AsyncEmployeeStore(store)
+    return _async_store
+
+
+def close_async_employee_store() -> None:
+    """Shut down the executor (called at shutdown)."""
+    global _async_store
+    if _async_store is not None:
+        _async_store.close()
+        _async_store = None
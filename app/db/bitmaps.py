@@ -0,0 +1,58 @@
+"""
+Row bitmaps as Python ints: bit i is set when row i is in the set.
+
+AND/OR/popcount run in C over the whole bitmap, which makes plain ints a
+dependency-free stand-in for a bitmap index at a few million rows.
+"""
+from collections.abc import Iterable, Iterator
+
+
+def mask_of(indexes: Iterable[int], size: int) -> int:
+    """Bitmap with the given row indexes set."""
+    bits = bytearray((size + 7) // 8)
+    for i in indexes:
+        bits[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bits, "little")
+
+
+def set_bits(mask: int, size: int, skip: int = 0) -> Iterator[int]:
+    """Row indexes set in `mask`, ascending, after skipping the first `skip`."""
+    words = memoryview(mask.to_bytes(((size + 63) // 64) * 8, "little")).cast("Q")
+    for w, word in enumerate(words):
+        if not word:
+            continue
+        if skip:
+            n = word.bit_count()
+            if n <= skip:
+                skip -= n
+                continue
+        base = w * 64
+        while word:
+            low = word & -word
+            word ^= low
+            if skip:
+                skip -= 1
+                continue
+            yield base + low.bit_length() - 1
+
+
+def set_bits_desc(mask: int, size: int, skip: int = 0) -> Iterator[int]:
+    """Row indexes set in `mask`, descending, after skipping the first `skip`."""
+    words = memoryview(mask.to_bytes(((size + 63) // 64) * 8, "little")).cast("Q")
+    for w in range(len(words) - 1, -1, -1):
+        word = words[w]
+        if not word:
+            continue
+        if skip:
+            n = word.bit_count()
+            if n <= skip:
+                skip -= n
+                continue
+        base = w * 64
+        while word:
+            high = word.bit_length() - 1
+            word ^= 1 << high
+            if skip:
+                skip -= 1
+                continue
+            yield base + high
@@ -0,0 +1,77 @@
+"""
+Per-request time budgets for store queries.
+
+The search service opens a budget with `time_budget(ms)`; the deadline
+lives in a context variable, so it follows the request onto the store
+executor (see `app.metrics.propagate`). `SQLiteEmployeeStore` checks it
+before each query and, while a query runs, from an `sqlite3` progress
+handler every `StoreConfig.deadline_check_ops` VM instructions: once the
+deadline has passed the handler aborts the statement and the store raises
+`QueryTimeout`.
+"""
+from __future__ import annotations
+
+import contextvars
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import NamedTuple
+
+
+class QueryTimeout(Exception):
+    """Raised when a store query runs past the request's deadline."""
+
+    def __init__(self, query: str, budget_ms: float, elapsed_ms: float, vm_steps: int) -> None:
+        super().__init__(f"{query} query aborted after {elapsed_ms:.0f}ms (budget {budget_ms:g}ms)")
+        # Which store query was aborted (count, page, ...), or skipped when
+        # the budget was already spent before it started.
+        self.query = query
+        self.budget_ms = budget_ms
+        # Time since the budget opened (queueing included).
+        self.elapsed_ms = elapsed_ms
+        # Approximate VM instructions the aborted query executed.
+        self.vm_steps = vm_steps
+
+
+class Deadline(NamedTuple):
+    """Absolute `time.perf_counter()` deadline and the budget it came from."""
+
+    expires: float
+    budget_ms: float
+
+    def elapsed_ms(self, now: float | None = None) -> float:
+        now = time.perf_counter() if now is None else now
+        return (now - self.expires) * 1000 + self.budget_ms
+
+
+_deadline: contextvars.ContextVar[Deadline | None] = contextvars.ContextVar(
+    "query_deadline", default=None
+)
+
+
+def current_deadline() -> Deadline | None:
+    """Deadline of the current request, or None when it has no budget."""
+    return _deadline.get()
+
+
+@contextmanager
+def time_budget(budget_ms: float | None) -> Iterator[Deadline | None]:
+    """Give the store queries run in this context `budget_ms` from now (None: no limit)."""
+    if budget_ms is None:
+        yield None
+        return
+    deadline = Deadline(time.perf_counter() + budget_ms / 1000, budget_ms)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def effective_budget_ms(default_ms: float | None, requested_ms: float | None) -> float | None:
+    """The server budget, tightened (never loosened) by a per-request budget."""
+    if requested_ms is None:
+        return default_ms
+    if default_ms is None:
+        return requested_ms
+    return min(default_ms, requested_ms)
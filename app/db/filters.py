@@ -0,0 +1,44 @@
+"""
+Query criteria shared by the store engines.
+"""
+from __future__ import annotations
+
+from typing import NamedTuple
+
+# Columns results can be ordered by; ties are broken by `id`.
+SORT_FIELDS = ("id", "name", "department", "location", "position")
+SORT_ORDERS = ("asc", "desc")
+
+
+class SearchFilters(NamedTuple):
+    """Search criteria applied at DB layer."""
+
+    org_id: str
+    name: str | None = None
+    department: str | None = None
+    location: str | None = None
+    position: str | None = None
+    limit: int = 20
+    offset: int = 0
+    # Keyset pagination: only rows after the (after_key, after_id) position
+    # in sort order (offset must be 0).
+    after_id: str | None = None
+    # Set False to skip the COUNT(*) query (total is returned as None).
+    count_total: bool = True
+    # Result order: a SORT_FIELDS column, then `id`, both in `order`.
+    sort: str = "id"
+    order: str = "asc"
+    # Sort column value of the last row seen; unused when sorting by id.
+    after_key: str | None = None
+
+    def normalized(self) -> SearchFilters:
+        """
+        Canonical form for cache keys and cursor fingerprints: empty strings
+        mean "no filter", and the name match is case-insensitive.
+        """
+        return self._replace(
+            name=self.name.lower() if self.name else None,
+            department=self.department or None,
+            location=self.location or None,
+            position=self.position or None,
+        )
@@ -0,0 +1,141 @@
+"""
+Streaming bulk loader for the employee store.
+
+Reads CSV (with a header row) or NDJSON through a generator pipeline
+(read -> validate -> batch -> upsert), so memory stays flat regardless of
+input size. Each batch commits on its own; if a bad record stops the load,
+the batches before it stay loaded.
+
+    python -m app.db.ingest employees.csv
+    python -m app.db.ingest employees.ndjson --batch-size 100000 --db /data/employees.sqlite3
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+
+from app.db import sqlite_store
+from app.db.models import BulkLoadReport
+from app.db.sqlite_store import EMPLOYEE_COLUMNS, SQLiteEmployeeStore, _init_db
+
+
+class IngestError(ValueError):
+    """Raised for input records that cannot be loaded."""
+
+
+def read_csv(path: Path) -> Iterator[Mapping[str, object]]:
+    """Yield one dict per CSV row (header row required)."""
+    with open(path, newline="", encoding="utf-8") as f:
+        yield from csv.DictReader(f)
+
+
+def read_ndjson(path: Path) -> Iterator[Mapping[str, object]]:
+    """Yield one dict per non-empty NDJSON line."""
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise IngestError(f"line {line_no}: invalid JSON ({exc.msg})") from None
+            if not isinstance(record, dict):
+                raise IngestError(f"line {line_no}: expected a JSON object")
+            yield record
+
+
+def to_rows(records: Iterable[Mapping[str, object]]) -> Iterator[tuple[str, ...]]:
+    """Validate records and convert them to tuples in EMPLOYEE_COLUMNS order."""
+    for n, record in enumerate(records, start=1):
+        row = []
+        for column in EMPLOYEE_COLUMNS:
+            value = record.get(column)
+            if value is None or value == "":
+                raise IngestError(f"record {n}: missing {column!r}")
+            row.append(str(value))
+        yield tuple(row)
+
+
+READERS = {"csv": read_csv, "ndjson": read_ndjson}
+
+
+def detect_format(path: Path) -> str:
+    return "ndjson" if path.suffix.lower() in {".ndjson", ".jsonl"} else "csv"
+
+
+def ingest_file(
+    store: SQLiteEmployeeStore,
+    path: Path,
+    fmt: str | None = None,
+    batch_size: int = 50_000,
+    rebuild_indexes: bool | None = None,
+    progress: bool = False,
+) -> BulkLoadReport:
+    """Stream `path` into `store`; optionally print rows/sec after each batch."""
+    reader = READERS[fmt or detect_format(path)]
+
+    def report(rows: int, seconds: float) -> None:
+        rate = rows / seconds if seconds > 0 else 0.0
+        print(f"  {rows:>12,} rows  {rate:>12,.0f} rows/s", file=sys.stderr)
+
+    return store.bulk_load(
+        to_rows(reader(path)),
+        batch_size=batch_size,
+        rebuild_indexes=rebuild_indexes,
+        on_batch=report if progress else None,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk load employees from CSV or NDJSON.")
+    parser.add_argument("path", type=Path, help="Input file (.csv, .ndjson or .jsonl)")
+    parser.add_argument("--format", choices=sorted(READERS), help="Override format detection")
+    parser.add_argument("--batch-size", type=int, default=50_000, help="Rows per transaction")
+    indexes = parser.add_mutually_exclusive_group()
+    indexes.add_argument(
+        "--rebuild-indexes",
+        dest="rebuild_indexes",
+        action="store_true",
+        default=None,
+        help="Drop indexes for the whole load and rebuild them after "
+        "(default: only once the load turns out large)",
+    )
+    indexes.add_argument(
+        "--keep-indexes",
+        dest="rebuild_indexes",
+        action="store_false",
+        help="Keep indexes in place however large the load",
+    )
+    parser.add_argument("--db", type=Path, default=None, help="SQLite file (default: app DB)")
+    args = parser.parse_args(argv)
+
+    db_path = args.db or sqlite_store.DB_PATH
+    _init_db(db_path, seed=False)
+    store = SQLiteEmployeeStore(db_path)
+    try:
+        report = ingest_file(
+            store,
+            args.path,
+            fmt=args.format,
+            batch_size=args.batch_size,
+            rebuild_indexes=args.rebuild_indexes,
+            progress=True,
+        )
+    except IngestError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        store.close()
+    print(
+        f"Loaded {report.rows:,} rows for {report.orgs:,} orgs in {report.seconds:.1f}s "
+        f"({report.rows_per_second:,.0f} rows/s)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,457 @@
+"""
+In-memory columnar employee store.
+
+Each org is loaded from SQLite on first use into an immutable segment:
+rows sorted by id, `id`/`name`/`email` as plain lists, and `department`,
+`location` and `position` dictionary-encoded to small ints (`array('H')`)
+with the rows of each distinct value: a bitmap for common values, a sorted
+`array` of row indexes for rare ones. Bitmaps are Python ints (see
+`app.db.bitmaps`), so exact-match filters are big-int ANDs, counts are
+`int.bit_count()`, and pages are read by skipping whole 64-bit words.
+Sorted pages walk the values' rows in value order, or a precomputed
+(name, id) permutation of the rows for `name`.
+
+SQLite stays the source of truth: writes go through the backing
+`SQLiteEmployeeStore`, and segments of the orgs they touch are dropped
+and rebuilt on the next read. A segment is also rebuilt once its org's
+data version (`SQLiteEmployeeStore.org_version`) has moved, which catches
+writes made by other processes. Segments are kept for the most recently
+used orgs only, bounded by org count and total rows (`StoreConfig`).
+"""
+from __future__ import annotations
+
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from itertools import islice
+from pathlib import Path
+from typing import NamedTuple
+
+from app import metrics
+from app.config import STORE_CONFIG, StoreConfig
+from app.db.bitmaps import mask_of, set_bits, set_bits_desc
+from app.db.filters import SearchFilters
+from app.db.models import BulkLoadReport
+from app.db.slow_queries import SlowQueryLog
+from app.db.sqlite_store import (
+    EMPLOYEE_COLUMNS,
+    FACET_FIELDS,
+    OrgStatistics,
+    SQLiteEmployeeStore,
+    WriteListener,
+    _order_by,
+    _select_list,
+)
+from app.models.employee import Employee
+
+
+# Segment row layout, as read from SQLite.
+_SEGMENT_COLUMNS = ("id", "name", "email", *FACET_FIELDS)
+
+
+# Values in at least 1/32 of a segment's rows keep a bitmap, which is then no
+# larger than the equivalent array of 32-bit row indexes; rarer values keep
+# the array, so a column costs O(rows) however many distinct values it has.
+_DENSE_FRACTION = 32
+
+
+class _Dimension(NamedTuple):
+    """A dictionary-encoded column with the rows of each value (bitmap or sorted `array`)."""
+
+    codes: array
+    values: list[str]
+    code_of: dict[str, int]
+    rows: list[int | array]
+    size: int
+
+    def bitmap(self, code: int) -> int:
+        """Rows of value `code` as a bitmap."""
+        rows = self.rows[code]
+        return rows if isinstance(rows, int) else mask_of(rows, self.size)
+
+    def count(self, code: int, mask: int | None = None, bits: bytes | None = None) -> int:
+        """Rows of value `code`, within `mask` if given (`bits` is `mask` as bytes)."""
+        rows = self.rows[code]
+        if mask is None:
+            return rows.bit_count() if isinstance(rows, int) else len(rows)
+        if isinstance(rows, int):
+            return (mask & rows).bit_count()
+        return sum(bits[i >> 3] >> (i & 7) & 1 for i in rows)
+
+
+class _Segment(NamedTuple):
+    """Columnar copy of one org's employees, in id order."""
+
+    org_id: str
+    ids: list[str]
+    names: list[str]
+    names_lower: list[str]
+    emails: list[str]
+    dimensions: dict[str, _Dimension]
+    # Row indexes in (name, id) order.
+    name_order: array
+    # Org data version the segment was loaded at (or after).
+    version: int = 0
+
+    @property
+    def size(self) -> int:
+        return len(self.ids)
+
+
+def _build_segment(org_id: str, rows: Sequence[tuple]) -> _Segment:
+    """Encode `(id, name, email, department, location, position)` rows sorted by id."""
+    ids = [row[0] for row in rows]
+    names = [row[1] for row in rows]
+    # Rows are already in id order and sorted() is stable, so ties stay by id.
+    name_order = array("I", sorted(range(len(rows)), key=names.__getitem__))
+    dimensions = {}
+    for offset, field in enumerate(FACET_FIELDS, start=3):
+        code_of: dict[str, int] = {}
+        codes = array("H" if len(rows) < 1 << 16 else "I")
+        positions: list[array] = []
+        for i, row in enumerate(rows):
+            code = code_of.setdefault(row[offset], len(code_of))
+            if code == len(positions):
+                positions.append(array("I"))
+            positions[code].append(i)
+            codes.append(code)
+        dimensions[field] = _Dimension(
+            codes=codes,
+            values=list(code_of),
+            code_of=code_of,
+            rows=[
+                mask_of(p, len(rows)) if len(p) * _DENSE_FRACTION >= len(rows) else p
+                for p in positions
+            ],
+            size=len(rows),
+        )
+    return _Segment(
+        org_id=org_id,
+        ids=ids,
+        names=names,
+        names_lower=[name.lower() for name in names],
+        emails=[row[2] for row in rows],
+        dimensions=dimensions,
+        name_order=name_order,
+    )
+
+
+def _after_id(ids: list[str], after_id: str, desc: bool) -> int:
+    """Bitmap of the rows past `after_id` in id order (rows are sorted by id)."""
+    if desc:
+        return (1 << bisect_left(ids, after_id)) - 1
+    return ~((1 << bisect_right(ids, after_id)) - 1)
+
+
+class InMemoryEmployeeStore:
+    """Columnar, bitmap-indexed read engine over a SQLite employee table."""
+
+    def __init__(self, db_path: Path | None = None, config: StoreConfig = STORE_CONFIG) -> None:
+        self._backing = SQLiteEmployeeStore(db_path, config)
+        self.db_path = self._backing.db_path
+        self._config = config
+        self._segments: OrderedDict[str, _Segment] = OrderedDict()
+        self._rows = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    @property
+    def data_version(self) -> int:
+        """Counter bumped by every write made through this store."""
+        return self._backing.data_version
+
+    def org_version(self, org_id: str) -> int:
+        """See `SQLiteEmployeeStore.org_version`."""
+        return self._backing.org_version(org_id)
+
+    def largest_orgs(self, limit: int) -> list[str]:
+        """See `SQLiteEmployeeStore.largest_orgs`."""
+        return self._backing.largest_orgs(limit)
+
+    def warm(self, org_id: str) -> None:
+        """Load the org's segment ahead of its first search."""
+        self._segment(org_id)
+
+    @property
+    def slow_queries(self) -> SlowQueryLog:
+        """Slow-query log of the backing store, for queries that still run in SQLite."""
+        return self._backing.slow_queries
+
+    def close(self) -> None:
+        """Drop loaded segments and close the backing store."""
+        self.invalidate_statistics()
+        self._backing.close()
+
+    def add_write_listener(self, listener: WriteListener) -> None:
+        """See `SQLiteEmployeeStore.add_write_listener`."""
+        self._backing.add_write_listener(listener)
+
+    def upsert_employees(self, employees: Iterable[Employee]) -> int:
+        """Write through to SQLite, then drop the touched orgs' segments."""
+        employees = list(employees)
+        written = self._backing.upsert_employees(employees)
+        # A moved employee leaves its old org too, so drop every loaded org
+        # that holds one of the written ids as well.
+        ids = {e.id for e in employees}
+        orgs = {e.org_id for e in employees}
+        with self._lock:
+            for org_id, segment in list(self._segments.items()):
+                if org_id in orgs or not ids.isdisjoint(segment.ids):
+                    self._discard(org_id)
+        return written
+
+    def bulk_load(
+        self,
+        rows: Iterable[Sequence[str]],
+        batch_size: int = 50_000,
+        rebuild_indexes: bool | None = None,
+        on_batch: Callable[[int, float], None] | None = None,
+    ) -> BulkLoadReport:
+        """Bulk load into SQLite (see `SQLiteEmployeeStore.bulk_load`); drops all segments."""
+        report = self._backing.bulk_load(rows, batch_size, rebuild_indexes, on_batch)
+        self.invalidate_statistics()
+        return report
+
+    def _segment(self, org_id: str) -> _Segment:
+        org_version = self._backing.org_version(org_id)
+        with self._lock:
+            segment = self._segments.get(org_id)
+            if segment is not None and segment.version == org_version:
+                self._segments.move_to_end(org_id)
+                return segment
+        version = self._backing.data_version
+        rows = [
+            row
+            for batch in self._backing.iter_rows(SearchFilters(org_id), _SEGMENT_COLUMNS, 10_000)
+            for row in batch
+        ]
+        segment = _build_segment(org_id, rows)._replace(version=org_version)
+        with self._lock:
+            # Only publish if no write landed while the org was loading.
+            if version == self._backing.data_version:
+                self._discard(org_id)
+                self._segments[org_id] = segment
+                self._rows += segment.size
+                self._evict()
+        return segment
+
+    def _discard(self, org_id: str) -> None:
+        segment = self._segments.pop(org_id, None)
+        if segment is not None:
+            self._rows -= segment.size
+
+    def _evict(self) -> None:
+        while self._segments and (
+            len(self._segments) > self._config.memory_max_orgs
+            or self._rows > self._config.memory_max_rows
+        ):
+            _, segment = self._segments.popitem(last=False)
+            self._rows -= segment.size
+            self.evictions += 1
+
+    def stats(self) -> dict[str, int]:
+        """Segment cache occupancy and eviction count."""
+        with self._lock:
+            return {"orgs": len(self._segments), "rows": self._rows, "evictions": self.evictions}
+
+    def _match(self, segment: _Segment, filters: SearchFilters) -> int:
+        """Bitmap of rows matching `filters` (pagination fields ignored)."""
+        full = mask = (1 << segment.size) - 1
+        for field in FACET_FIELDS:
+            value = getattr(filters, field)
+            if value:
+                dim = segment.dimensions[field]
+                code = dim.code_of.get(value)
+                if code is None:
+                    return 0
+                mask &= dim.bitmap(code)
+        if filters.name and mask:
+            term = filters.name.lower()
+            names = segment.names_lower
+            candidates = range(segment.size) if mask == full else set_bits(mask, segment.size)
+            mask = mask_of((i for i in candidates if term in names[i]), segment.size)
+        return mask
+
+    def _getters(self, segment: _Segment, columns: Sequence[str]) -> list[Callable[[int], object]]:
+        """Per-column accessors from row index to value, in `columns` order."""
+        _select_list(columns)  # reject unknown columns like the SQLite engine
+        plain = {"id": segment.ids, "name": segment.names, "email": segment.emails}
+        getters: list[Callable[[int], object]] = []
+        for column in columns:
+            if column == "org_id":
+                getters.append(lambda i, org_id=segment.org_id: org_id)
+            elif column in segment.dimensions:
+                dim = segment.dimensions[column]
+                getters.append(lambda i, codes=dim.codes, values=dim.values: values[codes[i]])
+            else:
+                getters.append(plain[column].__getitem__)
+        return getters
+
+    def search(self, filters: SearchFilters) -> tuple[list[Employee], int | None]:
+        """
+        Return one page of employees and the total match count.
+        The count is skipped (None) when `filters.count_total` is False.
+        """
+        rows, total = self.search_rows(filters, EMPLOYEE_COLUMNS)
+        return [Employee(*row) for row in rows], total
+
+    def search_rows(
+        self, filters: SearchFilters, columns: Sequence[str]
+    ) -> tuple[list[tuple], int | None]:
+        """Like `search`, but selects only `columns` and returns plain tuples."""
+        with metrics.stage("segment"):
+            segment = self._segment(filters.org_id)
+        getters = self._getters(segment, columns)
+        with metrics.stage("filter"):
+            mask = self._match(segment, filters)
+            total = mask.bit_count() if filters.count_total else None
+        rows = []
+        with metrics.stage("page"):
+            for i in self._ordered(segment, mask, filters):
+                if len(rows) == filters.limit:
+                    break
+                rows.append(tuple(get(i) for get in getters))
+        return rows, total
+
+    def _ordered(self, segment: _Segment, mask: int, filters: SearchFilters) -> Iterator[int]:
+        """Row indexes of `mask` in the sort order of `filters`, from its keyset/offset on."""
+        _order_by(filters)  # reject unknown sorts like the SQLite engine
+        desc = filters.order == "desc"
+        if filters.sort == "id":
+            if filters.after_id is not None:
+                mask &= _after_id(segment.ids, filters.after_id, desc)
+            bits = set_bits_desc if desc else set_bits
+            return bits(mask, segment.size, skip=filters.offset)
+        if filters.sort == "name":
+            rows = self._by_name(segment, mask, filters, desc)
+        else:
+            rows = self._by_dimension(segment, segment.dimensions[filters.sort], mask, filters, desc)
+        return islice(rows, filters.offset, None)
+
+    @staticmethod
+    def _by_dimension(
+        segment: _Segment, dim: _Dimension, mask: int, filters: SearchFilters, desc: bool
+    ) -> Iterator[int]:
+        """Rows of `mask` by (value, id): each value's rows in turn."""
+        set_bits_ordered = set_bits_desc if desc else set_bits
+        after_key = filters.after_key if filters.after_id is not None else None
+        bits = None
+        for value in sorted(dim.values, reverse=desc):
+            if after_key is not None and (value > after_key if desc else value < after_key):
+                continue
+            rows = dim.rows[dim.code_of[value]]
+            if isinstance(rows, int):
+                rows &= mask
+                if value == after_key:
+                    rows &= _after_id(segment.ids, filters.after_id, desc)
+                yield from set_bits_ordered(rows, segment.size)
+                continue
+            # Sparse value: its row indexes are in id order already.
+            if value == after_key:
+                key = segment.ids.__getitem__
+                if desc:
+                    rows = rows[: bisect_left(rows, filters.after_id, key=key)]
+                else:
+                    rows = rows[bisect_right(rows, filters.after_id, key=key) :]
+            if bits is None:
+                bits = mask.to_bytes((segment.size + 7) // 8, "little")
+            for i in reversed(rows) if desc else rows:
+                if bits[i >> 3] >> (i & 7) & 1:
+                    yield i
+
+    @staticmethod
+    def _by_name(segment: _Segment, mask: int, filters: SearchFilters, desc: bool) -> Iterator[int]:
+        """Rows of `mask` by (name, id), walking the segment's name permutation."""
+        order, names, ids = segment.name_order, segment.names, segment.ids
+        start, end = 0, len(order)
+        if filters.after_id is not None:
+            position = (filters.after_key, filters.after_id)
+            if desc:
+                end = bisect_left(order, position, key=lambda i: (names[i], ids[i]))
+            else:
+                start = bisect_right(order, position, key=lambda i: (names[i], ids[i]))
+        positions = range(end - 1, start - 1, -1) if desc else range(start, end)
+        if mask == (1 << segment.size) - 1:
+            yield from (order[p] for p in positions)
+            return
+        bits = mask.to_bytes((segment.size + 7) // 8, "little")
+        for p in positions:
+            i = order[p]
+            if bits[i >> 3] >> (i & 7) & 1:
+                yield i
+
+    def search_many(
+        self, batch: Sequence[SearchFilters], columns: Sequence[str]
+    ) -> list[tuple[list[tuple], int | None]]:
+        """Run several searches; results are in `batch` order."""
+        return [self.search_rows(filters, columns) for filters in batch]
+
+    def iter_rows(
+        self, filters: SearchFilters, columns: Sequence[str], batch_size: int = 1000
+    ) -> Iterator[list[tuple]]:
+        """Stream every row matching `filters` in id order, `batch_size` at a time."""
+        segment = self._segment(filters.org_id)
+        getters = self._getters(segment, columns)
+        batch = []
+        for i in set_bits(self._match(segment, filters), segment.size):
+            batch.append(tuple(get(i) for get in getters))
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def export_rows(
+        self, filters: SearchFilters, columns: Sequence[str], batch_size: int = 1000
+    ) -> Iterator[list[tuple]]:
+        """Same as `iter_rows`: a segment holds no connection while it streams."""
+        return self.iter_rows(filters, columns, batch_size)
+
+    def org_statistics(self, org_id: str) -> OrgStatistics:
+        """Row count and per-value counts, read straight off the value rows."""
+        segment = self._segment(org_id)
+        return OrgStatistics(
+            total=segment.size,
+            facets={
+                field: {value: dim.count(code) for value, code in dim.code_of.items()}
+                for field, dim in segment.dimensions.items()
+            },
+        )
+
+    def facet_counts(
+        self, filters: SearchFilters, fields: Sequence[str] = FACET_FIELDS
+    ) -> tuple[dict[str, dict[str, int]], int]:
+        """Per-value counts for each of `fields` over the filtered set, plus the total."""
+        unknown = set(fields) - set(FACET_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown facet fields: {sorted(unknown)}")
+        segment = self._segment(filters.org_id)
+        mask = self._match(segment, filters)
+        bits = mask.to_bytes((segment.size + 7) // 8, "little")
+        counts = {}
+        for field in fields:
+            dim = segment.dimensions[field]
+            counts[field] = {
+                value: n
+                for value, code in dim.code_of.items()
+                if (n := dim.count(code, mask, bits))
+            }
+        return counts, mask.bit_count()
+
+    def estimate_count(self, filters: SearchFilters) -> int | None:
+        """Exact count for filters without a name (as cheap as an estimate here)."""
+        if filters.name:
+            return None
+        segment = self._segment(filters.org_id)
+        return self._match(segment, filters).bit_count()
+
+    def invalidate_statistics(self, org_id: str | None = None) -> None:
+        """Drop loaded segments for one org, or all orgs."""
+        with self._lock:
+            if org_id is None:
+                self._segments.clear()
+                self._rows = 0
+            else:
+                self._discard(org_id)
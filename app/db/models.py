@@ -0,0 +1,34 @@
+"""
+Records returned by store-level operations.
+"""
+from typing import NamedTuple
+
+
+class BulkLoadReport(NamedTuple):
+    """Outcome of `SQLiteEmployeeStore.bulk_load`."""
+
+    rows: int
+    orgs: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float(self.rows)
+
+
+class SlowQuery(NamedTuple):
+    """A store query that took at least the slow-query threshold."""
+
+    timestamp: float
+    # Which store query: count, page, partitioned, facets, ...
+    kind: str
+    sql: str
+    # Types of the bound parameters; their values are not kept.
+    param_types: tuple[str, ...]
+    rows: int
+    duration_ms: float
+    plan: tuple[str, ...]
+    # The plan reads the employees table without an index.
+    full_scan: bool
+    # Interrupted at the request's deadline (rows is then 0).
+    aborted: bool = False
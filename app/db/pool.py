@@ -0,0 +1,124 @@
+"""
+Bounded pool of long-lived, read-only SQLite connections.
+
+Opening a connection per request costs a file open, a schema parse and a
+cold page cache. The pool keeps `size` connections open for the lifetime of
+the process so that the page cache and the per-connection prepared statement
+cache (`cached_statements`) stay warm between requests.
+"""
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from app import metrics
+from app.config import STORE_CONFIG, StoreConfig
+
+
+class PoolClosed(Exception):
+    """Raised when acquiring from a pool that has been drained."""
+
+
+class PoolTimeout(Exception):
+    """Raised when no pooled connection became free in time."""
+
+
+class ConnectionPool:
+    """
+    Thread-safe bounded queue of read-only connections.
+    Connections are created lazily, up to `config.pool_size`.
+    """
+
+    def __init__(self, db_path: Path, config: StoreConfig = STORE_CONFIG) -> None:
+        self.db_path = db_path
+        self.config = config
+        self.size = config.pool_size
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self) -> sqlite3.Connection:
+        cfg = self.config
+        conn = sqlite3.connect(
+            f"file:{self.db_path}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            cached_statements=cfg.statement_cache_size,
+            timeout=cfg.busy_timeout_ms / 1000,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only = ON")
+        conn.execute(f"PRAGMA mmap_size = {int(cfg.mmap_size_bytes)}")
+        # Negative cache_size is expressed in KiB rather than pages.
+        conn.execute(f"PRAGMA cache_size = -{int(cfg.cache_size_kib)}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        return conn
+
+    def _get(self) -> sqlite3.Connection:
+        if self._closed:
+            raise PoolClosed("Connection pool is closed")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+        if create:
+            try:
+                return self._connect()
+            except BaseException:
+                with self._lock:
+                    self._created -= 1
+                raise
+        try:
+            return self._idle.get(timeout=self.config.pool_timeout_seconds)
+        except queue.Empty:
+            raise PoolTimeout(
+                f"No SQLite connection available after {self.config.pool_timeout_seconds}s"
+            ) from None
+
+    def _put(self, conn: sqlite3.Connection) -> None:
+        if self._closed:
+            conn.close()
+            with self._lock:
+                self._created -= 1
+            return
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection for the duration of the `with` block."""
+        with metrics.stage("acquire"):
+            conn = self._get()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._put(conn)
+
+    def close(self) -> None:
+        """Drain the pool: close idle connections now, busy ones on return."""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+    @property
+    def open_connections(self) -> int:
+        """Connections currently open (idle or borrowed)."""
+        return self._created
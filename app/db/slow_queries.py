@@ -0,0 +1,103 @@
+"""
+Bounded log of slow store queries with their query plans.
+
+Queries at or above the threshold are kept in a ring buffer (oldest
+dropped first) with the normalized SQL, the types of the bound parameters
+(never their values), the row count, the duration and the
+`EXPLAIN QUERY PLAN` output, captured on the same connection right after
+the query. Plans that read the whole `employees` table without an index
+are flagged, which points at filter combinations no index covers.
+Queries aborted at their request deadline are logged whatever the threshold.
+"""
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from collections.abc import Sequence
+
+from app.db.models import SlowQuery
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_FULL_SCAN = re.compile(r"SCAN employees(?: AS \w+)?$")
+
+
+def normalize_sql(sql: str) -> str:
+    """One-line SQL with placeholder lists (`IN (?, ?, ?)`) collapsed to `?, ...`."""
+    return _PLACEHOLDER_LIST.sub("?, ...", _WHITESPACE.sub(" ", sql).strip())
+
+
+def explain(conn: sqlite3.Connection, sql: str, params: Sequence[object]) -> list[str]:
+    """EXPLAIN QUERY PLAN of `sql` as lines, indented two spaces per nesting level."""
+    depth: dict[int, int] = {0: -1}
+    lines = []
+    for node_id, parent, _, detail in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params):
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node_id] + detail)
+    return lines
+
+
+def is_full_scan(plan: Sequence[str]) -> bool:
+    """Whether a plan scans the `employees` table itself (not through an index)."""
+    return any(_FULL_SCAN.match(line.strip()) for line in plan)
+
+
+class SlowQueryLog:
+    """Thread-safe ring buffer of `SlowQuery` entries."""
+
+    def __init__(self, threshold_ms: float | None, max_entries: int) -> None:
+        # None disables the log; `threshold` is compared with perf_counter deltas.
+        self.threshold_ms = threshold_ms
+        self.threshold = float("inf") if threshold_ms is None else threshold_ms / 1000
+        self._entries: deque[SlowQuery] = deque(maxlen=max_entries)
+        self._recorded = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms is not None
+
+    def record(
+        self,
+        conn: sqlite3.Connection,
+        kind: str,
+        sql: str,
+        params: Sequence[object],
+        rows: int,
+        seconds: float,
+        aborted: bool = False,
+    ) -> SlowQuery:
+        """Capture the plan of a slow (or deadline-aborted) query on `conn` and log it."""
+        plan = explain(conn, sql, params)
+        entry = SlowQuery(
+            timestamp=time.time(),
+            kind=kind,
+            sql=normalize_sql(sql),
+            param_types=tuple(type(p).__name__ for p in params),
+            rows=rows,
+            duration_ms=seconds * 1000,
+            plan=tuple(plan),
+            full_scan=is_full_scan(plan),
+            aborted=aborted,
+        )
+        with self._lock:
+            self._entries.append(entry)
+            self._recorded += 1
+        return entry
+
+    def entries(self) -> list[SlowQuery]:
+        """Logged queries, newest first."""
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def stats(self) -> dict[str, int]:
+        """Queries recorded since start (including dropped ones) and entries held."""
+        with self._lock:
+            return {"recorded": self._recorded, "entries": len(self._entries)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -6,38 +6,201 @@ the "no external dependencies" requirement.
 """
 from __future__ import annotations
 
+import dataclasses
+import itertools
+import math
 import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from pathlib import Path
-from typing import NamedTuple
+from typing import TYPE_CHECKING, NamedTuple
 
+from app import metrics
+from app.config import STORE_CONFIG, StoreConfig
+from app.db.deadlines import QueryTimeout, current_deadline
+from app.db.filters import SORT_FIELDS, SORT_ORDERS, SearchFilters
+from app.db.models import BulkLoadReport
+from app.db.pool import ConnectionPool
+from app.db.slow_queries import SlowQueryLog
 from app.models.employee import Employee
 
+if TYPE_CHECKING:
+    from app.db.memory_store import InMemoryEmployeeStore
 
-class SearchFilters(NamedTuple):
-    """Search criteria applied at DB layer."""
 
-    org_id: str
-    name: str | None = None
-    department: str | None = None
-    location: str | None = None
-    position: str | None = None
-    limit: int = 20
-    offset: int = 0
+DB_PATH = Path(__file__).resolve().parent / "employees.sqlite3"
 
+# Table columns, in Employee field order.
+EMPLOYEE_COLUMNS = ("id", "org_id", "name", "email", "department", "location", "position")
 
-DB_PATH = Path(__file__).resolve().parent / "employees.sqlite3"
+# Trigram tokens are three characters long, so shorter search terms cannot be
+# answered from the FTS index and fall back to a LIKE scan within the org.
+FTS_MIN_TERM_LENGTH = 3
+
+# Secondary indexes. Bulk loads drop and rebuild every index named here.
+# Each SORT_FIELDS column has an (org_id, <col>, id) index, so a sorted page
+# is an index range scan (in either direction) with no temp B-tree sort; the
+# same indexes serve the exact-match filters and their counts.
+_INDEX_DDL = {
+    "idx_emp_org": "CREATE INDEX IF NOT EXISTS idx_emp_org ON employees(org_id)",
+    "idx_emp_org_id": "CREATE INDEX IF NOT EXISTS idx_emp_org_id ON employees(org_id, id)",
+    "idx_emp_org_name_id": (
+        "CREATE INDEX IF NOT EXISTS idx_emp_org_name_id ON employees(org_id, name, id)"
+    ),
+    "idx_emp_org_dept_id": (
+        "CREATE INDEX IF NOT EXISTS idx_emp_org_dept_id ON employees(org_id, department, id)"
+    ),
+    "idx_emp_org_loc_id": (
+        "CREATE INDEX IF NOT EXISTS idx_emp_org_loc_id ON employees(org_id, location, id)"
+    ),
+    "idx_emp_org_pos_id": (
+        "CREATE INDEX IF NOT EXISTS idx_emp_org_pos_id ON employees(org_id, position, id)"
+    ),
+}
+
+# Indexes superseded by the ones above, dropped from existing databases.
+_LEGACY_INDEXES = ("idx_emp_org_dept", "idx_emp_org_loc", "idx_emp_org_pos")
+
+# Name search index. It keeps its own copy of `id` instead of using external
+# content keyed on rowid, because VACUUM may renumber implicit rowids.
+_FTS_TABLE_DDL = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS employees_fts
+    USING fts5(name, id UNINDEXED, tokenize = 'trigram')
+"""
+
+# Each org's rows in employees_fts get rowids in [org_key << 32, (org_key + 1) << 32),
+# numbered by next_row, so a MATCH limited to that rowid range only reads
+# the org's part of each trigram doclist instead of every org's matches.
+_ORG_KEYS_DDL = """
+    CREATE TABLE IF NOT EXISTS org_keys (
+        org_key INTEGER PRIMARY KEY,
+        org_id TEXT NOT NULL UNIQUE,
+        next_row INTEGER NOT NULL
+    )
+"""
+
+# employees_fts rowid range of one org, for the org given by SQL expression {org}.
+_FTS_ORG_ROWS = (
+    "rowid >= (SELECT org_key << 32 FROM org_keys WHERE org_id = {org}) "
+    "AND rowid < (SELECT (org_key + 1) << 32 FROM org_keys WHERE org_id = {org})"
+)
 
+_FTS_INSERT_SQL = """
+    INSERT INTO org_keys (org_id, next_row) VALUES (new.org_id, 1)
+    ON CONFLICT (org_id) DO UPDATE SET next_row = next_row + 1;
+    INSERT INTO employees_fts (rowid, name, id)
+    SELECT (org_key << 32) + next_row, new.name, new.id FROM org_keys WHERE org_id = new.org_id;
+"""
+
+# Finds the old row through its own name when the name is long enough to
+# match, rather than reading every id in the org's range.
+_FTS_DELETE_SQL = f"""
+    DELETE FROM employees_fts
+    WHERE length(old.name) >= {FTS_MIN_TERM_LENGTH}
+      AND employees_fts MATCH '"' || replace(old.name, '"', '""') || '"'
+      AND {_FTS_ORG_ROWS.format(org="old.org_id")} AND id = old.id;
+    DELETE FROM employees_fts
+    WHERE length(old.name) < {FTS_MIN_TERM_LENGTH}
+      AND {_FTS_ORG_ROWS.format(org="old.org_id")} AND id = old.id;
+"""
+
+# Triggers keeping employees_fts in sync. Bulk loads drop them and rebuild
+# the FTS table in one pass instead.
+_FTS_TRIGGER_DDL = {
+    "employees_fts_ai": f"""
+    CREATE TRIGGER IF NOT EXISTS employees_fts_ai AFTER INSERT ON employees BEGIN
+        {_FTS_INSERT_SQL}
+    END
+    """,
+    "employees_fts_ad": f"""
+    CREATE TRIGGER IF NOT EXISTS employees_fts_ad AFTER DELETE ON employees BEGIN
+        {_FTS_DELETE_SQL}
+    END
+    """,
+    # Upserts rewrite every column; only a changed key or name touches the index.
+    "employees_fts_au": f"""
+    CREATE TRIGGER IF NOT EXISTS employees_fts_au AFTER UPDATE OF id, org_id, name ON employees
+    WHEN old.id IS NOT new.id OR old.org_id IS NOT new.org_id OR old.name IS NOT new.name
+    BEGIN
+        {_FTS_DELETE_SQL}
+        {_FTS_INSERT_SQL}
+    END
+    """,
+}
+
+# Refill employees_fts from scratch (first run and after bulk loads).
+_FTS_REBUILD_SQL = (
+    "DELETE FROM employees_fts",
+    """
+    INSERT INTO org_keys (org_id, next_row)
+    SELECT org_id, COUNT(*) FROM employees WHERE true GROUP BY org_id
+    ON CONFLICT (org_id) DO UPDATE SET next_row = excluded.next_row
+    """,
+    """
+    INSERT INTO employees_fts (rowid, name, id)
+    SELECT (k.org_key << 32) + ROW_NUMBER() OVER (PARTITION BY e.org_id), e.name, e.id
+    FROM employees e JOIN org_keys k ON k.org_id = e.org_id
+    """,
+)
+
+
+# Per-org data version, bumped by triggers on every row written or deleted
+# (by this process or any other), so readers can tell when an org changed.
+_ORG_VERSIONS_DDL = """
+    CREATE TABLE IF NOT EXISTS org_versions (
+        org_id TEXT PRIMARY KEY,
+        version INTEGER NOT NULL
+    )
+"""
 
-def _get_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
+_BUMP_ORG_SQL = """
+    INSERT INTO org_versions (org_id, version) VALUES ({org}, 1)
+    ON CONFLICT (org_id) DO UPDATE SET version = version + 1;
+"""
+
+# Bulk loads drop these and bump every org once at the end instead.
+_ORG_VERSION_TRIGGER_DDL = {
+    "employees_version_ai": f"""
+    CREATE TRIGGER IF NOT EXISTS employees_version_ai AFTER INSERT ON employees BEGIN
+        {_BUMP_ORG_SQL.format(org="new.org_id")}
+    END
+    """,
+    "employees_version_ad": f"""
+    CREATE TRIGGER IF NOT EXISTS employees_version_ad AFTER DELETE ON employees BEGIN
+        {_BUMP_ORG_SQL.format(org="old.org_id")}
+    END
+    """,
+    # A moved employee changes both orgs.
+    "employees_version_au": f"""
+    CREATE TRIGGER IF NOT EXISTS employees_version_au AFTER UPDATE ON employees BEGIN
+        {_BUMP_ORG_SQL.format(org="new.org_id")}
+        INSERT INTO org_versions (org_id, version)
+        SELECT old.org_id, 1 WHERE old.org_id <> new.org_id
+        ON CONFLICT (org_id) DO UPDATE SET version = version + 1;
+    END
+    """,
+}
+
+
+def _read_org_versions(conn: sqlite3.Connection) -> dict[str, int]:
+    return dict(conn.execute("SELECT org_id, version FROM org_versions").fetchall())
+
+
+def _get_connection(db_path: Path | None = None) -> sqlite3.Connection:
+    """Open a read-write connection (schema setup and writes only)."""
+    conn = sqlite3.connect(db_path or DB_PATH)
     conn.row_factory = sqlite3.Row
     return conn
 
 
-def _init_db() -> None:
-    """Create table and seed data if needed."""
-    conn = _get_connection()
+def _init_db(db_path: Path | None = None, seed: bool = True) -> None:
+    """Create table and seed data if needed (`seed=False` leaves it empty)."""
+    conn = _get_connection(db_path)
     try:
+        # WAL lets pooled readers run concurrently with a writer; the mode is
+        # persistent, so setting it once here covers every later connection.
+        conn.execute("PRAGMA journal_mode = WAL")
         cur = conn.cursor()
         cur.execute(
             """
@@ -52,31 +215,139 @@ def _init_db() -> None:
             )
             """
         )
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_emp_org ON employees(org_id)")
-        cur.execute(
-            "CREATE INDEX IF NOT EXISTS idx_emp_org_dept "
-            "ON employees(org_id, department)"
-        )
-        cur.execute(
-            "CREATE INDEX IF NOT EXISTS idx_emp_org_loc "
-            "ON employees(org_id, location)"
-        )
-        cur.execute(
-            "CREATE INDEX IF NOT EXISTS idx_emp_org_pos "
-            "ON employees(org_id, position)"
-        )
+        for ddl in _INDEX_DDL.values():
+            cur.execute(ddl)
+        for name in _LEGACY_INDEXES:
+            cur.execute(f"DROP INDEX IF EXISTS {name}")
+        cur.execute(_ORG_VERSIONS_DDL)
+        for ddl in _ORG_VERSION_TRIGGER_DDL.values():
+            cur.execute(ddl)
 
         # Seed only once
         cur.execute("SELECT COUNT(*) AS c FROM employees")
         count = cur.fetchone()["c"]
-        if count == 0:
+        if count == 0 and seed:
             _seed_data(cur)
 
         conn.commit()
+        _init_fts(conn)
     finally:
         conn.close()
 
 
+def _init_fts(conn: sqlite3.Connection) -> None:
+    """
+    Create the trigram name index and back-fill it on first run.
+    Builds without FTS5 or the trigram tokenizer keep using LIKE.
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'employees_fts'"
+    ).fetchone()
+    org_scoped = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'org_keys'"
+    ).fetchone()
+    try:
+        if exists and not org_scoped:
+            # Index from before org-scoped rowids: rebuild it.
+            conn.execute("DROP TABLE employees_fts")
+            for name in _FTS_TRIGGER_DDL:
+                conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+            exists = None
+        conn.execute(_FTS_TABLE_DDL)
+        conn.execute(_ORG_KEYS_DDL)
+        for ddl in _FTS_TRIGGER_DDL.values():
+            conn.execute(ddl)
+    except sqlite3.OperationalError:
+        conn.rollback()
+        return
+    if not exists:
+        for sql in _FTS_REBUILD_SQL:
+            conn.execute(sql)
+    conn.commit()
+
+
+def _fts_phrase(term: str) -> str:
+    """Quote a search term as a single FTS5 phrase (substring match under trigram)."""
+    return '"' + term.replace('"', '""') + '"'
+
+
+# ON CONFLICT DO UPDATE (not INSERT OR REPLACE) so the FTS update trigger fires.
+_UPSERT_SQL = """
+    INSERT INTO employees (id, org_id, name, email, department, location, position)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        org_id = excluded.org_id,
+        name = excluded.name,
+        email = excluded.email,
+        department = excluded.department,
+        location = excluded.location,
+        position = excluded.position
+"""
+
+
+def _select_list(columns: Sequence[str]) -> str:
+    """SQL select list for `columns`, rejecting anything that isn't a table column."""
+    unknown = set(columns) - set(EMPLOYEE_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown employee columns: {sorted(unknown)}")
+    return ", ".join(columns)
+
+
+def _order_by(filters: SearchFilters) -> str:
+    """SQL ORDER BY terms for the sort of `filters`, with `id` as the tiebreaker."""
+    if filters.sort not in SORT_FIELDS or filters.order not in SORT_ORDERS:
+        raise ValueError(f"Unsupported sort: {filters.sort!r} {filters.order!r}")
+    direction = filters.order.upper()
+    if filters.sort == "id":
+        return f"id {direction}"
+    return f"{filters.sort} {direction}, id {direction}"
+
+
+def _keyset(filters: SearchFilters) -> tuple[str, list[object]]:
+    """SQL condition (and params) for rows after the keyset position of `filters`."""
+    op = "<" if filters.order == "desc" else ">"
+    if filters.sort == "id":
+        return f"id {op} ?", [filters.after_id]
+    return f"({filters.sort}, id) {op} (?, ?)", [filters.after_key, filters.after_id]
+
+
+def _batched(rows: Iterable[Sequence], size: int) -> Iterator[list[Sequence]]:
+    """Split `rows` into lists of at most `size` items without materializing it."""
+    it = iter(rows)
+    while batch := list(itertools.islice(it, size)):
+        yield batch
+
+
+def _merge_groups(
+    batch: Sequence[SearchFilters],
+) -> list[tuple[str | None, SearchFilters | None, list[int]]]:
+    """
+    Plan `SQLiteEmployeeStore.search_many`: (field, base filters, batch
+    indexes) per merged scan, or (None, None, [index]) for a search that
+    runs on its own. Each search joins the candidate group (its filters with
+    one exact field cleared) shared by the most searches.
+    """
+    candidates: dict[tuple[str, SearchFilters], list[int]] = {}
+    for i, filters in enumerate(batch):
+        if not filters.count_total or filters.after_id is not None:
+            continue
+        for field in FACET_FIELDS:
+            if getattr(filters, field) is not None:
+                candidates.setdefault((field, filters._replace(**{field: None})), []).append(i)
+
+    ranked = sorted(candidates.items(), key=lambda item: -len(item[1]))
+    assigned: set[int] = set()
+    groups: list[tuple[str | None, SearchFilters | None, list[int]]] = []
+    for (field, base), members in ranked:
+        members = [i for i in members if i not in assigned]
+        if len({getattr(batch[i], field) for i in members}) < 2:
+            continue
+        assigned.update(members)
+        groups.append((field, base, members))
+    groups.extend((None, None, [i]) for i in range(len(batch)) if i not in assigned)
+    return groups
+
+
 def _seed_data(cur: sqlite3.Cursor) -> None:
     seed = [
         ("e1", "org_a", "John Doe", "john@org-a.com", "Engineering", "HN", "SE"),
@@ -96,76 +367,665 @@ def _seed_data(cur: sqlite3.Cursor) -> None:
     )
 
 
+FACET_FIELDS = ("department", "location", "position")
+
+
+# Called after writes made through a store (see `add_write_listener`).
+WriteListener = Callable[[list[Employee] | None, dict[str, tuple[int, int]]], None]
+
+
+class OrgStatistics(NamedTuple):
+    """Cached per-org row count and per-facet value histograms."""
+
+    total: int
+    facets: dict[str, dict[str, int]]
+
+
 class SQLiteEmployeeStore:
     """SQLite-backed store. Filters and pagination at DB layer."""
 
-    def search(self, filters: SearchFilters) -> tuple[list[Employee], int]:
-        conn = _get_connection()
+    def __init__(self, db_path: Path | None = None, config: StoreConfig = STORE_CONFIG) -> None:
+        self.db_path = db_path or DB_PATH
+        self._config = config
+        self._pool = ConnectionPool(self.db_path, config)
+        self._export_pool = ConnectionPool(
+            self.db_path,
+            dataclasses.replace(
+                config,
+                pool_size=config.export_pool_size,
+                pool_timeout_seconds=config.export_pool_timeout_seconds,
+            ),
+        )
+        with self._pool.connection() as conn:
+            self.has_fts = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'employees_fts'"
+            ).fetchone() is not None
+        # org_id -> (org data version the statistics were computed at, statistics)
+        self._stats: dict[str, tuple[int, OrgStatistics]] = {}
+        self._stats_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._data_version = 0
+        self._write_listeners: list[WriteListener] = []
+        # Own connection for `org_version`: PRAGMA data_version is per connection.
+        self._version_conn = sqlite3.connect(
+            f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False
+        )
+        self._version_lock = threading.Lock()
+        # org_id -> version, for orgs looked up since the last commit seen.
+        self._org_versions: dict[str, int] = {}
+        self._seen_db_version: int | None = None
+        self.slow_queries = SlowQueryLog(config.slow_query_ms, config.slow_query_log_size)
+
+    @property
+    def data_version(self) -> int:
+        """Counter bumped by every write made through this store."""
+        return self._data_version
+
+    def org_version(self, org_id: str) -> int:
+        """
+        Data version of one org, bumped by every write to its employees from
+        any process. Versions are cached until some connection commits
+        (PRAGMA data_version); after that each org's row is re-read on its
+        next lookup, so a lookup runs at most one primary-key query.
+        Blocking: async callers run it on the store executor.
+        """
+        with self._version_lock:
+            (db_version,) = self._version_conn.execute("PRAGMA data_version").fetchone()
+            if db_version != self._seen_db_version:
+                self._org_versions.clear()
+                self._seen_db_version = db_version
+            version = self._org_versions.get(org_id)
+            if version is None:
+                row = self._version_conn.execute(
+                    "SELECT version FROM org_versions WHERE org_id = ?", (org_id,)
+                ).fetchone()
+                version = self._org_versions[org_id] = row[0] if row else 0
+            return version
+
+    def _bump_data_version(self) -> None:
+        with self._stats_lock:
+            self._data_version += 1
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self._pool.close()
+        self._export_pool.close()
+        with self._version_lock:
+            self._version_conn.close()
+
+    def add_write_listener(self, listener: WriteListener) -> None:
+        """
+        Call `listener` after every write made through this store, with the
+        upserted employees, or None after a bulk load (anything may have
+        changed), and the org versions the write moved, as
+        {org_id: (version before, version after)}, read inside the write
+        transaction so no other writer's change falls between the two.
+        """
+        self._write_listeners.append(listener)
+
+    def _notify_writes(
+        self, employees: list[Employee] | None, versions: dict[str, tuple[int, int]]
+    ) -> None:
+        for listener in self._write_listeners:
+            listener(employees, versions)
+
+    def upsert_employees(self, employees: Iterable[Employee]) -> int:
+        """Insert or update employees by id. Returns the number of rows written."""
+        rows = [
+            (e.id, e.org_id, e.name, e.email, e.department, e.location, e.position)
+            for e in employees
+        ]
+        if not rows:
+            return 0
+        with self._write_lock:
+            conn = _get_connection(self.db_path)
+            try:
+                with conn:
+                    conn.execute("BEGIN IMMEDIATE")
+                    before = _read_org_versions(conn)
+                    conn.executemany(_UPSERT_SQL, rows)
+                    after = _read_org_versions(conn)
+            finally:
+                conn.close()
+            for org_id in {row[1] for row in rows}:
+                self.invalidate_statistics(org_id)
+            self._bump_data_version()
+            versions = {
+                org_id: (before.get(org_id, 0), version)
+                for org_id, version in after.items()
+                if version != before.get(org_id, 0)
+            }
+            self._notify_writes([Employee(*row) for row in rows], versions)
+        return len(rows)
+
+    def bulk_load(
+        self,
+        rows: Iterable[Sequence],
+        batch_size: int = 50_000,
+        rebuild_indexes: bool | None = None,
+        on_batch: Callable[[int, float], None] | None = None,
+    ) -> BulkLoadReport:
+        """
+        Stream `rows` (tuples in EMPLOYEE_COLUMNS order) into the table,
+        upserting by id, one explicit transaction per batch.
+
+        Large loads are much faster with the secondary indexes and FTS
+        triggers dropped and rebuilt in single passes afterwards, but
+        searches run without them meanwhile. By default (None) the load
+        starts with them in place and switches once it has written more than
+        `bulk_rebuild_min_rows`, or `bulk_rebuild_fraction` of the table if
+        that is more, so small incremental loads leave them alone. True
+        drops them up front, False never. A rebuild ends with a full
+        `ANALYZE`, other loads with `PRAGMA optimize`. `on_batch` gets (rows
+        loaded so far, seconds elapsed) after each commit.
+        """
+        start = time.perf_counter()
+        loaded = 0
+        orgs: set[str] = set()
+        dropped = False
+        with self._write_lock:
+            conn = _get_connection(self.db_path)
+            # Explicit BEGIN/COMMIT instead of the module's implicit transactions.
+            conn.isolation_level = None
+            try:
+                conn.execute("PRAGMA synchronous = NORMAL")
+                threshold = self._rebuild_threshold(conn, rebuild_indexes)
+                try:
+                    for batch in _batched(rows, batch_size):
+                        if not dropped and loaded + len(batch) > threshold:
+                            self._drop_indexes(conn)
+                            dropped = True
+                        conn.execute("BEGIN")
+                        conn.executemany(_UPSERT_SQL, batch)
+                        conn.execute("COMMIT")
+                        loaded += len(batch)
+                        orgs.update(row[1] for row in batch)
+                        if on_batch is not None:
+                            on_batch(loaded, time.perf_counter() - start)
+                finally:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    if dropped:
+                        self._rebuild_indexes(conn)
+                        # The version triggers were off for part of the load.
+                        self._bump_org_versions(conn, orgs)
+                conn.execute("ANALYZE" if dropped else "PRAGMA optimize")
+            finally:
+                conn.close()
+            for org_id in orgs:
+                self.invalidate_statistics(org_id)
+            self._bump_data_version()
+            self._notify_writes(None, {})
+        return BulkLoadReport(rows=loaded, orgs=len(orgs), seconds=time.perf_counter() - start)
+
+    def _rebuild_threshold(self, conn: sqlite3.Connection, rebuild_indexes: bool | None) -> float:
+        """Rows a bulk load writes with indexes in place before dropping them."""
+        if rebuild_indexes is not None:
+            return 0 if rebuild_indexes else math.inf
+        # MAX(rowid) is one B-tree seek and close enough to the row count here.
+        existing = conn.execute("SELECT MAX(rowid) FROM employees").fetchone()[0] or 0
+        return max(self._config.bulk_rebuild_min_rows, self._config.bulk_rebuild_fraction * existing)
+
+    @staticmethod
+    def _drop_indexes(conn: sqlite3.Connection) -> None:
+        """Drop the secondary indexes and the triggers a bulk load rebuilds in one pass."""
+        for name in _INDEX_DDL:
+            conn.execute(f"DROP INDEX IF EXISTS {name}")
+        for name in (*_FTS_TRIGGER_DDL, *_ORG_VERSION_TRIGGER_DDL):
+            conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+    def _rebuild_indexes(self, conn: sqlite3.Connection) -> None:
+        """Recreate secondary indexes, repopulate FTS, and restore the dropped triggers."""
+        conn.execute("BEGIN")
+        for ddl in _INDEX_DDL.values():
+            conn.execute(ddl)
+        if self.has_fts:
+            for sql in _FTS_REBUILD_SQL:
+                conn.execute(sql)
+            for ddl in _FTS_TRIGGER_DDL.values():
+                conn.execute(ddl)
+        for ddl in _ORG_VERSION_TRIGGER_DDL.values():
+            conn.execute(ddl)
+        conn.execute("COMMIT")
+
+    @staticmethod
+    def _bump_org_versions(conn: sqlite3.Connection, orgs: Iterable[str]) -> None:
+        """
+        After a bulk load, bump every known org (a loaded row may have moved
+        out of one) and the loaded orgs.
+        """
+        conn.execute("BEGIN")
+        conn.execute("UPDATE org_versions SET version = version + 1")
+        conn.executemany(
+            "INSERT INTO org_versions (org_id, version) VALUES (?, 1) "
+            "ON CONFLICT (org_id) DO NOTHING",
+            [(org_id,) for org_id in orgs],
+        )
+        conn.execute("COMMIT")
+
+    def _fetch(
+        self, cur: sqlite3.Cursor, kind: str, sql: str, params: Sequence[object]
+    ) -> list[tuple]:
+        """
+        Run `sql` and fetch all rows; slow queries go to `slow_queries` with
+        their plan. Under a request deadline (`app.db.deadlines`) the query is
+        interrupted once it runs out, and QueryTimeout is raised; the progress
+        handler is removed either way, so the connection returns to the pool clean.
+        """
+        deadline = current_deadline()
+        conn = cur.connection
+        start = time.perf_counter()
+        if deadline is not None:
+            if start >= deadline.expires:
+                raise QueryTimeout(kind, deadline.budget_ms, deadline.elapsed_ms(start), 0)
+            checks = 0
+
+            def expired() -> bool:
+                nonlocal checks
+                checks += 1
+                return time.perf_counter() >= deadline.expires
+
+            conn.set_progress_handler(expired, self._config.deadline_check_ops)
         try:
-            cur = conn.cursor()
+            cur.execute(sql, params)
+            rows = cur.fetchall()
+        except sqlite3.OperationalError:
+            if deadline is None or time.perf_counter() < deadline.expires:
+                raise
+            now = time.perf_counter()
+            conn.set_progress_handler(None, 0)
+            if self.slow_queries.enabled:
+                self.slow_queries.record(conn, kind, sql, params, 0, now - start, aborted=True)
+            raise QueryTimeout(
+                kind,
+                deadline.budget_ms,
+                deadline.elapsed_ms(now),
+                checks * self._config.deadline_check_ops,
+            ) from None
+        finally:
+            if deadline is not None:
+                conn.set_progress_handler(None, 0)
+        elapsed = time.perf_counter() - start
+        if elapsed >= self.slow_queries.threshold:
+            self.slow_queries.record(conn, kind, sql, params, len(rows), elapsed)
+        return rows
 
-            where_clauses = ["org_id = ?"]
-            params: list[object] = [filters.org_id]
+    def _where(self, filters: SearchFilters) -> tuple[str, list[object]]:
+        """Build the WHERE clause (without keyset/pagination) for `filters`."""
+        where_clauses = ["org_id = ?"]
+        params: list[object] = [filters.org_id]
 
-            if filters.name:
+        if filters.name:
+            if self._uses_fts(filters):
+                # Unary + keeps the planner off the org indexes so the
+                # org's trigram matches drive primary-key lookups.
+                where_clauses[0] = "+org_id = ?"
+                where_clauses.append(
+                    "id IN (SELECT id FROM employees_fts WHERE employees_fts MATCH ? "
+                    f"AND {_FTS_ORG_ROWS.format(org='?')})"
+                )
+                params.extend([_fts_phrase(filters.name), filters.org_id, filters.org_id])
+            else:
                 where_clauses.append("LOWER(name) LIKE ?")
                 params.append(f"%{filters.name.lower()}%")
-            if filters.department:
-                where_clauses.append("department = ?")
-                params.append(filters.department)
-            if filters.location:
-                where_clauses.append("location = ?")
-                params.append(filters.location)
-            if filters.position:
-                where_clauses.append("position = ?")
-                params.append(filters.position)
-
-            where_sql = " AND ".join(where_clauses)
-
-            # Total count
-            cur.execute(f"SELECT COUNT(*) AS c FROM employees WHERE {where_sql}", params)
-            total = cur.fetchone()["c"]
-
-            # Page data
-            cur.execute(
+        if filters.department:
+            where_clauses.append("department = ?")
+            params.append(filters.department)
+        if filters.location:
+            where_clauses.append("location = ?")
+            params.append(filters.location)
+        if filters.position:
+            where_clauses.append("position = ?")
+            params.append(filters.position)
+
+        return " AND ".join(where_clauses), params
+
+    def _uses_fts(self, filters: SearchFilters) -> bool:
+        """Whether the name filter of `filters` is served from employees_fts."""
+        return bool(filters.name) and self.has_fts and len(filters.name) >= FTS_MIN_TERM_LENGTH
+
+    def _count_query(
+        self, filters: SearchFilters, where_sql: str, params: list[object]
+    ) -> tuple[str, list[object]]:
+        """COUNT(*) SQL and params; a name-only FTS search counts off the index alone."""
+        if self._uses_fts(filters) and not (
+            filters.department or filters.location or filters.position
+        ):
+            return (
+                "SELECT COUNT(*) FROM employees_fts WHERE employees_fts MATCH ? "
+                f"AND {_FTS_ORG_ROWS.format(org='?')}",
+                [_fts_phrase(filters.name), filters.org_id, filters.org_id],
+            )
+        return f"SELECT COUNT(*) FROM employees WHERE {where_sql}", params
+
+    def search(self, filters: SearchFilters) -> tuple[list[Employee], int | None]:
+        """
+        Return one page of employees and the total match count.
+        The count is skipped (None) when `filters.count_total` is False.
+        """
+        rows, total = self.search_rows(filters, EMPLOYEE_COLUMNS)
+        return [Employee(*row) for row in rows], total
+
+    def search_rows(
+        self, filters: SearchFilters, columns: Sequence[str]
+    ) -> tuple[list[tuple], int | None]:
+        """
+        Like `search`, but selects only `columns` and returns plain tuples in
+        that order, so callers can skip building Employee objects.
+        """
+        select_sql = _select_list(columns)
+        with self._pool.connection() as conn:
+            cur = conn.cursor()
+            cur.row_factory = None
+            return self._search_page(cur, filters, select_sql)
+
+    def search_many(
+        self, batch: Sequence[SearchFilters], columns: Sequence[str]
+    ) -> list[tuple[list[tuple], int | None]]:
+        """
+        Run several searches over one pooled connection; results are in
+        `batch` order, each shaped like `search_rows`.
+
+        Counted, cursor-less searches that differ only in the value of one
+        exact-match field are merged into a single `field IN (...)` scan,
+        split per value with window functions (page by ROW_NUMBER, total by
+        COUNT OVER the partition).
+        """
+        select_sql = _select_list(columns)
+        results: list[tuple[list[tuple], int | None] | None] = [None] * len(batch)
+        with self._pool.connection() as conn:
+            cur = conn.cursor()
+            cur.row_factory = None
+            for field, base, members in _merge_groups(batch):
+                if field is None:
+                    i = members[0]
+                    results[i] = self._search_page(cur, batch[i], select_sql)
+                    continue
+                values = list(dict.fromkeys(getattr(batch[i], field) for i in members))
+                by_value = self._search_partitioned(cur, base, field, values, select_sql)
+                for i in members:
+                    results[i] = by_value[getattr(batch[i], field)]
+        return results
+
+    def _search_page(
+        self, cur: sqlite3.Cursor, filters: SearchFilters, select_sql: str
+    ) -> tuple[list[tuple], int | None]:
+        """One page (and optional total) for `filters` on an open cursor."""
+        where_sql, params = self._where(filters)
+        order_by = _order_by(filters)
+
+        # Total count
+        total = None
+        if filters.count_total:
+            with metrics.stage("count"):
+                sql, count_params = self._count_query(filters, where_sql, params)
+                total = self._fetch(cur, "count", sql, count_params)[0][0]
+
+        # Page data
+        page_sql = where_sql
+        page_params = list(params)
+        if filters.after_id is not None:
+            keyset_sql, keyset_params = _keyset(filters)
+            page_sql += f" AND {keyset_sql}"
+            page_params.extend(keyset_params)
+        with metrics.stage("page"):
+            rows = self._fetch(
+                cur,
+                "page",
                 f"""
-                SELECT id, org_id, name, email, department, location, position
+                SELECT {select_sql}
                 FROM employees
-                WHERE {where_sql}
-                ORDER BY id
+                WHERE {page_sql}
+                ORDER BY {order_by}
                 LIMIT ? OFFSET ?
                 """,
-                [*params, filters.limit, filters.offset],
+                [*page_params, filters.limit, filters.offset],
             )
-            rows = cur.fetchall()
-            employees = [
-                Employee(
-                    id=row["id"],
-                    org_id=row["org_id"],
-                    name=row["name"],
-                    email=row["email"],
-                    department=row["department"],
-                    location=row["location"],
-                    position=row["position"],
+        return rows, total
+
+    def _search_partitioned(
+        self,
+        cur: sqlite3.Cursor,
+        base: SearchFilters,
+        field: str,
+        values: list[str],
+        select_sql: str,
+    ) -> dict[str, tuple[list[tuple], int]]:
+        """
+        Pages and totals for `base` with `field` = each of `values`, from one
+        scan. The first row of every partition is always returned so its
+        total is known even when the page itself is empty.
+        """
+        where_sql, params = self._where(base)
+        placeholders = ", ".join("?" * len(values))
+        first, last = base.offset + 1, base.offset + base.limit
+        order_by = _order_by(base)
+        rows = self._fetch(
+            cur,
+            "partitioned",
+            f"""
+            SELECT {select_sql}, _k, _rn, _n FROM (
+                SELECT {select_sql}, {field} AS _k,
+                       ROW_NUMBER() OVER (PARTITION BY {field} ORDER BY {order_by}) AS _rn,
+                       COUNT(*) OVER (PARTITION BY {field}) AS _n
+                FROM employees
+                WHERE {where_sql} AND {field} IN ({placeholders})
+            )
+            WHERE _rn = 1 OR _rn BETWEEN ? AND ?
+            ORDER BY _k, _rn
+            """,
+            [*params, *values, first, last],
+        )
+        pages: dict[str, tuple[list[tuple], int]] = {value: ([], 0) for value in values}
+        for *row, key, rn, n in rows:
+            page, _ = pages[key]
+            if rn >= first:
+                page.append(tuple(row))
+            pages[key] = (page, n)
+        return pages
+
+    def iter_rows(
+        self, filters: SearchFilters, columns: Sequence[str], batch_size: int = 1000
+    ) -> Iterator[list[tuple]]:
+        """
+        Stream every row matching `filters` (pagination fields ignored) in id
+        order, `batch_size` rows at a time, from one server-side cursor.
+        A pooled connection is held until the iterator is exhausted or closed.
+        """
+        return self._stream_rows(self._pool, filters, columns, batch_size)
+
+    def export_rows(
+        self, filters: SearchFilters, columns: Sequence[str], batch_size: int = 1000
+    ) -> Iterator[list[tuple]]:
+        """
+        `iter_rows` over the export connections (`export_pool_size`), for
+        streams paced by a client: however slowly they are read, searches
+        keep their pool. PoolTimeout (on first iteration) when all are busy.
+        """
+        return self._stream_rows(self._export_pool, filters, columns, batch_size)
+
+    def _stream_rows(
+        self,
+        pool: ConnectionPool,
+        filters: SearchFilters,
+        columns: Sequence[str],
+        batch_size: int,
+    ) -> Iterator[list[tuple]]:
+        select_sql = _select_list(columns)
+        with pool.connection() as conn:
+            cur = conn.cursor()
+            cur.row_factory = None
+            where_sql, params = self._where(filters)
+            cur.execute(f"SELECT {select_sql} FROM employees WHERE {where_sql} ORDER BY id", params)
+            try:
+                while batch := cur.fetchmany(batch_size):
+                    yield batch
+            finally:
+                cur.close()
+
+    def org_statistics(self, org_id: str) -> OrgStatistics:
+        """
+        Per-org histograms, computed from the covering org indexes and
+        cached until the org's data version (`org_version`) moves, so writes
+        from any process, the ingest CLI included, refresh them. The queries
+        run under the request deadline like searches (see `_fetch`).
+        """
+        version = self.org_version(org_id)
+        cached = self._stats.get(org_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        with self._pool.connection() as conn:
+            cur = conn.cursor()
+            cur.row_factory = None
+            total = self._fetch(
+                cur, "statistics", "SELECT COUNT(*) FROM employees WHERE org_id = ?", (org_id,)
+            )[0][0]
+            facets = {
+                field: dict(
+                    self._fetch(
+                        cur,
+                        "statistics",
+                        f"SELECT {field}, COUNT(*) FROM employees WHERE org_id = ? GROUP BY {field}",
+                        (org_id,),
+                    )
                 )
-                for row in rows
-            ]
-            return employees, total
-        finally:
-            conn.close()
+                for field in FACET_FIELDS
+            }
+        stats = OrgStatistics(total=total, facets=facets)
+        # The version was read before the queries, so a write landing in
+        # between only makes the entry look stale and it is recomputed.
+        with self._stats_lock:
+            self._stats[org_id] = (version, stats)
+        return stats
 
+    def largest_orgs(self, limit: int) -> list[str]:
+        """The `limit` orgs with the most employees, largest first (one pass over idx_emp_org)."""
+        with self._pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT org_id FROM employees GROUP BY org_id ORDER BY COUNT(*) DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [row[0] for row in rows]
 
-_initialized = False
-_store: SQLiteEmployeeStore | None = None
+    def warm(self, org_id: str) -> None:
+        """
+        Read the org's range of every secondary index (into the page cache
+        and, through mmap, the OS cache) and cache its statistics, so its
+        first searches don't start cold.
+        """
+        self.org_statistics(org_id)  # serves count=estimate and unfiltered facets
+        with self._pool.connection() as conn:
+            for name in _INDEX_DDL:
+                conn.execute(
+                    f"SELECT COUNT(*) FROM employees INDEXED BY {name} WHERE org_id = ?",
+                    (org_id,),
+                ).fetchone()
+
+    def facet_counts(
+        self, filters: SearchFilters, fields: Sequence[str] = FACET_FIELDS
+    ) -> tuple[dict[str, dict[str, int]], int]:
+        """
+        Per-value counts for each of `fields` over the filtered set, plus
+        the total. Pagination fields are ignored. Unfiltered org-wide counts
+        come from the cached org statistics when `facet_cache` is enabled.
+        """
+        unknown = set(fields) - set(FACET_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown facet fields: {sorted(unknown)}")
+        unfiltered = not (filters.name or filters.department or filters.location or filters.position)
+        if unfiltered and self._config.facet_cache:
+            stats = self.org_statistics(filters.org_id)
+            return {field: dict(stats.facets[field]) for field in fields}, stats.total
+
+        counts: dict[str, dict[str, int]] = {field: {} for field in fields}
+        total = 0
+        with self._pool.connection() as conn:
+            cur = conn.cursor()
+            cur.row_factory = None
+            where_sql, params = self._where(filters)
+            if not fields:
+                sql = f"SELECT COUNT(*) FROM employees WHERE {where_sql}"
+                total = self._fetch(cur, "facets", sql, params)[0][0]
+                return counts, total
+            group_sql = ", ".join(fields)
+            # One grouped pass over the filtered rows; per-field counts are
+            # summed from the value combinations.
+            rows = self._fetch(
+                cur,
+                "facets",
+                f"SELECT {group_sql}, COUNT(*) FROM employees WHERE {where_sql} GROUP BY {group_sql}",
+                params,
+            )
+            for row in rows:
+                n = row[-1]
+                total += n
+                for i, field in enumerate(fields):
+                    bucket = counts[field]
+                    bucket[row[i]] = bucket.get(row[i], 0) + n
+        return counts, total
+
+    def estimate_count(self, filters: SearchFilters) -> int | None:
+        """
+        Estimate the match count from cached statistics, assuming the exact
+        filters are independent. Returns None when the filters cannot be
+        estimated (the name filter has no statistics).
+        """
+        if filters.name:
+            return None
+        stats = self.org_statistics(filters.org_id)
+        estimate = float(stats.total)
+        for field in FACET_FIELDS:
+            value = getattr(filters, field)
+            if value and stats.total:
+                estimate *= stats.facets[field].get(value, 0) / stats.total
+        return round(estimate)
+
+    def invalidate_statistics(self, org_id: str | None = None) -> None:
+        """Drop cached statistics for one org, or all orgs."""
+        with self._stats_lock:
+            if org_id is None:
+                self._stats.clear()
+            else:
+                self._stats.pop(org_id, None)
+
+
+_store: SQLiteEmployeeStore | InMemoryEmployeeStore | None = None
+_store_lock = threading.Lock()
 
 
-def get_employee_store() -> SQLiteEmployeeStore:
-    """Singleton store, ensures DB is initialized."""
-    global _initialized, _store
-    if not _initialized:
-        _init_db()
-        _initialized = True
-    if _store is None:
+def get_employee_store() -> SQLiteEmployeeStore | InMemoryEmployeeStore:
+    """
+    Singleton store (engine per `STORE_CONFIG.engine`). The first call
+    initializes the DB (schema, indexes, seed); the app does that at startup
+    (see `app.services.startup`), and concurrent first calls wait for it.
+    """
+    store = _store
+    if store is not None:
+        return store
+    with _store_lock:
+        if _store is None:
+            _init_db()
+            _open_store()
+        return _store
+
+
+def _open_store() -> None:
+    global _store
+    if STORE_CONFIG.engine == "memory":
+        # Imported here: the memory engine is built on this module.
+        from app.db.memory_store import InMemoryEmployeeStore
+
+        _store = InMemoryEmployeeStore()
+    elif STORE_CONFIG.engine == "sqlite":
         _store = SQLiteEmployeeStore()
-    return _store
+    else:
+        raise ValueError(f"Unknown store engine: {STORE_CONFIG.engine!r}")
+
 
+def close_employee_store() -> None:
+    """Drain the singleton's connection pool (called at shutdown)."""
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            _store = None
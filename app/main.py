@@ -6,14 +6,34 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
+from app.api.health import router as health_router
+from app.api.metrics import router as metrics_router
+from app.api.v1.admin import router as admin_router
 from app.api.v1.employees import router as employees_router
-from app.middleware.rate_limit import RateLimitExceeded
+from app.db.async_store import StoreOverloaded, close_async_employee_store
+from app.db.deadlines import QueryTimeout
+from app.db.pool import PoolTimeout
+from app.db.sqlite_store import close_employee_store
+from app.middleware.rate_limit import (
+    RateLimitExceeded,
+    start_idle_key_sweeper,
+    stop_idle_key_sweeper,
+)
+from app.middleware.timing import StageTimingMiddleware
+from app.services import startup
+from app.services.employee_search import InvalidSearchRequest
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup/shutdown hooks."""
+    start_idle_key_sweeper()
+    startup.start()
     yield
+    startup.stop()
+    stop_idle_key_sweeper()
+    close_async_employee_store()
+    close_employee_store()
 
 
 app = FastAPI(
@@ -24,6 +44,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
 )
+app.add_middleware(StageTimingMiddleware)
 
 
 @app.exception_handler(RateLimitExceeded)
@@ -35,4 +56,44 @@ async def rate_limit_handler(request: Request, exc: RateLimitExceeded) -> JSONRe
     )
 
 
+@app.exception_handler(StoreOverloaded)
+async def store_overloaded_handler(request: Request, exc: StoreOverloaded) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Search backend is overloaded. Try again shortly."},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(PoolTimeout)
+async def pool_timeout_handler(request: Request, exc: PoolTimeout) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "No database connection is free. Try again shortly."},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(QueryTimeout)
+async def query_timeout_handler(request: Request, exc: QueryTimeout) -> JSONResponse:
+    return JSONResponse(
+        status_code=504,
+        content={
+            "detail": "Search exceeded its time budget and was cancelled.",
+            "query": exc.query,
+            "budget_ms": exc.budget_ms,
+            "elapsed_ms": round(exc.elapsed_ms, 1),
+            "vm_steps": exc.vm_steps,
+        },
+    )
+
+
+@app.exception_handler(InvalidSearchRequest)
+async def invalid_search_handler(request: Request, exc: InvalidSearchRequest) -> JSONResponse:
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
 app.include_router(employees_router, prefix="/api/v1")
+app.include_router(admin_router, prefix="/api/v1")
+app.include_router(metrics_router)
+app.include_router(health_router)
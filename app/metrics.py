@@ -0,0 +1,271 @@
+"""
+Per-stage request timings and their Prometheus histograms.
+
+A request gets a `RequestTimings` in a context variable (set by
+`StageTimingMiddleware`); code on the request path wraps its stages in
+`with stage("count"):`. Outside a timed request `stage` returns a shared
+no-op context manager, so the instrumented store and limiter cost next to
+nothing when called from scripts, tests or background work. Store calls
+that hop to the executor carry the context along (`propagate`).
+
+When the response starts, the stages of requests labelled by the search
+service (org and filter shape) are added to `search_stage_duration_seconds`,
+and optionally sent back in a `Server-Timing` header; the response status
+is counted in `search_responses_total`. Startup phase durations are
+exported as `startup_duration_seconds`.
+"""
+from __future__ import annotations
+
+import bisect
+import contextvars
+import threading
+import time
+from collections.abc import Callable
+from contextlib import nullcontext
+from typing import Any, TypeVar
+
+from app.config import METRICS_CONFIG, MetricsConfig
+
+T = TypeVar("T")
+
+# Fields whose presence makes up the `shape` label.
+SHAPE_FIELDS = ("name", "department", "location", "position")
+
+
+class RequestTimings:
+    """Accumulated seconds per stage for one request, plus its metric labels."""
+
+    __slots__ = ("start", "stages", "org_id", "shape", "_open", "_open_start")
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.stages: dict[str, float] = {}
+        self.org_id: str | None = None
+        self.shape: str | None = None
+        self._open: str | None = None
+        self._open_start = 0.0
+
+    def add(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def label(self, org_id: str, shape: str) -> None:
+        """Mark the request for the histograms under these labels."""
+        self.org_id = org_id
+        self.shape = shape
+
+    def start_stage(self, name: str) -> None:
+        """Open a stage that runs until the response starts (see `finish`)."""
+        self._open = name
+        self._open_start = time.perf_counter()
+
+    def finish(self) -> None:
+        """Close the open stage, if any, and record the request's total time."""
+        now = time.perf_counter()
+        if self._open is not None:
+            self.add(self._open, now - self._open_start)
+            self._open = None
+        self.stages["total"] = now - self.start
+
+    def server_timing(self) -> str:
+        """`Server-Timing` header value (durations in milliseconds)."""
+        return ", ".join(f"{name};dur={seconds * 1e3:.3f}" for name, seconds in self.stages.items())
+
+
+class _Stage:
+    """Adds the time spent in its `with` block to one stage of a request."""
+
+    __slots__ = ("timings", "name", "begin")
+
+    def __init__(self, timings: RequestTimings, name: str) -> None:
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.begin = time.perf_counter()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.timings.add(self.name, time.perf_counter() - self.begin)
+
+
+_current: contextvars.ContextVar[RequestTimings | None] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+_NOT_TIMED = nullcontext()
+
+
+def current_timings() -> RequestTimings | None:
+    """Timings of the request being handled, or None outside a timed request."""
+    return _current.get()
+
+
+def stage(name: str) -> _Stage | nullcontext:
+    """Context manager timing one stage of the current request (no-op when untimed)."""
+    timings = _current.get()
+    if timings is None:
+        return _NOT_TIMED
+    return _Stage(timings, name)
+
+
+def start_stage(name: str) -> None:
+    """Open a stage that ends when the response starts (e.g. serialization)."""
+    timings = _current.get()
+    if timings is not None:
+        timings.start_stage(name)
+
+
+def label_request(org_id: str, filters: object) -> None:
+    """Label the current request by org and by which filters are set."""
+    timings = _current.get()
+    if timings is not None:
+        timings.label(org_id, filter_shape(filters))
+
+
+def label_batch(org_id: str) -> None:
+    """Label the current request as a batch search of `org_id` (shape `batch`)."""
+    timings = _current.get()
+    if timings is not None:
+        timings.label(org_id, "batch")
+
+
+def filter_shape(filters: object) -> str:
+    """`department+location` style label of the filters set, or `none`."""
+    return "+".join(f for f in SHAPE_FIELDS if getattr(filters, f)) or "none"
+
+
+def propagate(fn: Callable[..., T]) -> Callable[..., T]:
+    """
+    Wrap `fn` to run in a copy of the current context, e.g. on an executor
+    thread. For a timed request the wait until it starts is the `queue` stage.
+    """
+    context = contextvars.copy_context()
+    timings = _current.get()
+    if timings is None:
+        return lambda *args: context.run(fn, *args)
+    submitted = time.perf_counter()
+
+    def run(*args: Any) -> T:
+        timings.add("queue", time.perf_counter() - submitted)
+        return context.run(fn, *args)
+
+    return run
+
+
+def begin_request() -> tuple[RequestTimings, contextvars.Token]:
+    """Start timing a request in the current context."""
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def end_request(timings: RequestTimings, token: contextvars.Token, status: int) -> None:
+    """Stop timing; labelled requests go into the stage histograms and response counts."""
+    _current.reset(token)
+    if timings.org_id is not None and timings.shape is not None:
+        _metrics.observe(timings.org_id, timings.shape, timings.stages, status)
+
+
+class SearchMetrics:
+    """
+    Cumulative latency histograms per (stage, org, shape) and response
+    counts per (org, shape, status). Orgs beyond `max_org_labels` distinct
+    values share the org label `other`, which bounds the number of series.
+    """
+
+    def __init__(self, buckets: tuple[float, ...], max_org_labels: int) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.max_org_labels = max_org_labels
+        # (stage, org, shape) -> [per-bucket counts (+Inf last), sum, count]
+        self._series: dict[tuple[str, str, str], list] = {}
+        # (org, shape, status) -> responses
+        self._responses: dict[tuple[str, str, str], int] = {}
+        self._orgs: set[str] = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: MetricsConfig = METRICS_CONFIG) -> SearchMetrics:
+        return cls(config.buckets, config.max_org_labels)
+
+    def observe(self, org_id: str, shape: str, stages: dict[str, float], status: int) -> None:
+        """Add one request's stage durations (seconds) and response status."""
+        slots = [(name, bisect.bisect_left(self.buckets, s), s) for name, s in stages.items()]
+        with self._lock:
+            if org_id not in self._orgs:
+                if len(self._orgs) < self.max_org_labels:
+                    self._orgs.add(org_id)
+                else:
+                    org_id = "other"
+            for name, slot, seconds in slots:
+                series = self._series.get((name, org_id, shape))
+                if series is None:
+                    series = self._series[(name, org_id, shape)] = [
+                        [0] * (len(self.buckets) + 1), 0.0, 0
+                    ]
+                series[0][slot] += 1
+                series[1] += seconds
+                series[2] += 1
+            key = (org_id, shape, str(status))
+            self._responses[key] = self._responses.get(key, 0) + 1
+
+    def render(self) -> str:
+        """Prometheus text exposition (format 0.0.4)."""
+        name = "search_stage_duration_seconds"
+        lines = [
+            f"# HELP {name} Time spent in each stage of a search request.",
+            f"# TYPE {name} histogram",
+        ]
+        with self._lock:
+            series = sorted((key, [list(s[0]), s[1], s[2]]) for key, s in self._series.items())
+            responses = sorted(self._responses.items())
+        bounds = [*(f"{b:g}" for b in self.buckets), "+Inf"]
+        for (stage_name, org_id, shape), (counts, total, count) in series:
+            labels = (
+                f'stage="{_escape(stage_name)}",org="{_escape(org_id)}",shape="{_escape(shape)}"'
+            )
+            cumulative = 0
+            for le, n in zip(bounds, counts):
+                cumulative += n
+                lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {total!r}")
+            lines.append(f"{name}_count{{{labels}}} {count}")
+        name = "search_responses_total"
+        lines += [
+            f"# HELP {name} Search responses by status (504: aborted at the time budget).",
+            f"# TYPE {name} counter",
+        ]
+        for (org_id, shape, status), n in responses:
+            lines.append(
+                f'{name}{{org="{_escape(org_id)}",shape="{_escape(shape)}",status="{status}"}} {n}'
+            )
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+            self._responses.clear()
+            self._orgs.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Global search metrics configured via METRICS_CONFIG
+_metrics = SearchMetrics.from_config(METRICS_CONFIG)
+
+
+# Seconds per startup phase (see `app.services.startup`)
+_startup: dict[str, float] = {}
+
+
+def record_startup_phase(phase: str, seconds: float) -> None:
+    _startup[phase] = seconds
+
+
+def render_metrics() -> str:
+    """Current metrics in Prometheus text format."""
+    name = "startup_duration_seconds"
+    lines = [
+        f"# HELP {name} Duration of each startup phase (init: schema and seed, warmup: caches).",
+        f"# TYPE {name} gauge",
+        *(f'{name}{{phase="{phase}"}} {seconds!r}' for phase, seconds in sorted(_startup.items())),
+    ]
+    return _metrics.render() + "\n".join(lines) + "\n"
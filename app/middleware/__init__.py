@@ -1,7 +1,21 @@
 from app.middleware.rate_limit import (
+    GCRARateLimiter,
+    RateLimiterBackend,
     RateLimitExceeded,
     SlidingWindowRateLimiter,
     check_rate_limit,
+    check_rate_limit_async,
+    create_rate_limiter,
 )
+from app.middleware.shared_rate_limit import SQLiteRateLimiter
 
-__all__ = ["RateLimitExceeded", "SlidingWindowRateLimiter", "check_rate_limit"]
+__all__ = [
+    "GCRARateLimiter",
+    "RateLimiterBackend",
+    "RateLimitExceeded",
+    "SlidingWindowRateLimiter",
+    "SQLiteRateLimiter",
+    "check_rate_limit",
+    "check_rate_limit_async",
+    "create_rate_limiter",
+]
@@ -1,15 +1,44 @@
 """Rate limiting using only Python standard library.
 
-Sliding window per (org_id or IP).
+`check_rate_limit` talks to a pluggable `RateLimiterBackend`. In-process
+backends, selected by `app.config.RATE_LIMIT_CONFIG.algorithm`:
+
+- ``sliding_window``: exact sliding window, a deque of timestamps per key.
+- ``gcra``: Generic Cell Rate Algorithm, one float per key, with lock
+  striping so checks for different keys rarely contend.
+
+With ``backend = "sqlite"`` the GCRA state is shared by all worker
+processes on the host (see `app.middleware.shared_rate_limit`).
+
+Both drop idle keys via `sweep()`, which a background thread calls
+periodically once `start_idle_key_sweeper()` has run.
 Configuration is centralized in `app.config.RATE_LIMIT_CONFIG`.
 """
 import threading
 import time
+import zlib
 from collections import deque
+from collections.abc import Callable
+from pathlib import Path
+from typing import Protocol
 
 from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+
+from app.config import RATE_LIMIT_CONFIG, RateLimitConfig
+from app.middleware.shared_rate_limit import DEFAULT_SHARED_DB_PATH, SQLiteRateLimiter
+
 
-from app.config import RATE_LIMIT_CONFIG
+class RateLimiterBackend(Protocol):
+    """What `check_rate_limit` and the idle-key sweeper need from a limiter."""
+
+    def is_allowed(self, key: str, cost: int = 1) -> bool:
+        """Check if `cost` requests are allowed. If yes, records them."""
+        ...
+
+    def sweep(self) -> int:
+        """Evict idle keys; return how many were removed."""
+        ...
 
 
 class SlidingWindowRateLimiter:
@@ -31,24 +60,150 @@ class SlidingWindowRateLimiter:
         while q and q[0] < cutoff:
             q.popleft()
 
-    def is_allowed(self, key: str) -> bool:
-        """Check if request is allowed. If yes, records the request."""
+    def is_allowed(self, key: str, cost: int = 1) -> bool:
+        """Check if `cost` requests are allowed. If yes, records them."""
         now = time.monotonic()
         with self._lock:
             if key not in self._cache:
                 self._cache[key] = deque()
             self._clean_old(key, now)
             q = self._cache[key]
-            if len(q) >= self.max_requests:
+            if len(q) + cost > self.max_requests:
                 return False
-            q.append(now)
+            q.extend([now] * cost)
             return True
 
+    def sweep(self) -> int:
+        """Drop keys with no requests left in the window. Returns keys removed."""
+        cutoff = time.monotonic() - self.window_seconds
+        with self._lock:
+            idle = [key for key, q in self._cache.items() if not q or q[-1] < cutoff]
+            for key in idle:
+                del self._cache[key]
+        return len(idle)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+class GCRARateLimiter:
+    """
+    Generic Cell Rate Algorithm: O(1) memory per key.
+
+    Each key stores only its theoretical arrival time (TAT). A request is
+    allowed while TAT - now <= window - interval, which admits bursts of up
+    to `max_requests` and then one request per `window / max_requests`.
+    Keys are spread over `shards` independently locked dicts.
+    """
+
+    def __init__(
+        self,
+        max_requests: int = 100,
+        window_seconds: int = 60,
+        shards: int = 16,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self._interval = window_seconds / max_requests
+        self._tolerance = window_seconds - self._interval
+        self._clock = clock
+        self._shards: list[tuple[threading.Lock, dict[str, float]]] = [
+            (threading.Lock(), {}) for _ in range(max(1, shards))
+        ]
+
+    def _shard(self, key: str) -> tuple[threading.Lock, dict[str, float]]:
+        # crc32 rather than hash(): stable across processes and restarts.
+        return self._shards[zlib.crc32(key.encode()) % len(self._shards)]
+
+    def is_allowed(self, key: str, cost: int = 1) -> bool:
+        """Check if `cost` requests are allowed. If yes, records them."""
+        now = self._clock()
+        # A weighted request must fit `cost` emission intervals into the window.
+        tolerance = self._tolerance - (cost - 1) * self._interval
+        lock, tats = self._shard(key)
+        with lock:
+            tat = max(tats.get(key, now), now)
+            if tat - now > tolerance:
+                return False
+            tats[key] = tat + cost * self._interval
+            return True
+
+    def sweep(self) -> int:
+        """Drop keys whose TAT has passed (indistinguishable from new keys)."""
+        now = self._clock()
+        removed = 0
+        for lock, tats in self._shards:
+            with lock:
+                idle = [key for key, tat in tats.items() if tat <= now]
+                for key in idle:
+                    del tats[key]
+            removed += len(idle)
+        return removed
+
+    def __len__(self) -> int:
+        return sum(len(tats) for _, tats in self._shards)
+
+
+def create_rate_limiter(config: RateLimitConfig = RATE_LIMIT_CONFIG) -> RateLimiterBackend:
+    """Build the limiter selected by `config.backend` and `config.algorithm`."""
+    if config.backend == "sqlite":
+        if config.algorithm != "gcra":
+            raise ValueError("The sqlite rate limit backend only supports algorithm='gcra'")
+        return SQLiteRateLimiter(
+            max_requests=config.requests_per_minute,
+            window_seconds=config.window_seconds,
+            db_path=Path(config.shared_db_path) if config.shared_db_path else DEFAULT_SHARED_DB_PATH,
+            busy_timeout_seconds=config.shared_busy_timeout_ms / 1000,
+            fail_open=config.shared_fail_open,
+        )
+    if config.backend != "memory":
+        raise ValueError(f"Unknown rate limit backend: {config.backend!r}")
+    if config.algorithm == "gcra":
+        return GCRARateLimiter(
+            max_requests=config.requests_per_minute,
+            window_seconds=config.window_seconds,
+            shards=config.shards,
+        )
+    if config.algorithm == "sliding_window":
+        return SlidingWindowRateLimiter(
+            max_requests=config.requests_per_minute,
+            window_seconds=config.window_seconds,
+        )
+    raise ValueError(f"Unknown rate limit algorithm: {config.algorithm!r}")
+
+
 # Global limiter configured via RATE_LIMIT_CONFIG
-_limiter = SlidingWindowRateLimiter(
-    max_requests=RATE_LIMIT_CONFIG.requests_per_minute,
-    window_seconds=RATE_LIMIT_CONFIG.window_seconds,
-)
+_limiter: RateLimiterBackend = create_rate_limiter(RATE_LIMIT_CONFIG)
+
+_sweeper: threading.Thread | None = None
+_sweeper_stop = threading.Event()
+
+
+def _sweep_loop(interval: float) -> None:
+    while not _sweeper_stop.wait(interval):
+        _limiter.sweep()
+
+
+def start_idle_key_sweeper(interval: float = RATE_LIMIT_CONFIG.idle_sweep_interval_seconds) -> None:
+    """Start the background thread that evicts idle keys from `_limiter`."""
+    global _sweeper
+    if _sweeper is not None and _sweeper.is_alive():
+        return
+    _sweeper_stop.clear()
+    _sweeper = threading.Thread(
+        target=_sweep_loop, args=(interval,), name="rate-limit-sweeper", daemon=True
+    )
+    _sweeper.start()
+
+
+def stop_idle_key_sweeper() -> None:
+    """Stop the sweeper thread started by `start_idle_key_sweeper`."""
+    global _sweeper
+    _sweeper_stop.set()
+    if _sweeper is not None:
+        _sweeper.join()
+        _sweeper = None
 
 
 def get_client_key(request: Request, org_id: str | None = None) -> str:
@@ -62,16 +217,28 @@ def get_client_key(request: Request, org_id: str | None = None) -> str:
     return f"ip:{ip}"
 
 
-def check_rate_limit(request: Request, org_id: str) -> None:
+def check_rate_limit(request: Request, org_id: str, cost: int = 1) -> None:
     """
     Dependency: raises 429 if rate limit exceeded.
     Call with org_id from the route (we have it as query param).
+    `cost` charges one call as several requests (e.g. a batch search).
     """
     key = get_client_key(request, org_id)
-    if not _limiter.is_allowed(key):
+    if not _limiter.is_allowed(key, cost):
         raise RateLimitExceeded()
 
 
+async def check_rate_limit_async(request: Request, org_id: str, cost: int = 1) -> None:
+    """
+    `check_rate_limit` for async routes: the shared SQLite backend writes to
+    disk, so its checks run in a worker thread instead of on the event loop.
+    """
+    if isinstance(_limiter, SQLiteRateLimiter):
+        await run_in_threadpool(check_rate_limit, request, org_id, cost)
+    else:
+        check_rate_limit(request, org_id, cost)
+
+
 class RateLimitExceeded(Exception):
     """Raised when rate limit is exceeded."""
 
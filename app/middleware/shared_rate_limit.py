@@ -0,0 +1,104 @@
+"""Rate limit state shared by all worker processes on a host.
+
+`SQLiteRateLimiter` keeps GCRA state (one theoretical arrival time per key)
+in a WAL-mode SQLite table. Each check is a single atomic upsert, so
+`uvicorn --workers N` processes draw from one quota per key, and the state
+survives restarts. Standard library only.
+
+A check is a blocking write, so callers on the event loop should run it in
+a worker thread (`check_rate_limit_async`). It waits at most
+`busy_timeout_seconds` for a locked database; past that, or on any other
+SQLite error, it admits or rejects the request as `fail_open` says and
+counts the failure in `errors`.
+"""
+import sqlite3
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+DEFAULT_SHARED_DB_PATH = Path(tempfile.gettempdir()) / "hr-employee-search-ratelimit.sqlite3"
+
+# Admit the request and advance TAT only while TAT - now <= tolerance.
+# Weighted requests pass `cost` intervals and a tolerance reduced to match;
+# a cost larger than the whole quota (negative tolerance) is never admitted.
+# When the DO UPDATE's WHERE fails nothing is written and no row is returned.
+_CHECK_SQL = """
+    INSERT INTO rate_limits (key, tat) SELECT :key, :now + :interval WHERE :tolerance >= 0
+    ON CONFLICT(key) DO UPDATE SET tat = max(tat, :now) + :interval
+    WHERE max(tat, :now) - :now <= :tolerance
+    RETURNING tat
+"""
+
+
+class SQLiteRateLimiter:
+    """
+    GCRA limiter backed by a shared SQLite table.
+    Uses wall-clock time, since monotonic clocks are not comparable across processes.
+    """
+
+    def __init__(
+        self,
+        max_requests: int = 100,
+        window_seconds: int = 60,
+        db_path: Path = DEFAULT_SHARED_DB_PATH,
+        clock: Callable[[], float] = time.time,
+        busy_timeout_seconds: float = 0.05,
+        fail_open: bool = True,
+    ) -> None:
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.db_path = Path(db_path)
+        self.busy_timeout_seconds = busy_timeout_seconds
+        self.fail_open = fail_open
+        self.errors = 0
+        self._interval = window_seconds / max_requests
+        self._tolerance = window_seconds - self._interval
+        self._clock = clock
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits (key TEXT PRIMARY KEY, tat REAL NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit: every check is its own atomic statement.
+            conn = sqlite3.connect(
+                self.db_path, isolation_level=None, timeout=self.busy_timeout_seconds
+            )
+            conn.execute("PRAGMA journal_mode = WAL")
+            # Limiter state is disposable; losing the last checks on power loss is harmless.
+            conn.execute("PRAGMA synchronous = OFF")
+            self._local.conn = conn
+        return conn
+
+    def is_allowed(self, key: str, cost: int = 1) -> bool:
+        """
+        Check if `cost` requests are allowed. If yes, records them.
+        Returns `fail_open` when the database stays locked or errors.
+        """
+        try:
+            row = self._connection().execute(
+                _CHECK_SQL,
+                {
+                    "key": key,
+                    "now": self._clock(),
+                    "interval": cost * self._interval,
+                    "tolerance": self._tolerance - (cost - 1) * self._interval,
+                },
+            ).fetchone()
+        except sqlite3.Error:
+            self.errors += 1
+            return self.fail_open
+        return row is not None
+
+    def sweep(self) -> int:
+        """Delete keys whose TAT has passed."""
+        cur = self._connection().execute("DELETE FROM rate_limits WHERE tat <= ?", (self._clock(),))
+        return cur.rowcount
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM rate_limits").fetchone()[0]
@@ -0,0 +1,39 @@
+"""
+ASGI middleware that times each request's stages (see `app.metrics`).
+
+A plain ASGI middleware rather than `BaseHTTPMiddleware`: it adds no task
+or stream per request, only a context variable and a wrapped `send`.
+"""
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app import metrics
+from app.config import METRICS_CONFIG
+
+
+class StageTimingMiddleware:
+    """Start a `RequestTimings` per HTTP request; close it when the response starts."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not METRICS_CONFIG.enabled:
+            await self.app(scope, receive, send)
+            return
+        timings, token = metrics.begin_request()
+        status = 500  # unless a response starts
+
+        async def send_timed(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timings.finish()
+                if METRICS_CONFIG.server_timing and timings.org_id is not None:
+                    MutableHeaders(scope=message).append("Server-Timing", timings.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            metrics.end_request(timings, token, status)
@@ -1,9 +1,31 @@
 from app.schemas.employee import (
+    CountMode,
+    EmployeeAutocompleteRequest,
+    EmployeeAutocompleteResponse,
+    EmployeeBatchSearchRequest,
+    EmployeeBatchSearchResponse,
+    EmployeeExportRequest,
+    EmployeeFacetsRequest,
+    EmployeeFacetsResponse,
     EmployeeSearchRequest,
     EmployeeSearchResponse,
+    MatchMode,
+    SortField,
+    SortOrder,
 )
 
 __all__ = [
+    "CountMode",
+    "EmployeeAutocompleteRequest",
+    "EmployeeAutocompleteResponse",
+    "EmployeeBatchSearchRequest",
+    "EmployeeBatchSearchResponse",
+    "EmployeeExportRequest",
+    "EmployeeFacetsRequest",
+    "EmployeeFacetsResponse",
     "EmployeeSearchRequest",
     "EmployeeSearchResponse",
+    "MatchMode",
+    "SortField",
+    "SortOrder",
 ]
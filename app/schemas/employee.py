@@ -1,10 +1,22 @@
 """
 Pydantic schemas for Search API.
 """
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
+# How `total` is produced: exact COUNT(*), estimate from cached per-org
+# statistics, or not at all (clients rely on `has_more`).
+CountMode = Literal["exact", "estimate", "none"]
+
+# How `name` matches: case-insensitive substring, or typo-tolerant trigram
+# similarity with results ranked by score.
+MatchMode = Literal["substring", "fuzzy"]
+
+# Result ordering: a sort column (ties broken by id) and direction.
+SortField = Literal["id", "name", "department", "location", "position"]
+SortOrder = Literal["asc", "desc"]
+
 
 class EmployeeSearchRequest(BaseModel):
     """Search request with filters and pagination."""
@@ -16,17 +28,133 @@ class EmployeeSearchRequest(BaseModel):
     position: str | None = Field(None, description="Exact match on position")
     limit: int = Field(20, ge=1, le=100, description="Page size")
     offset: int = Field(0, ge=0, description="Offset for pagination")
+    cursor: str | None = Field(
+        None, description="Opaque cursor from a previous page's next_cursor (keyset pagination)"
+    )
+    count: CountMode = Field("exact", description="How to compute total: exact, estimate or none")
+    match: MatchMode = Field(
+        "substring", description="Name matching: substring, or fuzzy (ranked by similarity)"
+    )
+    sort: SortField = Field("id", description="Sort column; ties are broken by id")
+    order: SortOrder = Field("asc", description="Sort direction: asc or desc")
+    timeout_ms: int | None = Field(
+        None, ge=1, description="Time budget in ms; can only tighten the server default"
+    )
 
     model_config = {
         "json_schema_extra": {
             "examples": [
                 {"org_id": "org_a", "name": "John", "limit": 10, "offset": 0},
+                {"org_id": "org_b", "name": "Jon Smtih", "match": "fuzzy"},
+                {"org_id": "org_a", "sort": "name", "order": "desc"},
                 {"org_id": "org_b", "department": "Engineering", "limit": 20},
             ]
         }
     }
 
 
+# Most searches accepted by one batch request.
+MAX_BATCH_SEARCHES = 50
+
+
+class EmployeeBatchSearchRequest(BaseModel):
+    """Several searches for one organization, run together."""
+
+    searches: list[EmployeeSearchRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_SEARCHES,
+        description="Searches to run; every entry must use the batch's org_id",
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "searches": [
+                        {"org_id": "org_b", "department": "Engineering", "limit": 10},
+                        {"org_id": "org_b", "department": "Sales", "limit": 10},
+                    ]
+                }
+            ]
+        }
+    }
+
+
+class EmployeeExportRequest(BaseModel):
+    """Export request: the search filters, without pagination."""
+
+    org_id: str = Field(..., description="Organization ID", examples=["org_a"])
+    name: str | None = Field(None, description="Partial match on name")
+    department: str | None = Field(None, description="Exact match on department")
+    location: str | None = Field(None, description="Exact match on location")
+    position: str | None = Field(None, description="Exact match on position")
+
+
+class EmployeeAutocompleteRequest(BaseModel):
+    """Name prefix lookup for people-pickers."""
+
+    org_id: str = Field(..., description="Organization ID", examples=["org_a"])
+    q: str = Field(..., min_length=1, max_length=100, description="Prefix of any word of the name")
+    limit: int = Field(10, ge=1, le=50, description="Maximum suggestions")
+
+
+class EmployeeAutocompleteResponse(BaseModel):
+    """Matching employees, projected with the org's columns."""
+
+    items: list[dict[str, Any]] = Field(
+        ..., description="Employees whose name has a word starting with q - fields per org config"
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {"items": [{"name": "John Smith", "department": "Engineering", "position": "SE"}]}
+            ]
+        }
+    }
+
+
+# Fields that can be counted per value by the facets endpoint.
+FacetField = Literal["department", "location", "position"]
+
+
+class EmployeeFacetsRequest(BaseModel):
+    """Facet counts request: search filters plus the fields to count."""
+
+    org_id: str = Field(..., description="Organization ID", examples=["org_a"])
+    name: str | None = Field(None, description="Partial match on name")
+    department: str | None = Field(None, description="Exact match on department")
+    location: str | None = Field(None, description="Exact match on location")
+    position: str | None = Field(None, description="Exact match on position")
+    fields: list[FacetField] | None = Field(
+        None, description="Fields to count; defaults to every facet field visible to the org"
+    )
+
+
+class EmployeeFacetsResponse(BaseModel):
+    """Per-value counts for each requested facet field."""
+
+    facets: dict[str, dict[str, int]] = Field(
+        ..., description="field -> value -> number of matching employees"
+    )
+    total: int = Field(..., description="Total matching count")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "facets": {
+                        "department": {"Engineering": 2, "Finance": 1, "HR": 1},
+                        "location": {"DN": 1, "HCM": 1, "HN": 2},
+                    },
+                    "total": 4,
+                }
+            ]
+        }
+    }
+
+
 # EmployeeItem: each item is a dict with only org-configured fields.
 # Type alias for clarity; actual response uses list[dict[str, Any]]
 EmployeeItem = dict[str, Any]
@@ -39,9 +167,14 @@ class EmployeeSearchResponse(BaseModel):
         ...,
         description="List of employees - fields per org config (name, email, etc.)",
     )
-    total: int = Field(..., description="Total matching count")
+    total: int | None = Field(..., description="Total matching count (null when total_mode is none)")
+    total_mode: CountMode = Field("exact", description="How total was produced")
+    has_more: bool = Field(False, description="Whether more results follow this page")
     limit: int = Field(..., description="Page size used")
     offset: int = Field(..., description="Offset used")
+    next_cursor: str | None = Field(
+        None, description="Cursor for the next page; null when there are no more results"
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -51,9 +184,18 @@ class EmployeeSearchResponse(BaseModel):
                         {"name": "John Doe", "email": "john@example.com", "department": "Engineering", "location": "HN"}
                     ],
                     "total": 1,
+                    "total_mode": "exact",
+                    "has_more": False,
                     "limit": 10,
                     "offset": 0,
+                    "next_cursor": None,
                 }
             ]
         }
     }
+
+
+class EmployeeBatchSearchResponse(BaseModel):
+    """One search response per batch entry, in request order."""
+
+    results: list[EmployeeSearchResponse] = Field(..., description="Responses in request order")
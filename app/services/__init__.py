@@ -1,4 +1,4 @@
 from app.services.column_config import get_org_columns
-from app.services.employee_search import EmployeeSearchService
+from app.services.employee_search import EmployeeSearchService, InvalidSearchRequest
 
-__all__ = ["get_org_columns", "EmployeeSearchService"]
+__all__ = ["get_org_columns", "EmployeeSearchService", "InvalidSearchRequest"]
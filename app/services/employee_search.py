@@ -3,10 +3,44 @@ Employee search service.
 Applies column config and returns only allowed fields in correct order.
 Backed by SQLite via the Python standard library (`sqlite3`).
 """
-from app.db.sqlite_store import SearchFilters, get_employee_store
+import hashlib
+import itertools
+import json
+from collections.abc import Callable, Iterator
+
+from app import metrics
+from app.config import (
+    AUTOCOMPLETE_CONFIG,
+    FUZZY_SEARCH_CONFIG,
+    SEARCH_CACHE_CONFIG,
+    SEARCH_COALESCING_CONFIG,
+    STORE_CONFIG,
+)
+from app.db.async_store import get_async_employee_store
+from app.db.deadlines import effective_budget_ms, time_budget
+from app.db.sqlite_store import FACET_FIELDS, SearchFilters, SQLiteEmployeeStore, get_employee_store
 from app.models.employee import Employee
-from app.schemas.employee import EmployeeSearchRequest, EmployeeSearchResponse
-from app.services.column_config import get_org_columns
+from app.schemas.employee import (
+    CountMode,
+    EmployeeAutocompleteRequest,
+    EmployeeAutocompleteResponse,
+    EmployeeBatchSearchResponse,
+    EmployeeExportRequest,
+    EmployeeFacetsRequest,
+    EmployeeFacetsResponse,
+    EmployeeSearchRequest,
+    EmployeeSearchResponse,
+)
+from app.services.fuzzy_index import TrigramNameIndex
+from app.services.name_index import NameIndexCache, normalize_prefix
+from app.services.pagination import Cursor, decode_cursor, encode_cursor, filter_fingerprint
+from app.services.projection import get_org_projection
+from app.services.search_cache import SearchResultCache, estimate_size
+from app.services.single_flight import SingleFlight
+
+
+class InvalidSearchRequest(Exception):
+    """Raised for search parameters that pass validation but cannot be served."""
 
 
 class EmployeeSearchService:
@@ -16,7 +50,110 @@ class EmployeeSearchService:
     def search(req: EmployeeSearchRequest) -> EmployeeSearchResponse:
         """
         Search employees, filter by org + criteria, paginate,
-        and project only org-configured columns.
+        and project only org-configured columns. Identical searches already
+        running are joined rather than repeated. Store queries run under the
+        search's time budget (QueryTimeout when it is spent).
+        """
+        store = get_employee_store()
+        filters = _build_filters(req)
+        execute = _EXECUTORS[req.match]
+        metrics.label_request(req.org_id, filters)
+        key = (store.org_version(filters.org_id), filters, req.count, req.match)
+        if SEARCH_CACHE_CONFIG.enabled and (response := _search_cache.get(key)) is not None:
+            return response
+        budget = _budget_ms(req)
+        args = (key, execute, store, filters, req.count)
+        with time_budget(budget):
+            if not SEARCH_COALESCING_CONFIG.enabled:
+                return _execute_and_cache(*args)
+            # Only searches with the same budget share an execution (and its timeout).
+            return _search_flights.do((key, budget), _execute_and_cache, *args)
+
+    @staticmethod
+    async def search_async(req: EmployeeSearchRequest) -> EmployeeSearchResponse:
+        """
+        Same as `search`, but the store work, the org version lookup
+        included, runs on the bounded store executor so the event loop is
+        never blocked by SQLite.
+        Raises StoreOverloaded when the executor queue is full, and
+        QueryTimeout when the search runs past its time budget.
+        """
+        astore = get_async_employee_store()
+        filters = _build_filters(req)
+        execute = _EXECUTORS[req.match]
+        metrics.label_request(req.org_id, filters)
+        version = await astore.run(astore.store.org_version, filters.org_id)
+        key = (version, filters, req.count, req.match)
+        if SEARCH_CACHE_CONFIG.enabled and (response := _search_cache.get(key)) is not None:
+            return response
+        budget = _budget_ms(req)
+        args = (key, execute, astore.store, filters, req.count)
+        with time_budget(budget):
+            if not SEARCH_COALESCING_CONFIG.enabled:
+                return await astore.run(_execute_and_cache, *args)
+            return await _search_flights.do_async(
+                (key, budget), astore.run, _execute_and_cache, *args
+            )
+
+    @staticmethod
+    def search_etag(req: EmployeeSearchRequest) -> str:
+        """
+        Strong ETag for the page `search` returns for `req`: a hash of the
+        org's data version, the normalized filters (cursor included), the
+        count/match modes and the org's columns. Needs no employee query, so
+        an unchanged page can be answered with 304 before any search work.
+        """
+        return _etag(req, get_employee_store().org_version(req.org_id))
+
+    @staticmethod
+    async def search_etag_async(req: EmployeeSearchRequest) -> str:
+        """`search_etag` with the org version read on the bounded store executor."""
+        astore = get_async_employee_store()
+        return _etag(req, await astore.run(astore.store.org_version, req.org_id))
+
+    @staticmethod
+    def search_batch(org_id: str, reqs: list[EmployeeSearchRequest]) -> EmployeeBatchSearchResponse:
+        """
+        Run several searches for one org together. Cached pages come from the
+        result cache; the rest run over a single store connection, with
+        compatible searches merged (see `SQLiteEmployeeStore.search_many`).
+        Results keep request order.
+        """
+        store = get_employee_store()
+        metrics.label_batch(org_id)
+        batch = _build_batch(org_id, reqs)
+        version = store.org_version(org_id)
+        results, missing = _cached_batch(batch, version)
+        if missing:
+            with time_budget(_batch_budget_ms(reqs)):
+                fresh = _execute_batch(store, [batch[i] for i in missing])
+            _fill_batch(results, missing, fresh, batch, version)
+        return EmployeeBatchSearchResponse.model_construct(results=results)
+
+    @staticmethod
+    async def search_batch_async(
+        org_id: str, reqs: list[EmployeeSearchRequest]
+    ) -> EmployeeBatchSearchResponse:
+        """`search_batch` with the store work as one task on the bounded store executor."""
+        astore = get_async_employee_store()
+        metrics.label_batch(org_id)
+        batch = _build_batch(org_id, reqs)
+        version = await astore.run(astore.store.org_version, org_id)
+        results, missing = _cached_batch(batch, version)
+        if missing:
+            with time_budget(_batch_budget_ms(reqs)):
+                fresh = await astore.run(_execute_batch, astore.store, [batch[i] for i in missing])
+            _fill_batch(results, missing, fresh, batch, version)
+        return EmployeeBatchSearchResponse.model_construct(results=results)
+
+    @staticmethod
+    def export_ndjson(req: EmployeeExportRequest, batch_size: int = 1000) -> Iterator[bytes]:
+        """
+        Yield the whole filtered result set as NDJSON, one chunk per batch of
+        rows, projected with the org's columns. Memory use is bounded by
+        `batch_size` however many employees match. The first batch is read
+        before this returns, so an export refused for lack of an export
+        connection (PoolTimeout) fails before its response starts.
         """
         store = get_employee_store()
         filters = SearchFilters(
@@ -25,18 +162,348 @@ class EmployeeSearchService:
             department=req.department,
             location=req.location,
             position=req.position,
-            limit=req.limit,
-            offset=req.offset,
-        )
-        employees, total = store.search(filters)
-        columns = get_org_columns(req.org_id)
-        items = [_project_employee(e, columns) for e in employees]
-        return EmployeeSearchResponse(
-            items=items,
-            total=total,
-            limit=req.limit,
-            offset=req.offset,
+        ).normalized()
+        projection = get_org_projection(req.org_id)
+        dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        batches = store.export_rows(filters, projection.select_columns, batch_size)
+        first = next(batches, None)
+        if first is None:
+            return iter(())
+
+        def chunks() -> Iterator[bytes]:
+            try:
+                for rows in itertools.chain([first], batches):
+                    yield "".join(dumps(item) + "\n" for item in projection.build(rows)).encode()
+            finally:
+                batches.close()  # hand the export connection back
+
+        return chunks()
+
+    @staticmethod
+    async def export_ndjson_async(req: EmployeeExportRequest) -> Iterator[bytes]:
+        """`export_ndjson`, with its first batch read on the bounded store executor."""
+        return await get_async_employee_store().run(EmployeeSearchService.export_ndjson, req)
+
+    @staticmethod
+    def facets(req: EmployeeFacetsRequest) -> EmployeeFacetsResponse:
+        """
+        Count matching employees per value of each requested facet field in
+        one grouped pass. Only fields in the org's column config may be
+        counted, so facets never reveal values of hidden columns.
+        """
+        visible = [f for f in FACET_FIELDS if f in get_org_projection(req.org_id).columns]
+        fields = visible if req.fields is None else list(dict.fromkeys(req.fields))
+        hidden = [f for f in fields if f not in visible]
+        if hidden:
+            raise InvalidSearchRequest(f"facet fields not available for this organization: {hidden}")
+        filters = SearchFilters(
+            org_id=req.org_id,
+            name=req.name,
+            department=req.department,
+            location=req.location,
+            position=req.position,
+        ).normalized()
+        counts, total = get_employee_store().facet_counts(filters, fields)
+        return EmployeeFacetsResponse.model_construct(facets=counts, total=total)
+
+    @staticmethod
+    async def facets_async(req: EmployeeFacetsRequest) -> EmployeeFacetsResponse:
+        """`facets` on the bounded store executor, within the default search time budget."""
+        with time_budget(STORE_CONFIG.search_timeout_ms):
+            return await get_async_employee_store().run(EmployeeSearchService.facets, req)
+
+    @staticmethod
+    def autocomplete(req: EmployeeAutocompleteRequest) -> EmployeeAutocompleteResponse:
+        """
+        Employees whose name has a word starting with `req.q`, from the
+        org's in-memory prefix index. Orgs that do not show `name` get 400.
+        """
+        projection = get_org_projection(req.org_id)
+        if "name" not in projection.columns:
+            raise InvalidSearchRequest("name is not available for this organization")
+        index = _name_indexes.get(get_employee_store(), req.org_id, projection.select_columns)
+        rows = index.search(normalize_prefix(req.q), req.limit)
+        return EmployeeAutocompleteResponse.model_construct(items=projection.build(rows))
+
+    @staticmethod
+    async def autocomplete_async(req: EmployeeAutocompleteRequest) -> EmployeeAutocompleteResponse:
+        """`autocomplete` on the bounded store executor (a cold org loads from the store)."""
+        return await get_async_employee_store().run(EmployeeSearchService.autocomplete, req)
+
+    @staticmethod
+    def cache_stats() -> dict[str, int]:
+        """Hit/miss/eviction counters of the search result cache."""
+        return _search_cache.stats()
+
+    @staticmethod
+    def coalescing_stats() -> dict[str, int]:
+        """Executions and coalesced (joined) callers of identical concurrent searches."""
+        return _search_flights.stats()
+
+    @staticmethod
+    def slow_queries(full_scan_only: bool = False, limit: int | None = None) -> dict:
+        """
+        The store's slow-query log, newest first: threshold, counters and
+        entries (optionally only full table scans).
+        """
+        log = get_employee_store().slow_queries
+        entries = [e for e in log.entries() if e.full_scan or not full_scan_only][:limit]
+        return {
+            "threshold_ms": log.threshold_ms,
+            **log.stats(),
+            "queries": [entry._asdict() for entry in entries],
+        }
+
+    @staticmethod
+    def name_index_stats() -> dict[str, int]:
+        """Occupancy and load/eviction counters of the autocomplete indexes."""
+        return _name_indexes.stats()
+
+
+# Global result cache configured via SEARCH_CACHE_CONFIG
+_search_cache = SearchResultCache.from_config(SEARCH_CACHE_CONFIG)
+
+# Identical in-flight searches (same key as the result cache) run once
+_search_flights = SingleFlight()
+
+# Global autocomplete indexes configured via AUTOCOMPLETE_CONFIG
+_name_indexes = NameIndexCache.from_config(AUTOCOMPLETE_CONFIG)
+
+# Global fuzzy name indexes configured via FUZZY_SEARCH_CONFIG
+_fuzzy_indexes = NameIndexCache(
+    max_orgs=FUZZY_SEARCH_CONFIG.max_orgs,
+    max_entries=FUZZY_SEARCH_CONFIG.max_entries,
+    index_type=TrigramNameIndex,
+)
+
+
+def _build_filters(req: EmployeeSearchRequest) -> SearchFilters:
+    """Normalized store filters for a request, with any cursor resolved."""
+    filters = SearchFilters(
+        org_id=req.org_id,
+        name=req.name,
+        department=req.department,
+        location=req.location,
+        position=req.position,
+        limit=req.limit,
+        offset=req.offset,
+        sort=req.sort,
+        order=req.order,
+    ).normalized()
+    # Sorting by a hidden column would leak its order (and values, via the cursor).
+    if req.sort != "id" and req.sort not in get_org_projection(req.org_id).columns:
+        raise InvalidSearchRequest(f"cannot sort by {req.sort!r} for this organization")
+    if req.match == "fuzzy":
+        if not filters.name:
+            raise InvalidSearchRequest("match=fuzzy requires a name")
+        if req.cursor is not None:
+            raise InvalidSearchRequest("fuzzy results are ranked; page them with offset")
+        if (req.sort, req.order) != ("id", "asc"):
+            raise InvalidSearchRequest("fuzzy results are ranked by similarity and cannot be sorted")
+    if req.cursor is not None:
+        if req.offset:
+            raise InvalidSearchRequest("cursor and offset cannot be combined")
+        cursor = _resolve_cursor(req.cursor, filters)
+        filters = filters._replace(after_id=cursor.last_id, after_key=cursor.last_key)
+    return filters
+
+
+def _etag(req: EmployeeSearchRequest, version: int) -> str:
+    """The ETag of `search_etag`, given the org's data version."""
+    raw = json.dumps(
+        [
+            version,
+            list(_build_filters(req)),
+            req.count,
+            req.match,
+            get_org_projection(req.org_id).columns,
+        ],
+        separators=(",", ":"),
+    )
+    return f'"{hashlib.sha256(raw.encode()).hexdigest()[:32]}"'
+
+
+def _budget_ms(req: EmployeeSearchRequest) -> float | None:
+    """Time budget of a search: the server default, or less if the request asks."""
+    return effective_budget_ms(STORE_CONFIG.search_timeout_ms, req.timeout_ms)
+
+
+def _batch_budget_ms(reqs: list[EmployeeSearchRequest]) -> float | None:
+    """A batch runs as one unit, so it gets the tightest budget of its entries."""
+    budgets = [b for b in map(_budget_ms, reqs) if b is not None]
+    return min(budgets, default=None)
+
+
+def _build_batch(
+    org_id: str, reqs: list[EmployeeSearchRequest]
+) -> list[tuple[SearchFilters, CountMode]]:
+    """Filters and count mode per batch entry; every entry must be for `org_id`."""
+    others = sorted({req.org_id for req in reqs} - {org_id})
+    if others:
+        raise InvalidSearchRequest(f"batch searches must all be for org {org_id!r}, got {others}")
+    if any(req.match == "fuzzy" for req in reqs):
+        raise InvalidSearchRequest("match=fuzzy is not supported in batch searches")
+    return [(_build_filters(req), req.count) for req in reqs]
+
+
+def _cached_batch(
+    batch: list[tuple[SearchFilters, CountMode]], version: int
+) -> tuple[list[EmployeeSearchResponse | None], list[int]]:
+    """Cached responses (None on miss) and the indexes still to execute."""
+    if not SEARCH_CACHE_CONFIG.enabled:
+        return [None] * len(batch), list(range(len(batch)))
+    results = [
+        _search_cache.get((version, filters, count, "substring")) for filters, count in batch
+    ]
+    return results, [i for i, response in enumerate(results) if response is None]
+
+
+def _fill_batch(
+    results: list[EmployeeSearchResponse | None],
+    missing: list[int],
+    fresh: list[EmployeeSearchResponse],
+    batch: list[tuple[SearchFilters, CountMode]],
+    version: int,
+) -> None:
+    """Slot freshly executed responses into `results` and cache them."""
+    for i, response in zip(missing, fresh):
+        results[i] = response
+        if SEARCH_CACHE_CONFIG.enabled:
+            filters, count = batch[i]
+            key = (version, filters, count, "substring")
+            _search_cache.put(key, response, estimate_size(response.items))
+
+
+def _execute_and_cache(
+    key: tuple,
+    execute: Callable[[SQLiteEmployeeStore, SearchFilters, CountMode], EmployeeSearchResponse],
+    store: SQLiteEmployeeStore,
+    filters: SearchFilters,
+    count: CountMode,
+) -> EmployeeSearchResponse:
+    """Run `execute` and store the response in the result cache under `key`."""
+    response = execute(store, filters, count)
+    if SEARCH_CACHE_CONFIG.enabled:
+        _search_cache.put(key, response, estimate_size(response.items))
+    return response
+
+
+def _execute(
+    store: SQLiteEmployeeStore, filters: SearchFilters, count: CountMode
+) -> EmployeeSearchResponse:
+    """Run the search against the store and build the projected response."""
+    query, total_mode, estimate = _plan(store, filters, count)
+    projection = get_org_projection(filters.org_id)
+    rows, total = store.search_rows(query, projection.select_columns)
+    return _build_response(filters, total_mode, estimate, rows, total)
+
+
+def _execute_fuzzy(
+    store: SQLiteEmployeeStore, filters: SearchFilters, count: CountMode
+) -> EmployeeSearchResponse:
+    """
+    Rank the org's names by trigram similarity to `filters.name` (exact
+    filters still apply) and page the ranking with offset/limit. The match
+    count is exact whatever `count` asks for, as it costs nothing extra.
+    """
+    projection = get_org_projection(filters.org_id)
+    index = _fuzzy_indexes.get(store, filters.org_id, projection.select_columns)
+    end = filters.offset + filters.limit
+    with metrics.stage("fuzzy_match"):
+        rows, total = index.search(
+            filters.name, filters, end + 1, FUZZY_SEARCH_CONFIG.min_similarity
         )
+    with metrics.stage("project"):
+        items = projection.build(rows[filters.offset:end])
+    return EmployeeSearchResponse.model_construct(
+        items=items,
+        total=None if count == "none" else total,
+        total_mode="none" if count == "none" else "exact",
+        has_more=len(rows) > end,
+        limit=filters.limit,
+        offset=filters.offset,
+        next_cursor=None,
+    )
+
+
+def _execute_batch(
+    store: SQLiteEmployeeStore, batch: list[tuple[SearchFilters, CountMode]]
+) -> list[EmployeeSearchResponse]:
+    """`_execute` for several searches of one org, over one store connection."""
+    plans = [(filters, *_plan(store, filters, count)) for filters, count in batch]
+    projection = get_org_projection(batch[0][0].org_id)
+    results = store.search_many([query for _, query, _, _ in plans], projection.select_columns)
+    return [
+        _build_response(filters, total_mode, estimate, rows, total)
+        for (filters, _, total_mode, estimate), (rows, total) in zip(plans, results)
+    ]
+
+
+def _plan(
+    store: SQLiteEmployeeStore, filters: SearchFilters, count: CountMode
+) -> tuple[SearchFilters, CountMode, int | None]:
+    """Store query, effective count mode and estimated total for a search."""
+    total_mode = count
+    estimate = None
+    if total_mode == "estimate":
+        estimate = store.estimate_count(filters)
+        if estimate is None:
+            total_mode = "exact"
+    # One extra row tells us whether a next page exists.
+    query = filters._replace(limit=filters.limit + 1, count_total=total_mode == "exact")
+    return query, total_mode, estimate
+
+
+def _build_response(
+    filters: SearchFilters,
+    total_mode: CountMode,
+    estimate: int | None,
+    rows: list[tuple],
+    total: int | None,
+) -> EmployeeSearchResponse:
+    """Project the fetched rows (limit + 1 of them) into a response page."""
+    limit = filters.limit
+    if total_mode == "estimate":
+        total = estimate
+    projection = get_org_projection(filters.org_id)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    with metrics.stage("project"):
+        items = projection.build(rows)
+        next_cursor = None
+        if has_more:
+            last = rows[-1]
+            next_cursor = encode_cursor(
+                projection.row_key(last), filters, projection.sort_key(last, filters.sort)
+            )
+    # Every field is produced here from trusted store data, so skip validation;
+    # FastAPI still validates against response_model on the default path.
+    return EmployeeSearchResponse.model_construct(
+        items=items,
+        total=total,
+        total_mode=total_mode,
+        has_more=has_more,
+        limit=limit,
+        offset=filters.offset,
+        next_cursor=next_cursor,
+    )
+
+
+# Search implementation per match mode.
+_EXECUTORS = {"substring": _execute, "fuzzy": _execute_fuzzy}
+
+
+def _resolve_cursor(cursor: str, filters: SearchFilters) -> Cursor:
+    """Decode the cursor, checking it was issued for these filters and sort."""
+    try:
+        decoded = decode_cursor(cursor)
+    except ValueError as exc:
+        raise InvalidSearchRequest(str(exc)) from None
+    if decoded.fingerprint != filter_fingerprint(filters):
+        raise InvalidSearchRequest("cursor does not match the search filters")
+    if (decoded.last_key is None) != (filters.sort == "id"):
+        raise InvalidSearchRequest("Malformed cursor")
+    return decoded
 
 
 def _project_employee(employee: Employee, columns: list[str]) -> dict:
@@ -0,0 +1,268 @@
+"""
+Typo-tolerant name matching over a per-org trigram index.
+
+Names are split into words and each word, padded as "  word ", into
+character trigrams (the pg_trgm scheme), so "Jon Smtih" still shares the
+word-start trigrams of "John Smith". Similarity is the Dice coefficient of
+the two trigram sets: 2 * shared / (query grams + name grams).
+
+Each trigram maps to the slots of the names containing it: rare trigrams as
+an `array` of slots, common ones as a bitmap (`app.db.bitmaps`). A query
+adds up its trigrams' bitmaps with bit-sliced adders, so per-slot overlap
+counts come out of a few dozen big-int operations instead of a per-row
+loop. Overlap levels are then walked from the highest down, which yields
+the exact match count by popcount and lets the top-k heap stop reading
+rows once no lower level can beat it. Results are ordered by score, then
+`id`.
+"""
+from __future__ import annotations
+
+import heapq
+import math
+import re
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable
+
+from app.db.bitmaps import mask_of, set_bits
+from app.db.filters import SearchFilters
+from app.db.sqlite_store import FACET_FIELDS
+from app.models.employee import Employee
+
+_WORD = re.compile(r"\w+")
+
+# Trigrams in at least 1/32 of an org's names are kept as bitmaps, where a
+# bitmap is no larger than the equivalent array of 32-bit slots.
+_DENSE_FRACTION = 32
+
+# Compact once dead slots (removed or replaced employees) outnumber live ones.
+_MIN_COMPACT_SLOTS = 1024
+
+
+def trigrams(text: str) -> set[str]:
+    """Padded per-word trigrams of `text`, lowercased."""
+    grams = set()
+    for word in _WORD.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def dice(a: str, b: str) -> float:
+    """Trigram Dice similarity of two strings, in [0, 1]."""
+    ga, gb = trigrams(a), trigrams(b)
+    if not ga or not gb:
+        return 0.0
+    return 2 * len(ga & gb) / (len(ga) + len(gb))
+
+
+def _add_to_planes(planes: list[int], bitmap: int) -> None:
+    """Add 1 to the bit-sliced counter `planes` at every slot set in `bitmap`."""
+    carry = bitmap
+    for i, plane in enumerate(planes):
+        if not carry:
+            return
+        planes[i] = plane ^ carry
+        carry &= plane
+    if carry:
+        planes.append(carry)
+
+
+class _IdDesc(str):
+    """An id that sorts in reverse, so a min-heap of (score, id) tops at the worst kept entry."""
+
+    __slots__ = ()
+
+    def __lt__(self, other: str) -> bool:
+        return str.__gt__(self, other)
+
+
+def _level(planes: list[int], value: int, base: int) -> int:
+    """Slots of `base` whose bit-sliced count equals `value`."""
+    if value >> len(planes):
+        return 0
+    mask = base
+    for i, plane in enumerate(planes):
+        mask &= plane if value >> i & 1 else ~plane
+    return mask
+
+
+class TrigramNameIndex:
+    """Trigram postings over one org's names, with the projected row per slot."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._slot_of: dict[str, int] = {}
+        # Per slot; ids[slot] is None once the slot is dead.
+        self._ids: list[str | None] = []
+        self._names: list[str | None] = []
+        self._rows: list[tuple | None] = []
+        self._facets: list[tuple[str, ...] | None] = []
+        self._sizes = array("H")
+        self._alive = 0
+        # Bitmaps of slots by name trigram count and by facet value.
+        self._by_size: dict[int, int] = {}
+        self._by_facet: dict[str, dict[str, int]] = {field: {} for field in FACET_FIELDS}
+        self._sparse: dict[str, array] = {}
+        self._dense: dict[str, int] = {}
+        self._postings_len = 0
+
+    @classmethod
+    def build(cls, records: Iterable[tuple[Employee, tuple]]) -> TrigramNameIndex:
+        """Index (employee, projected row) pairs; bitmaps are built once at the end."""
+        index = cls()
+        by_size: dict[int, list[int]] = {}
+        by_facet: dict[str, dict[str, list[int]]] = {field: {} for field in FACET_FIELDS}
+        for employee, row in records:
+            slot, grams, facets = index._append(employee, row)
+            by_size.setdefault(len(grams), []).append(slot)
+            for field, value in zip(FACET_FIELDS, facets):
+                by_facet[field].setdefault(value, []).append(slot)
+            for gram in grams:
+                postings = index._sparse.get(gram)
+                if postings is None:
+                    postings = index._sparse[gram] = array("I")
+                postings.append(slot)
+        n = len(index._ids)
+        index._alive = (1 << n) - 1
+        index._by_size = {size: mask_of(slots, n) for size, slots in by_size.items()}
+        index._by_facet = {
+            field: {value: mask_of(slots, n) for value, slots in values.items()}
+            for field, values in by_facet.items()
+        }
+        for gram, postings in list(index._sparse.items()):
+            if len(postings) * _DENSE_FRACTION >= n:
+                index._dense[gram] = mask_of(postings, n)
+                del index._sparse[gram]
+        return index
+
+    @property
+    def entries(self) -> int:
+        return self._postings_len
+
+    def __contains__(self, emp_id: str) -> bool:
+        return emp_id in self._slot_of
+
+    def _append(self, employee: Employee, row: tuple) -> tuple[int, set[str], tuple[str, ...]]:
+        """Add the per-slot data for `employee`; bitmaps are left to the caller."""
+        slot = len(self._ids)
+        grams = trigrams(employee.name)
+        # Interned: an org has few distinct departments/locations/positions.
+        facets = tuple(sys.intern(getattr(employee, field)) for field in FACET_FIELDS)
+        self._slot_of[employee.id] = slot
+        self._ids.append(employee.id)
+        self._names.append(employee.name)
+        self._rows.append(row)
+        self._facets.append(facets)
+        self._sizes.append(min(len(grams), 0xFFFF))
+        self._postings_len += len(grams)
+        return slot, grams, facets
+
+    def put(self, employee: Employee, row: tuple) -> None:
+        """Insert or replace one employee (the old slot is left dead)."""
+        with self._lock:
+            self._remove(employee.id)
+            slot, grams, facets = self._append(employee, row)
+            bit = 1 << slot
+            self._alive |= bit
+            self._by_size[len(grams)] = self._by_size.get(len(grams), 0) | bit
+            for field, value in zip(FACET_FIELDS, facets):
+                values = self._by_facet[field]
+                values[value] = values.get(value, 0) | bit
+            for gram in grams:
+                if gram in self._dense:
+                    self._dense[gram] |= bit
+                else:
+                    self._sparse.setdefault(gram, array("I")).append(slot)
+
+    def remove(self, emp_id: str) -> None:
+        with self._lock:
+            self._remove(emp_id)
+
+    def _remove(self, emp_id: str) -> None:
+        slot = self._slot_of.pop(emp_id, None)
+        if slot is None:
+            return
+        # Other bitmaps and postings keep the dead slot; queries mask it out.
+        self._alive &= ~(1 << slot)
+        self._postings_len -= self._sizes[slot]
+        self._ids[slot] = self._names[slot] = self._rows[slot] = self._facets[slot] = None
+        dead = len(self._ids) - len(self._slot_of)
+        if dead >= _MIN_COMPACT_SLOTS and dead > len(self._slot_of):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Rebuild without dead slots."""
+        live = []
+        for slot in sorted(self._slot_of.values()):
+            employee = Employee(self._ids[slot], "", self._names[slot], "", *self._facets[slot])
+            live.append((employee, self._rows[slot]))
+        rebuilt = TrigramNameIndex.build(live)
+        # Adopt the rebuilt state but keep the lock the caller holds.
+        vars(self).update({k: v for k, v in vars(rebuilt).items() if k != "_lock"})
+
+    def search(
+        self, query: str, filters: SearchFilters, limit: int, min_similarity: float
+    ) -> tuple[list[tuple], int]:
+        """
+        Rows of the best `limit` names with Dice similarity >= `min_similarity`
+        to `query` that also pass the exact filters of `filters`, best first
+        (ties by id), plus the number of such names.
+        """
+        q = len(trigrams(query))
+        if not q:
+            return [], 0
+        # Dice >= s needs overlap >= s * (|q| + |d|) / 2 with |d| >= overlap,
+        # so no match shares fewer than s|q| / (2 - s) trigrams.
+        min_overlap = max(1, math.ceil(min_similarity * q / (2 - min_similarity) - 1e-9))
+        with self._lock:
+            n = len(self._ids)
+            base = self._alive
+            for field in FACET_FIELDS:
+                value = getattr(filters, field)
+                if value:
+                    base &= self._by_facet[field].get(value, 0)
+            if not base:
+                return [], 0
+
+            planes: list[int] = []
+            for gram in trigrams(query):
+                if gram in self._dense:
+                    _add_to_planes(planes, self._dense[gram])
+                elif gram in self._sparse:
+                    _add_to_planes(planes, mask_of(self._sparse[gram], n))
+
+            # Slots with at most sizes[i] name trigrams, for every size present.
+            sizes = sorted(self._by_size)
+            at_most, acc = [], 0
+            for size in sizes:
+                acc |= self._by_size[size]
+                at_most.append(acc)
+
+            total = 0
+            # The best `limit` (score, id, slot) so far; heap[0] is the worst of them.
+            heap: list[tuple[float, _IdDesc, int]] = []
+            for overlap in range(q, min_overlap - 1, -1):
+                # Dice >= s  <=>  |d| <= 2 * overlap / s - |q|.
+                fits = bisect_right(sizes, 2 * overlap / min_similarity - q + 1e-9)
+                if not fits:
+                    continue
+                level = _level(planes, overlap, base & at_most[fits - 1])
+                if not level:
+                    continue
+                total += level.bit_count()
+                # Names have at least `overlap` trigrams, so nothing at this
+                # level scores above 2 * overlap / (|q| + overlap).
+                if heap and len(heap) >= limit and heap[0][0] > 2 * overlap / (q + overlap):
+                    continue
+                ids, sizes_of = self._ids, self._sizes
+                for slot in set_bits(level, n):
+                    score = 2 * overlap / (q + sizes_of[slot])
+                    if len(heap) < limit:
+                        heapq.heappush(heap, (score, _IdDesc(ids[slot]), slot))
+                    elif score >= heap[0][0]:
+                        heapq.heappushpop(heap, (score, _IdDesc(ids[slot]), slot))
+            best = sorted(heap, reverse=True)
+            return [self._rows[slot] for _, _, slot in best], total
@@ -0,0 +1,257 @@
+"""
+In-memory per-org name indexes.
+
+`OrgNameIndex` keeps sorted lowercase name keys, one per word start
+("john smith" and "smith" for John Smith), so an autocomplete prefix query
+is a bisect plus a short forward scan. `NameIndexCache` builds an org's
+index lazily from the store, patches it in place from the store's write
+notifications, and keeps indexes for the most recently used orgs within an
+entry budget. Each index remembers the org data version
+(`SQLiteEmployeeStore.org_version`) it reflects and is reloaded once that
+moves, which catches writes from other processes such as the ingest CLI.
+Other index types (e.g. the fuzzy trigram index) plug into the same cache.
+"""
+import re
+import threading
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from typing import Protocol
+
+from app.config import AUTOCOMPLETE_CONFIG, AutocompleteConfig
+from app.db.filters import SearchFilters
+from app.db.sqlite_store import EMPLOYEE_COLUMNS
+from app.models.employee import Employee
+
+_WORD_START = re.compile(r"\b\w")
+
+
+def normalize_prefix(text: str) -> str:
+    """Lowercase with whitespace collapsed, as names are indexed."""
+    return " ".join(text.lower().split())
+
+
+def _word_keys(name: str) -> tuple[str, list[str]]:
+    """(whole-name key, keys starting at each later word) for a name."""
+    key = normalize_prefix(name)
+    return key, [key[m.start():] for m in _WORD_START.finditer(key) if m.start() > 0]
+
+
+class OrgIndex(Protocol):
+    """What `NameIndexCache` needs from a per-org index. Methods are thread-safe."""
+
+    @classmethod
+    def build(cls, records: Iterable[tuple[Employee, tuple]]) -> "OrgIndex":
+        """Index (employee, projected row) pairs."""
+        ...
+
+    @property
+    def entries(self) -> int:
+        """Size in index entries, for the cache's memory budget."""
+        ...
+
+    def __contains__(self, emp_id: str) -> bool: ...
+
+    def put(self, employee: Employee, row: tuple) -> None: ...
+
+    def remove(self, emp_id: str) -> None: ...
+
+
+class OrgNameIndex:
+    """Prefix index over one org's names, holding each employee's projected row."""
+
+    def __init__(self) -> None:
+        # (key, id) pairs, sorted. Whole-name matches rank before later words.
+        self._full: list[tuple[str, str]] = []
+        self._words: list[tuple[str, str]] = []
+        self._names: dict[str, str] = {}
+        self._rows: dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, records: Iterable[tuple[Employee, tuple]]) -> "OrgNameIndex":
+        """Index (employee, projected row) pairs, sorting once at the end."""
+        index = cls()
+        for employee, row in records:
+            index._names[employee.id] = employee.name
+            index._rows[employee.id] = row
+            full, words = _word_keys(employee.name)
+            index._full.append((full, employee.id))
+            index._words.extend((key, employee.id) for key in words)
+        index._full.sort()
+        index._words.sort()
+        return index
+
+    @property
+    def entries(self) -> int:
+        return len(self._full) + len(self._words)
+
+    def __contains__(self, emp_id: str) -> bool:
+        return emp_id in self._names
+
+    def put(self, employee: Employee, row: tuple) -> None:
+        """Insert or replace one employee."""
+        with self._lock:
+            self._remove(employee.id)
+            self._names[employee.id] = employee.name
+            self._rows[employee.id] = row
+            full, words = _word_keys(employee.name)
+            insort(self._full, (full, employee.id))
+            for key in words:
+                insort(self._words, (key, employee.id))
+
+    def remove(self, emp_id: str) -> None:
+        with self._lock:
+            self._remove(emp_id)
+
+    def _remove(self, emp_id: str) -> None:
+        name = self._names.pop(emp_id, None)
+        if name is None:
+            return
+        del self._rows[emp_id]
+        full, words = _word_keys(name)
+        for entries, keys in ((self._full, [full]), (self._words, words)):
+            for key in keys:
+                i = bisect_left(entries, (key, emp_id))
+                if i < len(entries) and entries[i] == (key, emp_id):
+                    del entries[i]
+
+    def search(self, prefix: str, limit: int) -> list[tuple]:
+        """Rows of up to `limit` employees whose name has a word starting with `prefix`."""
+        found: dict[str, None] = {}
+        with self._lock:
+            for entries in (self._full, self._words):
+                i = bisect_left(entries, (prefix,))
+                while i < len(entries) and len(found) < limit:
+                    key, emp_id = entries[i]
+                    if not key.startswith(prefix):
+                        break
+                    found[emp_id] = None
+                    i += 1
+            return [self._rows[emp_id] for emp_id in found]
+
+
+class NameIndexCache:
+    """LRU of per-org indexes of one type, bounded by org count and total entries."""
+
+    def __init__(
+        self,
+        max_orgs: int = 256,
+        max_entries: int = 2_000_000,
+        index_type: type[OrgIndex] = OrgNameIndex,
+    ) -> None:
+        self.max_orgs = max_orgs
+        self.max_entries = max_entries
+        self.index_type = index_type
+        # org_id -> (index, its row columns, org data version it reflects)
+        self._indexes: OrderedDict[str, tuple[OrgIndex, tuple[str, ...], int]] = OrderedDict()
+        self._entries = 0
+        self._store = None
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_config(
+        cls,
+        config: AutocompleteConfig = AUTOCOMPLETE_CONFIG,
+        index_type: type[OrgIndex] = OrgNameIndex,
+    ) -> "NameIndexCache":
+        return cls(max_orgs=config.max_orgs, max_entries=config.max_entries, index_type=index_type)
+
+    def get(self, store, org_id: str, columns: Sequence[str]) -> OrgIndex:
+        """
+        The index of `org_id` holding rows selected as `columns`, loaded
+        from `store` on first use and again once the org's version moves.
+        """
+        columns = tuple(columns)
+        self._attach(store)
+        version = store.org_version(org_id)
+        with self._lock:
+            cached = self._indexes.get(org_id)
+            if cached is not None and cached[1:] == (columns, version):
+                self._indexes.move_to_end(org_id)
+                return cached[0]
+
+        width = len(columns)
+        batches = store.iter_rows(SearchFilters(org_id), (*columns, *EMPLOYEE_COLUMNS), 10_000)
+        index = self.index_type.build(
+            (Employee(*row[width:]), row[:width]) for batch in batches for row in batch
+        )
+        with self._lock:
+            self.loads += 1
+            # The rows were read after `version`; if a write landed in
+            # between, the index is newer than its version and is reloaded.
+            if store is self._store:
+                self._discard(org_id)
+                self._indexes[org_id] = (index, columns, version)
+                self._entries += index.entries
+                self._evict()
+        return index
+
+    def _attach(self, store) -> None:
+        """Follow writes of `store`, dropping indexes built from a previous store."""
+        if store is self._store:
+            return
+        with self._lock:
+            if store is self._store:
+                return
+            self._indexes.clear()
+            self._entries = 0
+            self._store = store
+        store.add_write_listener(
+            lambda employees, versions: self._apply_writes(store, employees, versions)
+        )
+
+    def _apply_writes(
+        self,
+        store,
+        employees: list[Employee] | None,
+        versions: dict[str, tuple[int, int]],
+    ) -> None:
+        with self._lock:
+            if store is not self._store:
+                return
+            if employees is None:
+                self._indexes.clear()
+                self._entries = 0
+                return
+            for e in employees:
+                for org_id, (index, columns, _) in self._indexes.items():
+                    before = index.entries
+                    if org_id == e.org_id:
+                        index.put(e, tuple(getattr(e, c) for c in columns))
+                    elif e.id in index:
+                        # The employee moved to another org.
+                        index.remove(e.id)
+                    self._entries += index.entries - before
+            # A patched index is current only if nothing else had moved its
+            # org before this write; otherwise the next get reloads it.
+            for org_id, (before, after) in versions.items():
+                cached = self._indexes.get(org_id)
+                if cached is not None and cached[2] == before:
+                    self._indexes[org_id] = (cached[0], cached[1], after)
+            self._evict()
+
+    def _discard(self, org_id: str) -> None:
+        cached = self._indexes.pop(org_id, None)
+        if cached is not None:
+            self._entries -= cached[0].entries
+
+    def _evict(self) -> None:
+        while self._indexes and (
+            len(self._indexes) > self.max_orgs or self._entries > self.max_entries
+        ):
+            _, (index, _, _) = self._indexes.popitem(last=False)
+            self._entries -= index.entries
+            self.evictions += 1
+
+    def stats(self) -> dict[str, int]:
+        """Occupancy and load/eviction counters."""
+        with self._lock:
+            return {
+                "orgs": len(self._indexes),
+                "entries": self._entries,
+                "loads": self.loads,
+                "evictions": self.evictions,
+            }
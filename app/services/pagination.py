@@ -0,0 +1,67 @@
+"""
+Opaque keyset pagination cursors.
+
+A cursor carries the last `id` of the previous page (and, for sorted
+searches, its sort column value) plus a fingerprint of the filters and sort
+it was issued for, so the next page is a single index seek (`id > last_id`,
+or `(col, id) > (last_key, last_id)`) however deep the client has paged.
+"""
+import base64
+import binascii
+import hashlib
+import json
+from typing import NamedTuple
+
+from app.db.sqlite_store import SearchFilters
+
+
+class Cursor(NamedTuple):
+    """Decoded cursor contents."""
+
+    last_id: str
+    fingerprint: str
+    # Sort column value of the last row; None when sorting by id.
+    last_key: str | None = None
+
+
+def filter_fingerprint(filters: SearchFilters) -> str:
+    """Stable short hash of the filter and sort fields (pagination fields excluded)."""
+    raw = json.dumps(
+        [
+            filters.org_id,
+            filters.name,
+            filters.department,
+            filters.location,
+            filters.position,
+            filters.sort,
+            filters.order,
+        ],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+def encode_cursor(last_id: str, filters: SearchFilters, last_key: str | None = None) -> str:
+    """Build the opaque cursor for the page following `last_id` (sort value `last_key`)."""
+    data = {"k": last_id, "f": filter_fingerprint(filters)}
+    if last_key is not None:
+        data["s"] = last_key
+    payload = json.dumps(data, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """Parse a cursor. Raises ValueError if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        last_key = data.get("s")
+        return Cursor(
+            last_id=str(data["k"]),
+            fingerprint=str(data["f"]),
+            last_key=None if last_key is None else str(last_key),
+        )
+    except (
+        binascii.Error, UnicodeDecodeError, json.JSONDecodeError, KeyError, TypeError, AttributeError
+    ) as exc:
+        raise ValueError("Malformed cursor") from exc
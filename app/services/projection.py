@@ -0,0 +1,44 @@
+"""
+Per-org column projection compiled once from the column config.
+
+The projection decides both the SQL select list (only visible columns, so
+hidden fields such as `email` are never read) and how a result row becomes
+the response dict, in config order.
+"""
+from functools import lru_cache
+from typing import Any, NamedTuple
+
+from app.services.column_config import get_org_columns
+
+
+class OrgProjection(NamedTuple):
+    """Compiled projection for one organization."""
+
+    # Visible columns, in response order.
+    columns: tuple[str, ...]
+    # Columns to SELECT: the visible ones, then `id` as the pagination key.
+    select_columns: tuple[str, ...]
+
+    def build(self, rows: list[tuple]) -> list[dict[str, Any]]:
+        """Rows selected with `select_columns` -> response items."""
+        columns = self.columns
+        # zip() stops at the visible columns, dropping the trailing key.
+        return [dict(zip(columns, row)) for row in rows]
+
+    @staticmethod
+    def row_key(row: tuple) -> str:
+        """The `id` of a row selected with `select_columns`."""
+        return row[-1]
+
+    def sort_key(self, row: tuple, sort: str) -> str | None:
+        """The `sort` column value of a row (None for `id`, which `row_key` gives)."""
+        if sort == "id":
+            return None
+        return row[self.columns.index(sort)]
+
+
+@lru_cache(maxsize=1024)
+def get_org_projection(org_id: str) -> OrgProjection:
+    """Compiled projection for `org_id` (cached; the column config is static)."""
+    columns = tuple(get_org_columns(org_id))
+    return OrgProjection(columns=columns, select_columns=(*columns, "id"))
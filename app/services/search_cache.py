@@ -0,0 +1,108 @@
+"""
+In-process search result cache.
+
+Bounded by entry count and approximate memory, evicts least recently used
+entries first, and expires entries after a TTL. Search keys include the
+org's data version, so a write to an org makes its older entries
+unreachable; those entries then age out through LRU eviction or expiry.
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from app.config import SEARCH_CACHE_CONFIG, SearchCacheConfig
+
+
+def estimate_size(items: list[dict[str, Any]]) -> int:
+    """Approximate memory held by a page of projected items, in bytes."""
+    size = sys.getsizeof(items)
+    for item in items:
+        size += sys.getsizeof(item)
+        for value in item.values():
+            size += sys.getsizeof(value)
+    return size
+
+
+class SearchResultCache:
+    """Thread-safe LRU + TTL cache with a byte budget."""
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        # key -> (expires_at, size, value)
+        self._entries: OrderedDict[Hashable, tuple[float, int, Any]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def from_config(cls, config: SearchCacheConfig = SEARCH_CACHE_CONFIG) -> "SearchResultCache":
+        return cls(
+            max_entries=config.max_entries,
+            max_bytes=config.max_bytes,
+            ttl_seconds=config.ttl_seconds,
+        )
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value, or None on miss/expiry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, size, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, size: int) -> None:
+        """Store a value; entries larger than the whole budget are not cached."""
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (self._clock() + self.ttl_seconds, size, value)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        """Counters and current occupancy."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
@@ -0,0 +1,103 @@
+"""
+Request coalescing ("single flight") for identical concurrent searches.
+
+The first caller for a key becomes the leader and runs the work; callers
+arriving with the same key while it runs wait on the leader's
+`concurrent.futures.Future` instead of running it again. Threads block on
+the future, asyncio tasks await it via `asyncio.wrap_future`, so both kinds
+of caller can join the same flight. The leader's result (or exception) is
+handed to every waiter, and the key is released as soon as the work ends.
+The future is marked running when the flight starts, so a waiter that is
+cancelled (e.g. its client went away) stops waiting without cancelling the
+flight for the leader and the other waiters.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from concurrent.futures import Future
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Collapses concurrent calls with equal keys into one execution."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def _join(self, key: Hashable) -> tuple[Future, bool]:
+        """The flight for `key` and whether the caller leads it."""
+        with self._lock:
+            shared = self._calls.get(key)
+            if shared is not None:
+                self.coalesced += 1
+                return shared, False
+            shared = self._calls[key] = Future()
+            # A running future can no longer be cancelled by any waiter.
+            shared.set_running_or_notify_cancel()
+            self.executions += 1
+            return shared, True
+
+    def _land(self, key: Hashable) -> None:
+        with self._lock:
+            self._calls.pop(key, None)
+
+    def _lead(self, key: Hashable, shared: Future, fn: Callable[..., T], *args: Any) -> T:
+        """Run `fn(*args)` and publish the outcome to the flight's waiters."""
+        try:
+            result = fn(*args)
+        except BaseException as exc:
+            self._land(key)
+            shared.set_exception(exc)
+            raise
+        self._land(key)
+        shared.set_result(result)
+        return result
+
+    def do(self, key: Hashable, fn: Callable[..., T], *args: Any) -> T:
+        """`fn(*args)`, or the result of an identical call already running."""
+        shared, leader = self._join(key)
+        if not leader:
+            return shared.result()
+        return self._lead(key, shared, fn, *args)
+
+    async def do_async(
+        self,
+        key: Hashable,
+        run: Callable[..., Awaitable[T]],
+        fn: Callable[..., T],
+        *args: Any,
+    ) -> T:
+        """
+        Like `do`, with the leader's work submitted through `run` (e.g.
+        `AsyncEmployeeStore.run`). The work publishes its own outcome, so
+        waiters are served even if the leading task is cancelled.
+        """
+        shared, leader = self._join(key)
+        if not leader:
+            return await asyncio.wrap_future(shared)
+        try:
+            return await run(self._lead, key, shared, fn, *args)
+        except asyncio.CancelledError:
+            raise
+        except BaseException as exc:
+            # `run` refused the work (e.g. StoreOverloaded): fail the waiters too.
+            if not shared.done():
+                self._land(key)
+                shared.set_exception(exc)
+            raise
+
+    def stats(self) -> dict[str, int]:
+        """Executions, coalesced callers and flights currently running."""
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+            }
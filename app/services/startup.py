@@ -0,0 +1,115 @@
+"""
+Store initialization and warm-up at application startup.
+
+`start()` runs from the FastAPI lifespan hook, so the DB schema, indexes
+and seed check run before the first request instead of inside it. It then
+warms the largest orgs (plus any pinned in `STARTUP_CONFIG.warmup_orgs`):
+their column projections are compiled and the store reads their index
+ranges and caches their statistics (the memory engine loads their
+segments). Warm-up runs in a background thread by default;
+`/health/ready` reports ready once it has finished. Phase durations are
+exported as `startup_duration_seconds` on /metrics.
+"""
+from __future__ import annotations
+
+import threading
+import time
+
+from app import metrics
+from app.config import STARTUP_CONFIG, StartupConfig
+from app.db.async_store import get_async_employee_store
+from app.db.sqlite_store import get_employee_store
+from app.services.projection import get_org_projection
+
+
+class StartupState:
+    """Startup progress, shared by the warm-up thread and the readiness endpoint."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset("starting")
+
+    def reset(self, phase: str) -> None:
+        with self._lock:
+            # starting -> warming -> ready; stopped after shutdown.
+            self.phase = phase
+            self.warmed_orgs = 0
+            self.init_seconds: float | None = None
+            self.warmup_seconds: float | None = None
+            self.warmup_error: str | None = None
+
+    def update(self, **fields: object) -> None:
+        with self._lock:
+            for name, value in fields.items():
+                setattr(self, name, value)
+
+    def snapshot(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "status": self.phase,
+                "warmed_orgs": self.warmed_orgs,
+                "init_seconds": self.init_seconds,
+                "warmup_seconds": self.warmup_seconds,
+                "warmup_error": self.warmup_error,
+            }
+
+
+_state = StartupState()
+_stop = threading.Event()
+_thread: threading.Thread | None = None
+
+
+def start(config: StartupConfig = STARTUP_CONFIG) -> None:
+    """Initialize the store now, then warm it (in the background per `config`)."""
+    global _thread
+    _state.reset("starting")
+    _stop.clear()
+    begin = time.perf_counter()
+    get_employee_store()
+    get_async_employee_store()
+    init_seconds = time.perf_counter() - begin
+    _state.update(init_seconds=init_seconds)
+    metrics.record_startup_phase("init", init_seconds)
+    if not config.warmup:
+        _state.update(phase="ready")
+        return
+    _state.update(phase="warming")
+    if config.warmup_in_background:
+        _thread = threading.Thread(target=_warm_up, args=(config,), name="store-warmup", daemon=True)
+        _thread.start()
+    else:
+        _warm_up(config)
+
+
+def _warm_up(config: StartupConfig) -> None:
+    begin = time.perf_counter()
+    try:
+        store = get_employee_store()
+        orgs = dict.fromkeys([*config.warmup_orgs, *store.largest_orgs(config.warmup_top_orgs)])
+        for org_id in orgs:
+            if _stop.is_set():
+                return
+            get_org_projection(org_id)
+            store.warm(org_id)
+            _state.update(warmed_orgs=_state.warmed_orgs + 1)
+    except Exception as exc:  # warm-up only saves latency; serve cold rather than never
+        _state.update(warmup_error=repr(exc))
+    warmup_seconds = time.perf_counter() - begin
+    _state.update(phase="ready", warmup_seconds=warmup_seconds)
+    metrics.record_startup_phase("warmup", warmup_seconds)
+
+
+def stop() -> None:
+    """Stop a running warm-up (called at shutdown, before the store is closed)."""
+    global _thread
+    _stop.set()
+    if _thread is not None:
+        _thread.join()
+        _thread = None
+    _state.reset("stopped")
+
+
+def readiness() -> tuple[bool, dict[str, object]]:
+    """Whether startup (warm-up included) has finished, and its progress."""
+    snapshot = _state.snapshot()
+    return snapshot["status"] == "ready", snapshot
@@ -0,0 +1,80 @@
+"""
+Benchmark: fuzzy name search latency against a budget.
+
+Builds the trigram index for one org of `--rows` synthetic names, then
+times queries made from real names with a typo (two adjacent letters
+swapped), as `match=fuzzy` runs them. Exits non-zero when p95 latency is
+over `--budget-ms`.
+
+    python -m benchmarks.bench_fuzzy_search [--rows 1000000] [--queries 200] [--budget-ms 50]
+"""
+import argparse
+import random
+import sys
+import time
+
+from app.config import FUZZY_SEARCH_CONFIG
+from app.db.filters import SearchFilters
+from app.models.employee import Employee
+from app.services.fuzzy_index import TrigramNameIndex
+
+ORG = "org_bench"
+SYLLABLES = ["ka", "ri", "to", "mi", "na", "jo", "han", "son", "smi", "th",
+             "le", "ber", "an", "el", "va", "ng", "ye", "lin", "ros", "du"]
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+
+
+def _typo(rng: random.Random, name: str) -> str:
+    chars = list(name)
+    i = rng.randrange(1, len(chars) - 1)
+    chars[i], chars[i + 1] = chars[i + 1], chars[i]
+    return "".join(chars)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="p95 latency budget")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    firsts = [_word(rng) for _ in range(3_000)]
+    lasts = [_word(rng) for _ in range(20_000)]
+    names = [f"{rng.choice(firsts)} {rng.choice(lasts)}" for _ in range(args.rows)]
+
+    start = time.perf_counter()
+    index = TrigramNameIndex.build(
+        (Employee(f"b{i:08d}", ORG, name, "", "Engineering", "HN", "SE"), (name,))
+        for i, name in enumerate(names)
+    )
+    elapsed = time.perf_counter() - start
+    print(f"indexed {args.rows:,} names ({index.entries:,} trigrams) in {elapsed:.1f}s")
+
+    filters = SearchFilters(ORG)
+    samples = []
+    for _ in range(args.queries):
+        query = _typo(rng, rng.choice(names))
+        start = time.perf_counter()
+        index.search(query, filters, args.limit, FUZZY_SEARCH_CONFIG.min_similarity)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    p50 = samples[len(samples) // 2]
+    p95 = samples[int(len(samples) * 0.95)]
+    print(
+        f"top-{args.limit} over {args.queries} queries: "
+        f"p50 {p50:.1f} ms, p95 {p95:.1f} ms, max {samples[-1]:.1f} ms"
+    )
+    if p95 > args.budget_ms:
+        print(f"FAIL: p95 {p95:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+        return 1
+    print(f"OK: p95 within the {args.budget_ms:.0f} ms budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
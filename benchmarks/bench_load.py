@@ -0,0 +1,173 @@
+"""
+Benchmark: in-process ASGI load test of the search endpoint.
+
+Drives the FastAPI app through httpx's ASGI transport (no sockets, no
+server) with `--concurrency` clients, each issuing requests from a seeded,
+weighted mix of search shapes against the `benchmarks.dataset` database.
+Orgs are picked on the same skewed curve the dataset was built with, so
+large tenants get most of the traffic. Reports throughput and per-shape
+p50/p95/p99 latency. The rate limiter is replaced by one that never
+refuses. `--no-cache` turns the result cache off to measure the engine.
+
+    python -m benchmarks.bench_load [--employees 200000] [--orgs 200] [--requests 5000]
+        [--concurrency 32] [--no-cache] [--json load.json]
+"""
+import argparse
+import asyncio
+import dataclasses
+import random
+import time
+from collections import Counter, defaultdict
+from collections.abc import Callable
+from pathlib import Path
+
+import httpx
+
+from app.db import sqlite_store
+from app.db.async_store import close_async_employee_store
+from app.main import app
+from app.middleware import rate_limit
+from app.middleware.rate_limit import SlidingWindowRateLimiter
+from app.services import employee_search
+from benchmarks.dataset import (
+    DEPARTMENTS,
+    LAST_NAMES,
+    LOCATIONS,
+    POSITIONS,
+    ensure_dataset,
+    org_ids,
+    zipf_weights,
+)
+from benchmarks.report import summarize, write_json
+
+URL = "/api/v1/employees/search"
+
+
+def _name_fragment(rng: random.Random) -> str:
+    last = rng.choice(LAST_NAMES).lower()
+    return last[: rng.randint(min(3, len(last)), len(last))]
+
+
+# (shape, weight, extra query params)
+SHAPES: list[tuple[str, int, Callable[[random.Random], dict[str, object]]]] = [
+    ("page", 30, lambda rng: {}),
+    ("department", 20, lambda rng: {"department": rng.choice(DEPARTMENTS)}),
+    (
+        "department_location",
+        10,
+        lambda rng: {"department": rng.choice(DEPARTMENTS), "location": rng.choice(LOCATIONS)},
+    ),
+    ("name", 15, lambda rng: {"name": _name_fragment(rng)}),
+    ("sorted_name", 10, lambda rng: {"sort": "name", "order": rng.choice(["asc", "desc"])}),
+    ("deep_offset", 5, lambda rng: {"offset": rng.randrange(200, 2000, 20)}),
+    ("count_none", 10, lambda rng: {"position": rng.choice(POSITIONS), "count": "none"}),
+]
+
+
+def build_plan(total: int, orgs: int, seed: int) -> list[tuple[str, dict[str, object]]]:
+    """The request sequence: (shape, query params); the same arguments give the same plan."""
+    rng = random.Random(seed)
+    org_list = org_ids(orgs)
+    org_weights = zipf_weights(orgs)
+    shape_weights = [weight for _, weight, _ in SHAPES]
+    plan = []
+    for _ in range(total):
+        shape, _, params = rng.choices(SHAPES, weights=shape_weights)[0]
+        org_id = rng.choices(org_list, weights=org_weights)[0]
+        plan.append((shape, {"org_id": org_id, **params(rng)}))
+    return plan
+
+
+async def drive(
+    plan: list[tuple[str, dict[str, object]]], concurrency: int
+) -> tuple[dict[str, list[float]], Counter, float]:
+    """Run `plan` on `concurrency` clients: latencies by shape, status counts, wall time."""
+    latencies: dict[str, list[float]] = defaultdict(list)
+    statuses: Counter = Counter()
+    requests = iter(plan)
+    transport = httpx.ASGITransport(app=app)
+    perf = time.perf_counter
+
+    async def client_loop(client: httpx.AsyncClient) -> None:
+        for shape, params in requests:
+            start = perf()
+            r = await client.get(URL, params=params)
+            elapsed = perf() - start
+            statuses[r.status_code] += 1
+            if r.status_code == 200:
+                latencies[shape].append(elapsed)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = perf()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        wall = perf() - start
+    return latencies, statuses, wall
+
+
+def close_stores() -> None:
+    close_async_employee_store()
+    sqlite_store.close_employee_store()
+
+
+def configure_app(db_path: Path, cache: bool = True) -> None:
+    """Point the app at `db_path`, lift the rate limit, optionally disable the result cache."""
+    close_stores()
+    sqlite_store.DB_PATH = db_path
+    rate_limit._limiter = SlidingWindowRateLimiter(max_requests=10**9)
+    if not cache:
+        employee_search.SEARCH_CACHE_CONFIG = dataclasses.replace(
+            employee_search.SEARCH_CACHE_CONFIG, enabled=False
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--employees", type=int, default=200_000)
+    parser.add_argument("--orgs", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--warmup", type=int, default=200, help="Untimed requests first")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--no-cache", action="store_true", help="Disable the result cache")
+    parser.add_argument("--json", type=Path, default=None, help="Write results to this file")
+    args = parser.parse_args()
+
+    configure_app(ensure_dataset(args.employees, args.orgs, args.seed), cache=not args.no_cache)
+
+    plan = build_plan(args.warmup + args.requests, args.orgs, args.seed)
+    try:
+        asyncio.run(drive(plan[: args.warmup], args.concurrency))
+        latencies, statuses, wall = asyncio.run(drive(plan[args.warmup :], args.concurrency))
+    finally:
+        close_stores()
+
+    shapes = {shape: summarize(samples) for shape, samples in sorted(latencies.items())}
+    overall = summarize([s for samples in latencies.values() for s in samples])
+    errors = sum(n for status, n in statuses.items() if status != 200)
+    throughput = args.requests / wall
+
+    print(f"{args.requests:,} requests, concurrency {args.concurrency}: "
+          f"{throughput:,.0f} req/s, {errors} errors, statuses {dict(statuses)}")
+    print(f"{'shape':<24}{'count':>8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for label, s in {**shapes, "overall": overall}.items():
+        if not s["count"]:
+            continue
+        row = (s["mean_ms"], s["p50_ms"], s["p95_ms"], s["p99_ms"])
+        print(f"{label:<24}{s['count']:>8}" + "".join(f"{v:>10.2f}" for v in row))
+    if args.json is not None:
+        write_json(
+            args.json,
+            {
+                "benchmark": "load",
+                "config": vars(args),
+                "throughput_rps": throughput,
+                "wall_seconds": wall,
+                "statuses": {str(status): n for status, n in statuses.items()},
+                "overall": overall,
+                "shapes": shapes,
+            },
+        )
+
+
+if __name__ == "__main__":
+    main()
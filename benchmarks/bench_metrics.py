@@ -0,0 +1,117 @@
+"""
+Benchmark: overhead of per-stage timing (`METRICS_CONFIG.enabled`).
+
+Replays the `bench_load` request mix through the ASGI app with stage
+timing off and on, alternating in rounds so drift affects both equally,
+and reports mean latency, throughput and the relative overhead. With the
+result cache on (the default) most requests are cheap cache hits, which is
+the worst case for relative overhead; `--no-cache` measures full searches.
+The instrumentation's own cost per request (timings, the stages of an
+uncached search, histogram update) is also timed in isolation, since it is
+smaller than the run-to-run noise of the end-to-end numbers.
+
+    python -m benchmarks.bench_metrics [--requests 2000] [--rounds 5] [--no-cache] [--json m.json]
+"""
+import argparse
+import asyncio
+import dataclasses
+import statistics
+import time
+from pathlib import Path
+
+from app import metrics
+from app.config import METRICS_CONFIG
+from app.db.filters import SearchFilters
+from app.middleware import timing
+from benchmarks.bench_load import build_plan, close_stores, configure_app, drive
+from benchmarks.dataset import ensure_dataset
+from benchmarks.report import summarize, write_json
+
+
+STAGES = ("rate_limit", "acquire", "count", "page", "project")
+
+
+def instrumentation_seconds(rounds: int = 20_000) -> float:
+    """Seconds of timing work per instrumented search request, measured in isolation."""
+    filters = SearchFilters("org_0000", department="Engineering")
+    histograms = metrics.SearchMetrics.from_config(METRICS_CONFIG)
+    perf = time.perf_counter
+    start = perf()
+    for _ in range(rounds):
+        timings, token = metrics.begin_request()
+        metrics.label_request("org_0000", filters)
+        for name in STAGES:
+            with metrics.stage(name):
+                pass
+        metrics.propagate(int)("1")
+        metrics.start_stage("serialize")
+        timings.finish()
+        metrics._current.reset(token)
+        histograms.observe(timings.org_id, timings.shape, timings.stages, 200)
+    return (perf() - start) / rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--employees", type=int, default=200_000)
+    parser.add_argument("--orgs", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--requests", type=int, default=2_000, help="Requests per round and mode")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--no-cache", action="store_true", help="Disable the result cache")
+    parser.add_argument("--json", type=Path, default=None, help="Write results to this file")
+    args = parser.parse_args()
+
+    configure_app(ensure_dataset(args.employees, args.orgs, args.seed), cache=not args.no_cache)
+    plan = build_plan(args.requests, args.orgs, args.seed)
+    modes = {
+        "off": dataclasses.replace(METRICS_CONFIG, enabled=False, server_timing=False),
+        "on": dataclasses.replace(METRICS_CONFIG, enabled=True, server_timing=False),
+    }
+    samples: dict[str, list[float]] = {mode: [] for mode in modes}
+    throughput: dict[str, list[float]] = {mode: [] for mode in modes}
+    try:
+        asyncio.run(drive(plan, args.concurrency))  # warm caches and connections
+        for _ in range(args.rounds):
+            for mode, config in modes.items():
+                timing.METRICS_CONFIG = config
+                latencies, _, wall = asyncio.run(drive(plan, args.concurrency))
+                samples[mode].extend(s for shape in latencies.values() for s in shape)
+                throughput[mode].append(len(plan) / wall)
+    finally:
+        timing.METRICS_CONFIG = METRICS_CONFIG
+        close_stores()
+
+    results = {
+        mode: {**summarize(samples[mode]), "throughput_rps": statistics.median(throughput[mode])}
+        for mode in modes
+    }
+    overhead = results["on"]["mean_ms"] / results["off"]["mean_ms"] - 1
+    cost_ms = instrumentation_seconds() * 1e3
+    print(f"{'timing':<8}{'req/s':>10}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for mode, s in results.items():
+        print(
+            f"{mode:<8}{s['throughput_rps']:>10,.0f}{s['mean_ms']:>10.3f}"
+            f"{s['p50_ms']:>10.3f}{s['p99_ms']:>10.3f}"
+        )
+    print(f"overhead (mean latency): {overhead:+.1%}")
+    print(
+        f"instrumentation cost: {cost_ms * 1e3:.1f} us/request "
+        f"({cost_ms / results['off']['mean_ms']:.1%} of the mean request with timing off)"
+    )
+    if args.json is not None:
+        write_json(
+            args.json,
+            {
+                "benchmark": "metrics",
+                "config": vars(args),
+                "results": results,
+                "overhead": overhead,
+                "instrumentation_ms": cost_ms,
+            },
+        )
+
+
+if __name__ == "__main__":
+    main()
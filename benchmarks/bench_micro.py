@@ -0,0 +1,99 @@
+"""
+Benchmark: micro-benchmarks of the search hot path on a synthetic dataset.
+
+Times `SQLiteEmployeeStore.search` for common filter shapes on the largest
+and a mid-sized org, `_project_employee`, and
+`SlidingWindowRateLimiter.is_allowed`. The dataset comes from
+`benchmarks.dataset` (built once, then reused from the temp dir).
+
+    python -m benchmarks.bench_micro [--employees 200000] [--orgs 200] [--json micro.json]
+"""
+import argparse
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from app.db.filters import SearchFilters
+from app.db.sqlite_store import SQLiteEmployeeStore
+from app.middleware.rate_limit import SlidingWindowRateLimiter
+from app.models.employee import Employee
+from app.services.employee_search import _project_employee
+from benchmarks.dataset import ensure_dataset, org_ids
+from benchmarks.report import summarize, write_json
+
+
+def _time(fn: Callable[[], object], rounds: int, batch: int = 1) -> list[float]:
+    """Per-call seconds, one sample per `batch` calls (batches amortize timer overhead)."""
+    fn()
+    samples = []
+    perf = time.perf_counter
+    for _ in range(rounds):
+        start = perf()
+        for _ in range(batch):
+            fn()
+        samples.append((perf() - start) / batch)
+    return samples
+
+
+def _search_cases(store: SQLiteEmployeeStore, org_id: str) -> dict[str, SearchFilters]:
+    stats = store.org_statistics(org_id)
+    top_department = max(stats.facets["department"], key=stats.facets["department"].get)
+    tail_location = min(stats.facets["location"], key=stats.facets["location"].get)
+    base = SearchFilters(org_id)
+    return {
+        "page": base,
+        "department": base._replace(department=top_department),
+        "rare_location": base._replace(location=tail_location),
+        "name_fts": base._replace(name="nguy"),
+        "name_fts_rare": base._replace(name="minh t"),
+        "name_like": base._replace(name="le"),
+        "sorted_name": base._replace(sort="name"),
+        "deep_offset": base._replace(offset=1000),
+        "no_count": base._replace(department=top_department, count_total=False),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--employees", type=int, default=200_000)
+    parser.add_argument("--orgs", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--rounds", type=int, default=300, help="Timed calls per search case")
+    parser.add_argument("--json", type=Path, default=None, help="Write results to this file")
+    args = parser.parse_args()
+
+    db_path = ensure_dataset(args.employees, args.orgs, args.seed)
+    store = SQLiteEmployeeStore(db_path)
+    orgs = org_ids(args.orgs)
+    results: dict[str, dict[str, float]] = {}
+    try:
+        for org_id in (orgs[0], orgs[len(orgs) // 4]):
+            size = store.org_statistics(org_id).total
+            for case, filters in _search_cases(store, org_id).items():
+                label = f"search/{case}/{org_id}({size})"
+                results[label] = summarize(_time(lambda f=filters: store.search(f), args.rounds))
+    finally:
+        store.close()
+
+    employee = Employee("e1", "org_a", "John Doe", "john@org-a.com", "Engineering", "HN", "SE")
+    columns = ["name", "email", "department", "location"]
+    results["project_employee"] = summarize(
+        _time(lambda: _project_employee(employee, columns), 2_000, batch=100)
+    )
+
+    limiter = SlidingWindowRateLimiter(max_requests=10**9)
+    keys = iter(range(10**12))
+    results["rate_limit/is_allowed"] = summarize(
+        _time(lambda: limiter.is_allowed(f"org:bench_{next(keys) % 1000}"), 2_000, batch=100)
+    )
+
+    print(f"{'case':<52}{'mean us':>10}{'p50 us':>10}{'p95 us':>10}{'p99 us':>10}")
+    for label, s in results.items():
+        row = (s["mean_ms"], s["p50_ms"], s["p95_ms"], s["p99_ms"])
+        print(f"{label:<52}" + "".join(f"{v * 1e3:>10.1f}" for v in row))
+    if args.json is not None:
+        write_json(args.json, {"benchmark": "micro", "config": vars(args), "results": results})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: per-check latency of the rate limiter backends.
+
+Times `is_allowed` for the in-process sliding window and GCRA limiters and
+the shared SQLite backend, over a rotating set of keys. With
+`--processes N` the SQLite backend is also measured with N processes
+checking concurrently against one file, as `uvicorn --workers N` would.
+
+    python -m benchmarks.bench_rate_limit [--checks 50000] [--keys 1000] [--processes 4]
+"""
+import argparse
+import multiprocessing
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from app.middleware.rate_limit import GCRARateLimiter, SlidingWindowRateLimiter
+from app.middleware.shared_rate_limit import SQLiteRateLimiter
+
+# High enough that every check is admitted and records state.
+MAX_REQUESTS = 10**9
+
+
+def _latencies(limiter, checks: int, keys: int) -> list[float]:
+    names = [f"org:bench_{i}" for i in range(keys)]
+    samples = []
+    perf = time.perf_counter
+    for i in range(checks):
+        start = perf()
+        limiter.is_allowed(names[i % keys])
+        samples.append(perf() - start)
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> None:
+    samples.sort()
+    p50 = samples[len(samples) // 2] * 1e6
+    p99 = samples[int(len(samples) * 0.99)] * 1e6
+    mean = statistics.fmean(samples) * 1e6
+    print(f"{label:<28}{mean:>10.2f}{p50:>10.2f}{p99:>10.2f}")
+
+
+def _worker(path: str, checks: int, keys: int, queue) -> None:
+    limiter = SQLiteRateLimiter(max_requests=MAX_REQUESTS, window_seconds=60, db_path=Path(path))
+    queue.put(_latencies(limiter, checks, keys))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--checks", type=int, default=50_000)
+    parser.add_argument("--keys", type=int, default=1_000)
+    parser.add_argument("--processes", type=int, default=4)
+    args = parser.parse_args()
+
+    db_path = Path(tempfile.mkdtemp()) / "ratelimit.sqlite3"
+    backends = {
+        "memory/sliding_window": SlidingWindowRateLimiter(max_requests=MAX_REQUESTS),
+        "memory/gcra": GCRARateLimiter(max_requests=MAX_REQUESTS),
+        "sqlite/gcra": SQLiteRateLimiter(max_requests=MAX_REQUESTS, db_path=db_path),
+    }
+    print(f"{args.checks} checks over {args.keys} keys (microseconds per check)")
+    print(f"{'backend':<28}{'mean':>10}{'p50':>10}{'p99':>10}")
+    for label, limiter in backends.items():
+        _report(label, _latencies(limiter, args.checks, args.keys))
+
+    if args.processes > 1:
+        queue = multiprocessing.Queue()
+        per_process = args.checks // args.processes
+        procs = [
+            multiprocessing.Process(target=_worker, args=(str(db_path), per_process, args.keys, queue))
+            for _ in range(args.processes)
+        ]
+        for p in procs:
+            p.start()
+        samples = [s for _ in procs for s in queue.get()]
+        for p in procs:
+            p.join()
+        _report(f"sqlite/gcra x{args.processes} procs", samples)
+
+
+if __name__ == "__main__":
+    main()
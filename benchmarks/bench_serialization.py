@@ -0,0 +1,88 @@
+"""
+Benchmark: response_model serialization vs the fast JSON path.
+
+Encodes the same 100-item search page with FastAPI's response_model
+validation + serialization and with `encode_search_response`, then times
+both end to end through the ASGI app.
+
+    python -m benchmarks.bench_serialization [--rounds 2000]
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi.routing import APIRoute, serialize_response
+from fastapi.testclient import TestClient
+
+from app.api.responses import encode_search_response
+from app.api.v1 import employees as employees_api
+from app.config import ResponseConfig
+from app.db import sqlite_store
+from app.main import app
+from app.middleware import rate_limit
+from app.models.employee import Employee
+from app.schemas.employee import EmployeeSearchRequest
+from app.services.employee_search import EmployeeSearchService
+
+URL = "/api/v1/employees/search"
+ORG = "org_default"
+
+
+def _setup(rows: int) -> None:
+    sqlite_store.DB_PATH = Path(tempfile.mkdtemp()) / "bench.sqlite3"
+    store = sqlite_store.get_employee_store()
+    store.upsert_employees(
+        Employee(f"b{i:07d}", ORG, f"Person {i}", f"p{i}@example.com", "Engineering", "HN", "SE")
+        for i in range(rows)
+    )
+    rate_limit._limiter = rate_limit.SlidingWindowRateLimiter(max_requests=10**9)
+
+
+def _time(label: str, fn, rounds: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    per_call = (time.perf_counter() - start) / rounds * 1e6
+    print(f"{label:<44}{per_call:>10.1f} us")
+    return per_call
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+    _setup(1000)
+
+    response = EmployeeSearchService.search(EmployeeSearchRequest(org_id=ORG, limit=100))
+    route = next(
+        r for r in employees_api.router.routes if isinstance(r, APIRoute) and r.path.endswith("/search")
+    )
+    loop = asyncio.new_event_loop()
+
+    def model_path() -> None:
+        loop.run_until_complete(
+            serialize_response(field=route.response_field, response_content=response)
+        )
+
+    print(f"100-item page, {args.rounds} rounds")
+    slow = _time("encode: response_model validate+serialize", model_path, args.rounds)
+    fast = _time("encode: encode_search_response", lambda: encode_search_response(response), args.rounds)
+    print(f"{'speedup':<44}{slow / fast:>10.1f} x")
+
+    client = TestClient(app)
+    params = {"org_id": ORG, "limit": 100}
+    results = {}
+    for fast_json in (False, True):
+        employees_api.RESPONSE_CONFIG = ResponseConfig(fast_json=fast_json)
+        results[fast_json] = _time(
+            f"request: fast_json={fast_json}", lambda: client.get(URL, params=params), args.rounds // 4
+        )
+    print(f"{'request speedup':<44}{results[False] / results[True]:>10.2f} x")
+    sqlite_store.close_employee_store()
+
+
+if __name__ == "__main__":
+    main()
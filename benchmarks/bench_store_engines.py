@@ -0,0 +1,86 @@
+"""
+Benchmark: SQLite vs in-memory columnar store on exact-match filters.
+
+Loads one org of `--rows` employees with skewed department/location/position
+values, then times `search_rows` (count + first page, as the search
+endpoint runs it) for every combination of exact-match filters on both
+engines.
+
+    python -m benchmarks.bench_store_engines [--rows 200000] [--rounds 200]
+"""
+import argparse
+import itertools
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from app.db.filters import SearchFilters
+from app.db.memory_store import InMemoryEmployeeStore
+from app.db.sqlite_store import SQLiteEmployeeStore, _init_db
+
+ORG = "org_bench"
+COLUMNS = ("name", "email", "department", "location", "position", "id")
+DEPARTMENTS = [f"Dept {i}" for i in range(40)]
+LOCATIONS = [f"City {i}" for i in range(12)]
+POSITIONS = [f"Level {i}" for i in range(8)]
+
+
+def _rows(n: int):
+    rng = random.Random(42)
+    # Zipf-ish skew: a few large departments, a long tail of small ones.
+    dept_weights = [1 / (i + 1) for i in range(len(DEPARTMENTS))]
+    for i in range(n):
+        yield (
+            f"b{i:08d}",
+            ORG,
+            f"Person {i}",
+            f"p{i}@example.com",
+            rng.choices(DEPARTMENTS, dept_weights)[0],
+            rng.choice(LOCATIONS),
+            rng.choice(POSITIONS),
+        )
+
+
+def _time(store, filters: SearchFilters, rounds: int) -> float:
+    store.search_rows(filters, COLUMNS)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        store.search_rows(filters, COLUMNS)
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    path = Path(tempfile.mkdtemp()) / "engines.sqlite3"
+    _init_db(path, seed=False)
+    sqlite = SQLiteEmployeeStore(path)
+    report = sqlite.bulk_load(_rows(args.rows), rebuild_indexes=True)
+    print(f"loaded {report.rows:,} rows in {report.seconds:.1f}s")
+
+    memory = InMemoryEmployeeStore(path)
+    start = time.perf_counter()
+    memory.search_rows(SearchFilters(ORG, limit=1), COLUMNS)
+    print(f"memory segment built in {time.perf_counter() - start:.2f}s")
+
+    print(f"{'filters':<44}{'sqlite us':>12}{'memory us':>12}{'speedup':>10}")
+    choices = itertools.product([None, "Dept 0", "Dept 30"], [None, "City 3"], [None, "Level 5"])
+    for department, location, position in choices:
+        filters = SearchFilters(ORG, department=department, location=location, position=position)
+        assert memory.search_rows(filters, COLUMNS) == sqlite.search_rows(filters, COLUMNS)
+        named = zip(("dept", "loc", "pos"), (department, location, position))
+        label = ", ".join(f"{k}={v}" for k, v in named if v) or "(none)"
+        t_sqlite = _time(sqlite, filters, args.rounds)
+        t_memory = _time(memory, filters, args.rounds)
+        print(f"{label:<44}{t_sqlite:>12.1f}{t_memory:>12.1f}{t_sqlite / t_memory:>9.1f}x")
+
+    memory.close()
+    sqlite.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Deterministic synthetic multi-tenant dataset for benchmarks.
+
+Generates `employees` rows across `orgs` organizations and writes them
+through `SQLiteEmployeeStore.bulk_load`. Everything is drawn from one
+seeded `random.Random`, so the same arguments always produce the same file.
+Distributions are skewed like a real directory:
+
+- org sizes follow a Zipf-like curve (`org_0000` is the largest tenant);
+- each org has its own popularity order over departments, locations and
+  positions, all heavily skewed (a few big departments, a long tail);
+- first and last names are drawn with Zipf weights, so common names repeat.
+
+    python -m benchmarks.dataset --employees 1000000 --orgs 500 [--db bench.sqlite3]
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import random
+import sqlite3
+import tempfile
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+
+from app.db.models import BulkLoadReport
+from app.db.sqlite_store import SQLiteEmployeeStore, _init_db
+
+DEPARTMENTS = [
+    "Engineering", "Sales", "Operations", "Customer Support", "Marketing", "Finance",
+    "HR", "Product", "Legal", "Research", "IT", "Procurement", "Logistics", "Design",
+    "Quality Assurance", "Security", "Data", "Facilities", "Training", "Compliance",
+]
+LOCATIONS = [
+    "HN", "HCM", "DN", "Singapore", "Tokyo", "Seoul", "Bangkok", "Jakarta", "Manila",
+    "Sydney", "London", "Berlin", "Paris", "Amsterdam", "New York", "San Francisco",
+    "Toronto", "Austin", "Bangalore", "Dubai",
+]
+POSITIONS = [
+    "Associate", "Engineer", "Senior Engineer", "Analyst", "Specialist", "Lead",
+    "Manager", "Senior Manager", "Director", "Architect", "VP", "Intern",
+]
+FIRST_NAMES = [
+    "John", "Mary", "Minh", "Linh", "Anh", "David", "Sarah", "Michael", "Emma", "James",
+    "Olivia", "Huong", "Tuan", "Lan", "Wei", "Mei", "Hiroshi", "Yuki", "Ji-woo", "Min-jun",
+    "Carlos", "Sofia", "Ahmed", "Fatima", "Raj", "Priya", "Lucas", "Chloe", "Daniel", "Grace",
+    "Thomas", "Anna", "Ivan", "Elena", "Noah", "Ava", "Ethan", "Mia", "Liam", "Zoe",
+]
+LAST_NAMES = [
+    "Nguyen", "Tran", "Le", "Pham", "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia",
+    "Miller", "Davis", "Wang", "Li", "Zhang", "Chen", "Kim", "Lee", "Park", "Tanaka",
+    "Suzuki", "Sato", "Singh", "Kumar", "Patel", "Khan", "Rossi", "Muller", "Schmidt", "Dubois",
+    "Martin", "Bernard", "Silva", "Santos", "Ivanov", "Petrov", "Hoang", "Vu", "Dang", "Bui",
+    "Wilson", "Taylor", "Anderson", "Thomas", "Moore", "Jackson", "White", "Harris", "Clark",
+    "Lewis", "Walker", "Young", "Allen", "King", "Wright", "Scott", "Green", "Baker", "Adams",
+]
+
+
+def zipf_weights(n: int, s: float = 1.1) -> list[float]:
+    """Zipf-like weights for ranks 1..n (rank 1 is the most frequent)."""
+    return [1 / (rank ** s) for rank in range(1, n + 1)]
+
+
+def org_ids(orgs: int) -> list[str]:
+    """Org ids in size order, largest first."""
+    return [f"org_{i:04d}" for i in range(orgs)]
+
+
+def _cumulative(weights: Sequence[float]) -> list[float]:
+    return list(itertools.accumulate(weights))
+
+
+def generate_rows(employees: int, orgs: int, seed: int = 42) -> Iterator[tuple[str, ...]]:
+    """Rows in EMPLOYEE_COLUMNS order; the same arguments always yield the same rows."""
+    rng = random.Random(seed)
+    orgs_list = org_ids(orgs)
+    org_cum = _cumulative(zipf_weights(orgs))
+    # Per-org popularity order over each dimension, on the same skewed curve.
+    profiles = []
+    for _ in orgs_list:
+        profile = []
+        for values in (DEPARTMENTS, LOCATIONS, POSITIONS):
+            ranked = rng.sample(values, len(values))
+            profile.append((ranked, _cumulative(zipf_weights(len(ranked), 1.3))))
+        profiles.append(profile)
+    first_cum = _cumulative(zipf_weights(len(FIRST_NAMES), 0.9))
+    last_cum = _cumulative(zipf_weights(len(LAST_NAMES), 0.9))
+
+    for i in range(employees):
+        o = rng.choices(range(orgs), cum_weights=org_cum)[0]
+        org = orgs_list[o]
+        first = rng.choices(FIRST_NAMES, cum_weights=first_cum)[0]
+        last = rng.choices(LAST_NAMES, cum_weights=last_cum)[0]
+        department, location, position = (
+            rng.choices(ranked, cum_weights=cum)[0] for ranked, cum in profiles[o]
+        )
+        yield (
+            f"emp{i:08d}",
+            org,
+            f"{first} {last}",
+            f"{first}.{last}.{i}@{org}.example.com".lower(),
+            department,
+            location,
+            position,
+        )
+
+
+def build_dataset(db_path: Path, employees: int, orgs: int, seed: int = 42) -> BulkLoadReport:
+    """Create `db_path` (which should not exist yet) and load the dataset into it."""
+    _init_db(db_path, seed=False)
+    store = SQLiteEmployeeStore(db_path)
+    try:
+        return store.bulk_load(generate_rows(employees, orgs, seed), rebuild_indexes=True)
+    finally:
+        store.close()
+
+
+def _with_sidecars(db_path: Path) -> list[Path]:
+    """`db_path` and its WAL-mode `-wal` / `-shm` files."""
+    return [db_path, *(db_path.with_name(db_path.name + suffix) for suffix in ("-wal", "-shm"))]
+
+
+def _checkpoint(db_path: Path) -> None:
+    """
+    Copy every committed page from the WAL into the main file and drop the
+    WAL, so the file can be renamed on its own (the WAL keeps its old name).
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        busy, _, _ = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+    finally:
+        conn.close()
+    if busy:
+        raise RuntimeError(f"could not checkpoint {db_path}: still in use")
+    for path in _with_sidecars(db_path)[1:]:
+        path.unlink(missing_ok=True)
+
+
+def _row_count(db_path: Path) -> int:
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM employees").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def ensure_dataset(
+    employees: int, orgs: int, seed: int = 42, db_path: Path | None = None
+) -> Path:
+    """
+    Path of a database holding the dataset, built on first use. Without
+    `db_path` the file is cached in the temp dir under a name derived from
+    the arguments, so repeated benchmark runs reuse it.
+    """
+    if db_path is None:
+        db_path = Path(tempfile.gettempdir()) / f"bench_{employees}_{orgs}_{seed}.sqlite3"
+    if not db_path.exists():
+        # Build under another name so an interrupted run is never reused.
+        partial = db_path.with_name(db_path.name + ".partial")
+        for path in _with_sidecars(partial):
+            path.unlink(missing_ok=True)
+        report = build_dataset(partial, employees, orgs, seed)
+        _checkpoint(partial)
+        partial.rename(db_path)
+        rows = _row_count(db_path)
+        if rows != report.rows:
+            raise RuntimeError(f"{db_path} holds {rows:,} employees, expected {report.rows:,}")
+        print(
+            f"generated {report.rows:,} employees in {report.orgs:,} orgs "
+            f"in {report.seconds:.1f}s -> {db_path}"
+        )
+    return db_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--employees", type=int, default=1_000_000)
+    parser.add_argument("--orgs", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", type=Path, default=None, help="Output file (default: temp dir)")
+    args = parser.parse_args()
+    if args.db is not None and args.db.exists():
+        parser.error(f"{args.db} already exists")
+    ensure_dataset(args.employees, args.orgs, args.seed, args.db)
+
+
+if __name__ == "__main__":
+    main()
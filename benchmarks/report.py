@@ -0,0 +1,60 @@
+"""
+Result summaries and JSON output shared by the benchmark suite.
+
+JSON reports carry the commit, interpreter and SQLite versions next to the
+numbers, so runs saved from different commits can be compared directly.
+"""
+from __future__ import annotations
+
+import json
+import platform
+import sqlite3
+import statistics
+import subprocess
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+
+def summarize(samples: Sequence[float]) -> dict[str, float]:
+    """Count, mean and p50/p95/p99 of latency samples (seconds), in milliseconds."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {"count": 0}
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1e3
+
+    return {
+        "count": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1e3,
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+    }
+
+
+def run_metadata() -> dict[str, str | None]:
+    """Where and when a run happened: commit, Python, SQLite, machine."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, timeout=10,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "machine": f"{platform.system()} {platform.machine()}",
+    }
+
+
+def write_json(path: Path, payload: dict) -> None:
+    """Write a report as indented JSON (with `run_metadata()` under "meta")."""
+    report = {"meta": run_metadata(), **payload}
+    # default=str covers argparse values such as Path.
+    path.write_text(json.dumps(report, indent=2, default=str) + "\n")
+    print(f"wrote {path}")
@@ -2,7 +2,31 @@
 import pytest
 from fastapi.testclient import TestClient
 
+from app.db import sqlite_store
+from app.db.async_store import close_async_employee_store
 from app.main import app
+from app.middleware import rate_limit as rl_mod
+
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_db(tmp_path_factory: pytest.TempPathFactory):
+    """Run the suite against a throwaway seeded DB, not the checked-in file."""
+    original = sqlite_store.DB_PATH
+    sqlite_store.close_employee_store()
+    sqlite_store.DB_PATH = tmp_path_factory.mktemp("db") / "employees.sqlite3"
+    yield sqlite_store.DB_PATH
+    close_async_employee_store()
+    sqlite_store.close_employee_store()
+    sqlite_store.DB_PATH = original
+
+
+@pytest.fixture(autouse=True)
+def fresh_rate_limiter():
+    """Each test starts with an empty limiter so quotas don't leak between tests."""
+    original = rl_mod._limiter
+    rl_mod._limiter = rl_mod.SlidingWindowRateLimiter(max_requests=1000, window_seconds=60)
+    yield
+    rl_mod._limiter = original
 
 
 @pytest.fixture
@@ -0,0 +1,57 @@
+"""Unit tests for the bounded async store executor."""
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import StoreConfig
+from app.db import async_store
+from app.db.async_store import AsyncEmployeeStore, StoreOverloaded
+from app.db.sqlite_store import SearchFilters, get_employee_store
+
+
+def _blocking_store(config: StoreConfig) -> tuple[AsyncEmployeeStore, threading.Event]:
+    return AsyncEmployeeStore(get_employee_store(), config), threading.Event()
+
+
+async def test_search_runs_off_loop() -> None:
+    astore = AsyncEmployeeStore(get_employee_store())
+    loop_thread = threading.get_ident()
+    employees, total = await astore.search(SearchFilters(org_id="org_a"))
+    assert total == 4 and len(employees) == 4
+    assert await astore.run(threading.get_ident) != loop_thread
+    assert astore.in_flight == 0
+    astore.close()
+
+
+async def test_overflow_is_rejected() -> None:
+    astore, release = _blocking_store(StoreConfig(pool_size=1, executor_queue_limit=1))
+    running = asyncio.ensure_future(astore.run(release.wait))
+    queued = asyncio.ensure_future(astore.run(release.wait))
+    await asyncio.sleep(0)
+    assert astore.in_flight == 2
+    with pytest.raises(StoreOverloaded):
+        await astore.run(release.wait)
+    release.set()
+    await asyncio.gather(running, queued)
+    assert astore.in_flight == 0
+    astore.close()
+
+
+def test_overloaded_search_returns_503(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    astore, release = _blocking_store(StoreConfig(pool_size=1, executor_queue_limit=0))
+    monkeypatch.setattr(async_store, "_async_store", astore)
+    occupier = threading.Thread(target=lambda: asyncio.run(astore.run(release.wait)))
+    occupier.start()
+    try:
+        while astore.in_flight == 0:
+            time.sleep(0.001)
+        r = client.get("/api/v1/employees/search", params={"org_id": "org_overloaded"})
+        assert r.status_code == 503
+        assert r.headers.get("Retry-After") == "1"
+    finally:
+        release.set()
+        occupier.join()
+        astore.close()
@@ -0,0 +1,93 @@
+"""Unit tests for name autocomplete."""
+from fastapi.testclient import TestClient
+
+from app.db.sqlite_store import SQLiteEmployeeStore, get_employee_store
+from app.models.employee import Employee
+from app.services.employee_search import EmployeeSearchService
+from app.services.name_index import NameIndexCache, OrgNameIndex
+
+URL = "/api/v1/employees/autocomplete"
+
+
+def _names(client: TestClient, org_id: str, q: str, **params) -> list[str]:
+    r = client.get(URL, params={"org_id": org_id, "q": q, **params})
+    assert r.status_code == 200
+    return [item["name"] for item in r.json()["items"]]
+
+
+def test_matches_word_starts_case_insensitively(client: TestClient) -> None:
+    assert _names(client, "org_a", "doe") == ["John Doe"]
+    assert _names(client, "org_a", "JOHN") == ["John Doe", "Bob Johnson"]
+    assert _names(client, "org_b", "smi") == ["John Smith"]
+    assert _names(client, "org_b", "john  s") == ["John Smith"]
+    assert _names(client, "org_a", "ohn") == []
+
+
+def test_items_follow_column_config(client: TestClient) -> None:
+    items = client.get(URL, params={"org_id": "org_b", "q": "diana"}).json()["items"]
+    assert items == [{"name": "Diana Prince", "department": "Product", "position": "PM"}]
+
+
+def test_limit(client: TestClient) -> None:
+    assert _names(client, "org_a", "j", limit=1) == ["Jane Smith"]
+    assert client.get(URL, params={"org_id": "org_a", "q": "j", "limit": 51}).status_code == 422
+
+
+def test_index_follows_writes(client: TestClient) -> None:
+    assert _names(client, "org_ac", "zed") == []
+    store = get_employee_store()
+    store.upsert_employees([Employee("ac1", "org_ac", "Zed Quinn", "z@x.com", "Ops", "HN", "SE")])
+    assert _names(client, "org_ac", "qui") == ["Zed Quinn"]
+    store.upsert_employees([Employee("ac1", "org_ac", "Zoe Quinn", "z@x.com", "Ops", "HN", "SE")])
+    assert _names(client, "org_ac", "zed") == []
+    assert _names(client, "org_ac", "zoe") == ["Zoe Quinn"]
+    # Moving the employee to another org removes them here.
+    store.upsert_employees([Employee("ac1", "org_ac2", "Zoe Quinn", "z@x.com", "Ops", "HN", "SE")])
+    assert _names(client, "org_ac", "zoe") == []
+    assert _names(client, "org_ac2", "zoe") == ["Zoe Quinn"]
+
+
+def test_in_process_writes_patch_without_reloading(client: TestClient) -> None:
+    assert _names(client, "org_ac3", "ada") == []
+    loads = EmployeeSearchService.name_index_stats()["loads"]
+    get_employee_store().upsert_employees(
+        [Employee("ac3", "org_ac3", "Ada Byron", "a@x.com", "Ops", "HN", "SE")]
+    )
+    assert _names(client, "org_ac3", "ada") == ["Ada Byron"]
+    assert EmployeeSearchService.name_index_stats()["loads"] == loads
+
+
+def test_index_follows_other_processes_writes(client: TestClient) -> None:
+    """Rows written by another store (e.g. the ingest CLI) appear once the org version moves."""
+    assert _names(client, "org_ac4", "zed") == []
+    other = SQLiteEmployeeStore(get_employee_store().db_path)
+    try:
+        other.upsert_employees([Employee("ac4", "org_ac4", "Zed Ames", "z@x.com", "Ops", "HN", "SE")])
+    finally:
+        other.close()
+    assert _names(client, "org_ac4", "zed") == ["Zed Ames"]
+
+
+def test_cold_orgs_are_evicted() -> None:
+    cache = NameIndexCache(max_orgs=1)
+    store = get_employee_store()
+    columns = ("name", "id")
+    org_a = cache.get(store, "org_a", columns)
+    assert org_a.search("john", 10) == [("John Doe", "e1"), ("Bob Johnson", "e3")]
+    assert cache.get(store, "org_b", columns).search("john", 10) == [("John Smith", "e7")]
+    assert cache.stats()["orgs"] == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_incremental_updates_keep_index_sorted() -> None:
+    def emp(emp_id: str, name: str) -> tuple[Employee, tuple]:
+        return Employee(emp_id, "org", name, "", "", "", ""), (name,)
+
+    index = OrgNameIndex.build([emp("1", "Ann Lee"), emp("2", "Bo Lee")])
+    index.put(*emp("3", "Lee Ann"))
+    index.put(*emp("1", "Annie Lee"))
+    assert index.search("lee", 10) == [("Lee Ann",), ("Annie Lee",), ("Bo Lee",)]
+    assert index.search("ann", 10) == [("Annie Lee",), ("Lee Ann",)]
+    index.remove("3")
+    assert index.search("ann", 10) == [("Annie Lee",)]
+    assert index.entries == 4
@@ -0,0 +1,73 @@
+"""Unit tests for the batch search endpoint."""
+from fastapi.testclient import TestClient
+
+from app.db.sqlite_store import SearchFilters, _merge_groups, get_employee_store
+
+URL = "/api/v1/employees/search/batch"
+
+
+def _search(client: TestClient, **params) -> dict:
+    return client.get("/api/v1/employees/search", params=params).json()
+
+
+def test_results_match_single_searches_in_request_order(client: TestClient) -> None:
+    searches = [
+        {"org_id": "org_b", "department": "Product"},
+        {"org_id": "org_b", "department": "Engineering", "limit": 1},
+        {"org_id": "org_b", "department": "Nope"},
+        {"org_id": "org_b", "name": "john"},
+        {"org_id": "org_b", "department": "Engineering", "limit": 1, "offset": 1},
+        {"org_id": "org_b", "location": "HN", "count": "none"},
+    ]
+    r = client.post(URL, params={"org_id": "org_b"}, json={"searches": searches})
+    assert r.status_code == 200
+    results = r.json()["results"]
+    assert results == [_search(client, **s) for s in searches]
+    assert [item["name"] for item in results[0]["items"]] == ["Diana Prince"]
+    assert results[2] == {
+        "items": [],
+        "total": 0,
+        "total_mode": "exact",
+        "has_more": False,
+        "limit": 20,
+        "offset": 0,
+        "next_cursor": None,
+    }
+
+
+def test_same_shape_searches_are_merged() -> None:
+    batch = [
+        SearchFilters("org_b", department="Engineering"),
+        SearchFilters("org_b", department="Product"),
+        SearchFilters("org_b", department="Product", location="HN"),
+        SearchFilters("org_b", department="HR", after_id="e4"),
+    ]
+    groups = _merge_groups(batch)
+    assert groups[0] == ("department", SearchFilters("org_b"), [0, 1])
+    assert sorted(i for _, _, members in groups[1:] for i in members) == [2, 3]
+
+    rows = get_employee_store().search_many(batch, ("id",))
+    assert rows == [get_employee_store().search_rows(f, ("id",)) for f in batch]
+
+
+def test_searches_for_another_org_are_rejected(client: TestClient) -> None:
+    body = {"searches": [{"org_id": "org_a"}, {"org_id": "org_b"}]}
+    r = client.post(URL, params={"org_id": "org_a"}, json=body)
+    assert r.status_code == 400
+
+
+def test_batch_size_is_bounded(client: TestClient) -> None:
+    assert client.post(URL, params={"org_id": "org_a"}, json={"searches": []}).status_code == 422
+    body = {"searches": [{"org_id": "org_a"}] * 51}
+    assert client.post(URL, params={"org_id": "org_a"}, json=body).status_code == 422
+
+
+def test_batch_is_charged_by_weight(client: TestClient) -> None:
+    """50 searches cost 2 requests at the default 25 searches per request."""
+    from app.middleware import rate_limit as rl_mod
+
+    rl_mod._limiter = rl_mod.SlidingWindowRateLimiter(max_requests=3, window_seconds=60)
+    body = {"searches": [{"org_id": "org_a", "department": "HR"}] * 50}
+    assert client.post(URL, params={"org_id": "org_a"}, json=body).status_code == 200
+    assert client.post(URL, params={"org_id": "org_a"}, json=body).status_code == 429
+    assert client.get("/api/v1/employees/search", params={"org_id": "org_a"}).status_code == 200
@@ -0,0 +1,172 @@
+"""Unit tests for per-org data versions and conditional search requests (ETag / 304)."""
+import sqlite3
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.responses import etag_matches
+from app.config import RESPONSE_CONFIG
+from app.db.filters import SearchFilters
+from app.db.memory_store import InMemoryEmployeeStore
+from app.db.sqlite_store import SQLiteEmployeeStore, _init_db, get_employee_store
+from app.models.employee import Employee
+from app.services.employee_search import EmployeeSearchService
+
+URL = "/api/v1/employees/search"
+
+
+def _employee(emp_id: str, org_id: str, name: str = "Etag Person") -> Employee:
+    return Employee(emp_id, org_id, name, f"{emp_id}@example.com", "QA", "HN", "SE")
+
+
+@pytest.fixture
+def store(tmp_path: Path):
+    _init_db(tmp_path / "versions.sqlite3", seed=True)
+    store = SQLiteEmployeeStore(tmp_path / "versions.sqlite3")
+    yield store
+    store.close()
+
+
+def test_writes_bump_only_the_touched_orgs(store: SQLiteEmployeeStore) -> None:
+    a, b = store.org_version("org_a"), store.org_version("org_b")
+    assert store.org_version("org_new") == 0
+    store.upsert_employees([_employee("x1", "org_new")])
+    assert store.org_version("org_new") > 0
+    assert (store.org_version("org_a"), store.org_version("org_b")) == (a, b)
+
+    # Moving an employee changes both orgs.
+    store.upsert_employees([_employee("e1", "org_b")])
+    assert store.org_version("org_a") > a and store.org_version("org_b") > b
+
+
+def test_writes_from_other_connections_are_seen(store: SQLiteEmployeeStore) -> None:
+    before = store.org_version("org_b")
+    conn = sqlite3.connect(store.db_path)
+    with conn:
+        conn.execute("DELETE FROM employees WHERE id = 'e6'")
+    conn.close()
+    assert store.org_version("org_b") > before
+
+
+def test_lookup_after_a_commit_reads_only_that_org(store: SQLiteEmployeeStore) -> None:
+    store.org_version("org_a")
+    statements: list[str] = []
+    store._version_conn.set_trace_callback(statements.append)
+    store.org_version("org_a")
+    assert statements == ["PRAGMA data_version"]  # served from the cache
+
+    store.upsert_employees([_employee("x4", "org_b")])
+    statements.clear()
+    store.org_version("org_a")
+    reads = [sql for sql in statements if "org_versions" in sql]
+    assert len(reads) == 1 and "WHERE org_id = 'org_a'" in reads[0]
+
+
+def test_async_search_reads_versions_off_the_event_loop(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import threading
+
+    store = get_employee_store()
+    threads = []
+    real = store.org_version
+
+    def recording(org_id: str) -> int:
+        threads.append(threading.current_thread().name)
+        return real(org_id)
+
+    monkeypatch.setattr(store, "org_version", recording)
+    assert client.get(URL, params={"org_id": "org_b", "department": "Sales"}).status_code == 200
+    # One lookup for the ETag, one for the result cache key.
+    assert len(threads) == 2
+    assert all(name.startswith("employee-store") for name in threads), threads
+
+
+def test_bulk_load_bumps_every_org(store: SQLiteEmployeeStore) -> None:
+    a = store.org_version("org_a")
+    store.bulk_load(
+        [("x2", "org_loaded", "Loaded", "x2@example.com", "QA", "HN", "SE")], rebuild_indexes=True
+    )
+    assert store.org_version("org_a") > a
+    assert store.org_version("org_loaded") > 0
+    before = store.org_version("org_loaded")
+    store.upsert_employees([_employee("x2", "org_loaded", "Renamed")])  # triggers restored
+    assert store.org_version("org_loaded") > before
+
+
+def test_small_bulk_load_bumps_only_loaded_orgs(store: SQLiteEmployeeStore) -> None:
+    """With indexes kept in place, the version triggers do the bumping row by row."""
+    a = store.org_version("org_a")
+    store.bulk_load([("x3", "org_small", "Small", "x3@example.com", "QA", "HN", "SE")])
+    assert store.org_version("org_a") == a
+    assert store.org_version("org_small") == 1
+
+
+def test_memory_segments_follow_external_writes(store: SQLiteEmployeeStore) -> None:
+    memory = InMemoryEmployeeStore(store.db_path)
+    try:
+        assert memory.search(SearchFilters("org_b"))[1] == 3
+        conn = sqlite3.connect(store.db_path)
+        with conn:
+            conn.execute("DELETE FROM employees WHERE id = 'e7'")
+        conn.close()
+        assert memory.search(SearchFilters("org_b"))[1] == 2
+    finally:
+        memory.close()
+
+
+def test_etag_matching() -> None:
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('W/"abc"', '"abc"')
+    assert etag_matches('"x", "abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"abcd"', '"abc"')
+    assert not etag_matches(None, '"abc"')
+
+
+def test_unchanged_page_is_not_modified(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    params = {"org_id": "org_b", "department": "Engineering"}
+    first = client.get(URL, params=params)
+    etag = first.headers["etag"]
+    assert etag.startswith('"') and first.headers["cache-control"] == RESPONSE_CONFIG.cache_control
+
+    async def no_search(req):
+        raise AssertionError("search should not run for a matching If-None-Match")
+
+    monkeypatch.setattr(EmployeeSearchService, "search_async", no_search)
+    r = client.get(URL, params=params, headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.content == b""
+    assert r.headers["etag"] == etag
+
+
+def test_etag_depends_on_page_and_columns(client: TestClient) -> None:
+    tags = {
+        client.get(URL, params=params).headers["etag"]
+        for params in (
+            {"org_id": "org_a"},
+            {"org_id": "org_b"},
+            {"org_id": "org_a", "limit": 2},
+            {"org_id": "org_a", "sort": "name"},
+            {"org_id": "org_a", "count": "none"},
+        )
+    }
+    assert len(tags) == 5
+    assert client.get(URL, params={"org_id": "org_a"}).headers["etag"] in tags
+
+
+def test_write_changes_the_etag(client: TestClient) -> None:
+    params = {"org_id": "org_etag"}
+    etag = client.get(URL, params=params).headers["etag"]
+    other = client.get(URL, params={"org_id": "org_b"}).headers["etag"]
+    get_employee_store().upsert_employees([_employee("etag1", "org_etag")])
+
+    r = client.get(URL, params=params, headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
+    assert [i["name"] for i in r.json()["items"]] == ["Etag Person"]
+    r = client.get(URL, params={"org_id": "org_b"}, headers={"If-None-Match": other})
+    assert r.status_code == 304
@@ -0,0 +1,61 @@
+"""Unit tests for the pooled SQLite connections."""
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from app.config import StoreConfig
+from app.db.pool import ConnectionPool, PoolClosed, PoolTimeout
+from app.db.sqlite_store import SearchFilters, SQLiteEmployeeStore, _init_db
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> Path:
+    path = tmp_path / "pool.sqlite3"
+    _init_db(path)
+    return path
+
+
+def test_connections_are_reused(db_path: Path) -> None:
+    """Sequential borrows get the same long-lived connection back."""
+    pool = ConnectionPool(db_path, StoreConfig(pool_size=2))
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+    assert first is second
+    assert pool.open_connections == 1
+    pool.close()
+
+
+def test_pooled_connection_pragmas_and_read_only(db_path: Path) -> None:
+    """Pooled connections are tuned, in WAL mode and refuse writes."""
+    pool = ConnectionPool(db_path, StoreConfig(cache_size_kib=1024))
+    with pool.connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -1024
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM employees")
+    pool.close()
+
+
+def test_pool_is_bounded(db_path: Path) -> None:
+    """A full pool times out instead of opening extra connections."""
+    pool = ConnectionPool(db_path, StoreConfig(pool_size=1, pool_timeout_seconds=0.01))
+    with pool.connection():
+        with pytest.raises(PoolTimeout):
+            with pool.connection():
+                pass
+    pool.close()
+
+
+def test_close_drains_pool(db_path: Path) -> None:
+    """Closing the store releases connections and rejects new borrows."""
+    store = SQLiteEmployeeStore(db_path)
+    store.search(SearchFilters(org_id="org_a"))
+    assert store._pool.open_connections == 1
+    store.close()
+    assert store._pool.open_connections == 0
+    with pytest.raises(PoolClosed):
+        store.search(SearchFilters(org_id="org_a"))
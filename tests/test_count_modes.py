@@ -0,0 +1,44 @@
+"""Unit tests for the total count modes."""
+from fastapi.testclient import TestClient
+
+URL = "/api/v1/employees/search"
+
+
+def test_exact_count_is_default(client: TestClient) -> None:
+    data = client.get(URL, params={"org_id": "org_a", "limit": 2}).json()
+    assert data["total"] == 4
+    assert data["total_mode"] == "exact"
+    assert data["has_more"] is True
+
+
+def test_count_none_skips_total(client: TestClient) -> None:
+    data = client.get(URL, params={"org_id": "org_a", "limit": 2, "count": "none"}).json()
+    assert data["total"] is None
+    assert data["total_mode"] == "none"
+    assert data["has_more"] is True
+    assert len(data["items"]) == 2
+
+    last = client.get(URL, params={"org_id": "org_a", "limit": 2, "offset": 2, "count": "none"}).json()
+    assert last["has_more"] is False
+
+
+def test_estimate_from_statistics(client: TestClient) -> None:
+    """Single-facet estimates are exact; combinations assume independence."""
+    data = client.get(URL, params={"org_id": "org_a", "department": "Engineering", "count": "estimate"}).json()
+    assert data["total_mode"] == "estimate"
+    assert data["total"] == 2
+
+    data = client.get(
+        URL, params={"org_id": "org_a", "department": "Engineering", "location": "HN", "count": "estimate"}
+    ).json()
+    assert data["total"] == 1  # 4 * 2/4 * 2/4
+
+
+def test_estimate_with_name_falls_back_to_exact(client: TestClient) -> None:
+    data = client.get(URL, params={"org_id": "org_a", "name": "john", "count": "estimate"}).json()
+    assert data["total_mode"] == "exact"
+    assert data["total"] == 2
+
+
+def test_invalid_count_mode(client: TestClient) -> None:
+    assert client.get(URL, params={"org_id": "org_a", "count": "fast"}).status_code == 422
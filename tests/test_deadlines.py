@@ -0,0 +1,94 @@
+"""Unit tests for search time budgets (progress-handler deadlines and 504s)."""
+import dataclasses
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import STORE_CONFIG
+from app.db.deadlines import QueryTimeout, effective_budget_ms, time_budget
+from app.db.filters import SearchFilters
+from app.db.sqlite_store import SQLiteEmployeeStore, _init_db
+from app.schemas.employee import EmployeeSearchRequest
+from app.services import employee_search
+
+URL = "/api/v1/employees/search"
+
+
+@pytest.fixture(scope="module")
+def big_store(tmp_path_factory: pytest.TempPathFactory):
+    """One pooled connection over an org large enough for a query to take a while."""
+    db_path = tmp_path_factory.mktemp("deadlines") / "big.sqlite3"
+    _init_db(db_path, seed=False)
+    config = dataclasses.replace(
+        STORE_CONFIG, pool_size=1, deadline_check_ops=100, slow_query_ms=1000.0
+    )
+    store = SQLiteEmployeeStore(db_path, config)
+    store.bulk_load(
+        (f"b{i:06d}", "org_big", f"Person {i}", f"p{i}@big.example.com", "QA", "HN", "SE")
+        for i in range(60_000)
+    )
+    yield store
+    store.close()
+
+
+def test_budget_can_only_be_tightened() -> None:
+    assert effective_budget_ms(5000, None) == 5000
+    assert effective_budget_ms(5000, 200) == 200
+    assert effective_budget_ms(5000, 60_000) == 5000
+    assert effective_budget_ms(None, 200) == 200
+    assert effective_budget_ms(None, None) is None
+    reqs = [EmployeeSearchRequest(org_id="org_a", timeout_ms=t) for t in (300, None, 100)]
+    assert employee_search._batch_budget_ms(reqs) == 100
+
+
+def test_spent_budget_skips_the_query(big_store: SQLiteEmployeeStore) -> None:
+    with time_budget(0), pytest.raises(QueryTimeout) as caught:
+        big_store.search(SearchFilters("org_big"))
+    assert caught.value.query == "count"
+    assert caught.value.vm_steps == 0
+
+
+def test_running_query_is_interrupted(big_store: SQLiteEmployeeStore) -> None:
+    slow = SearchFilters("org_big", name="zq")  # LIKE scan over the whole org
+    with time_budget(1), pytest.raises(QueryTimeout) as caught:
+        big_store.search(slow)
+    assert caught.value.query == "count"
+    assert caught.value.vm_steps > 0
+    assert caught.value.elapsed_ms >= 1
+    aborted = big_store.slow_queries.entries()[0]
+    assert aborted.aborted and aborted.kind == "count" and aborted.rows == 0
+
+    # The same (only) connection is back in the pool without the handler.
+    assert big_store.search(slow) == ([], 0)
+    with time_budget(60_000):
+        _, total = big_store.search(SearchFilters("org_big", name="person 1"))
+    assert total == 11_111
+
+
+def test_statistics_queries_have_a_deadline(big_store: SQLiteEmployeeStore) -> None:
+    big_store.invalidate_statistics()
+    for read in (
+        lambda: big_store.estimate_count(SearchFilters("org_big", department="QA")),
+        lambda: big_store.facet_counts(SearchFilters("org_big")),
+    ):
+        with time_budget(0), pytest.raises(QueryTimeout) as caught:
+            read()
+        assert caught.value.query == "statistics"
+    assert big_store.estimate_count(SearchFilters("org_big", department="QA")) == 60_000
+
+
+def test_timeout_answers_504(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    spent = dataclasses.replace(STORE_CONFIG, search_timeout_ms=0)
+    monkeypatch.setattr(employee_search, "STORE_CONFIG", spent)
+    r = client.get(URL, params={"org_id": "org_a", "location": "HN", "limit": 19})
+    assert r.status_code == 504
+    body = r.json()
+    assert body["query"] == "count" and body["budget_ms"] == 0
+    assert set(body) == {"detail", "query", "budget_ms", "elapsed_ms", "vm_steps"}
+    assert 'org="org_a",shape="location",status="504"' in client.get("/metrics").text
+
+
+def test_request_timeout_is_validated(client: TestClient) -> None:
+    assert client.get(URL, params={"org_id": "org_a", "timeout_ms": 0}).status_code == 422
+    assert client.get(URL, params={"org_id": "org_a", "timeout_ms": 250}).status_code == 200
@@ -50,3 +50,21 @@ def test_column_order_follows_config(client: TestClient) -> None:
     expected_order = ["name", "email", "department", "location"]
     for item in data["items"]:
         assert list(item.keys()) == expected_order
+
+
+def test_projection_selects_only_visible_columns() -> None:
+    """Hidden columns are not read from the DB; id trails as the page key."""
+    from app.services.projection import get_org_projection
+
+    projection = get_org_projection("org_b")
+    assert projection.select_columns == ("name", "department", "position", "id")
+    items = projection.build([("Diana Prince", "Product", "PM", "e6")])
+    assert items == [{"name": "Diana Prince", "department": "Product", "position": "PM"}]
+    assert projection.row_key(("Diana Prince", "Product", "PM", "e6")) == "e6"
+
+
+def test_store_rejects_unknown_select_columns() -> None:
+    from app.db.sqlite_store import SearchFilters, get_employee_store
+
+    with pytest.raises(ValueError):
+        get_employee_store().search_rows(SearchFilters(org_id="org_a"), ["name", "1; DROP TABLE employees"])
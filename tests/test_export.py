@@ -0,0 +1,72 @@
+"""Unit tests for the NDJSON export endpoint."""
+import dataclasses
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.sqlite_store import get_employee_store
+from app.models.employee import Employee
+from app.schemas.employee import EmployeeExportRequest
+from app.services.employee_search import EmployeeSearchService
+
+URL = "/api/v1/employees/export"
+
+
+def _lines(r) -> list[dict]:
+    return [json.loads(line) for line in r.text.splitlines()]
+
+
+def test_export_streams_org_with_its_columns(client: TestClient) -> None:
+    r = client.get(URL, params={"org_id": "org_b"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    items = _lines(r)
+    assert [i["name"] for i in items] == ["Charlie Wilson", "Diana Prince", "John Smith"]
+    for item in items:
+        assert list(item) == ["name", "department", "position"]
+
+
+def test_export_applies_filters(client: TestClient) -> None:
+    items = _lines(client.get(URL, params={"org_id": "org_a", "department": "Engineering"}))
+    assert [i["name"] for i in items] == ["John Doe", "Bob Johnson"]
+
+
+def test_export_batches_large_orgs() -> None:
+    get_employee_store().upsert_employees(
+        Employee(f"x{n:04d}", "org_export", f"Person {n}", f"p{n}@x.com", "HR", "HN", "SE")
+        for n in range(25)
+    )
+    chunks = list(EmployeeSearchService.export_ndjson(EmployeeExportRequest(org_id="org_export"), batch_size=10))
+    assert len(chunks) == 3
+    assert sum(chunk.count(b"\n") for chunk in chunks) == 25
+
+
+def test_export_is_one_rate_limit_unit(client: TestClient) -> None:
+    from app.middleware import rate_limit as rl_mod
+
+    rl_mod._limiter = rl_mod.SlidingWindowRateLimiter(max_requests=1, window_seconds=60)
+    assert client.get(URL, params={"org_id": "org_a"}).status_code == 200
+    assert client.get(URL, params={"org_id": "org_a"}).status_code == 429
+
+
+def test_open_exports_do_not_starve_search(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Exports read slowly by their clients hold export connections, not the search pool."""
+    pool = get_employee_store()._export_pool
+    monkeypatch.setattr(pool, "config", dataclasses.replace(pool.config, pool_timeout_seconds=0.01))
+    held = [
+        EmployeeSearchService.export_ndjson(EmployeeExportRequest(org_id="org_a"))
+        for _ in range(pool.size)
+    ]
+    try:
+        r = client.get("/api/v1/employees/search", params={"org_id": "org_a", "limit": 3})
+        assert r.status_code == 200
+        r = client.get(URL, params={"org_id": "org_a"})
+        assert r.status_code == 503
+        assert r.headers["retry-after"] == "1"
+    finally:
+        for stream in held:
+            stream.close()
+    assert client.get(URL, params={"org_id": "org_a"}).status_code == 200
@@ -0,0 +1,66 @@
+"""Unit tests for the facet counts endpoint."""
+from fastapi.testclient import TestClient
+
+from app.db.sqlite_store import SearchFilters, SQLiteEmployeeStore, get_employee_store
+from app.models.employee import Employee
+
+URL = "/api/v1/employees/facets"
+
+
+def test_default_fields_follow_column_config(client: TestClient) -> None:
+    """org_a does not show position, so it is not counted by default."""
+    data = client.get(URL, params={"org_id": "org_a"}).json()
+    assert data == {
+        "facets": {
+            "department": {"Engineering": 2, "HR": 1, "Finance": 1},
+            "location": {"HN": 2, "HCM": 1, "DN": 1},
+        },
+        "total": 4,
+    }
+
+
+def test_hidden_facet_field_is_rejected(client: TestClient) -> None:
+    r = client.get(URL, params={"org_id": "org_a", "fields": "position"})
+    assert r.status_code == 400
+
+
+def test_counts_respect_filters(client: TestClient) -> None:
+    params = {"org_id": "org_b", "fields": ["department", "position"], "location": "HN"}
+    data = client.get(URL, params=params).json()
+    assert data["facets"] == {
+        "department": {"Engineering": 2},
+        "position": {"Architect": 1, "SE": 1},
+    }
+    assert data["total"] == 2
+
+    data = client.get(URL, params={"org_id": "org_a", "name": "john", "fields": "location"}).json()
+    assert data == {"facets": {"location": {"HN": 2}}, "total": 2}
+
+
+def test_unknown_facet_field_is_422(client: TestClient) -> None:
+    assert client.get(URL, params={"org_id": "org_a", "fields": "email"}).status_code == 422
+
+
+def test_cached_aggregate_is_invalidated_on_write() -> None:
+    store = get_employee_store()
+    filters = SearchFilters(org_id="org_facets")
+    assert store.facet_counts(filters, ["department"]) == ({"department": {}}, 0)
+    store.upsert_employees([Employee("fc1", "org_facets", "Fay", "f@x.com", "Ops", "HN", "SE")])
+    assert store.facet_counts(filters, ["department"]) == ({"department": {"Ops": 1}}, 1)
+
+
+def test_cached_aggregate_follows_other_processes_writes(client: TestClient) -> None:
+    """Writes through another store (e.g. the ingest CLI) bump the org version."""
+    store = get_employee_store()
+    params = {"org_id": "org_facets_ext", "fields": "department"}
+    assert client.get(URL, params=params).json()["total"] == 0
+    other = SQLiteEmployeeStore(store.db_path)
+    try:
+        other.upsert_employees([Employee("fx1", "org_facets_ext", "Fox", "f@x.com", "Ops", "HN", "SE")])
+    finally:
+        other.close()
+    assert client.get(URL, params=params).json() == {"facets": {"department": {"Ops": 1}}, "total": 1}
+    search = client.get(
+        "/api/v1/employees/search", params={"org_id": "org_facets_ext", "count": "estimate"}
+    )
+    assert search.json()["total"] == 1
@@ -0,0 +1,43 @@
+"""Unit tests for the opt-in fast JSON response path."""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1 import employees as employees_api
+from app.config import ResponseConfig
+from app.db.sqlite_store import get_employee_store
+from app.models.employee import Employee
+
+URL = "/api/v1/employees/search"
+
+
+def _get(client: TestClient, monkeypatch: pytest.MonkeyPatch, fast: bool, params: dict):
+    monkeypatch.setattr(employees_api, "RESPONSE_CONFIG", ResponseConfig(fast_json=fast))
+    return client.get(URL, params=params)
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"org_id": "org_a"},
+        {"org_id": "org_b", "limit": 1},
+        {"org_id": "org_default", "count": "none"},
+        {"org_id": "org_a", "name": "nobody"},
+        {"org_id": "org_fast"},
+    ],
+)
+def test_fast_path_matches_wire_format(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch, params: dict
+) -> None:
+    get_employee_store().upsert_employees(
+        [Employee("f1", "org_fast", "Zoë Ångström", "zoe@x.com", "R&D", "Hà Nội", "SE \"Lead\"")]
+    )
+    slow = _get(client, monkeypatch, False, params)
+    fast = _get(client, monkeypatch, True, params)
+    assert fast.status_code == slow.status_code == 200
+    assert fast.headers["content-type"] == slow.headers["content-type"]
+    assert fast.content == slow.content
+
+
+def test_openapi_schema_unchanged(client: TestClient) -> None:
+    schema = client.app.openapi()["paths"][URL]["get"]["responses"]["200"]
+    assert schema["content"]["application/json"]["schema"]["$ref"].endswith("EmployeeSearchResponse")
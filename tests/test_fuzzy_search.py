@@ -0,0 +1,107 @@
+"""Unit tests for typo-tolerant (fuzzy) name search."""
+import random
+
+from fastapi.testclient import TestClient
+
+from app.db.filters import SearchFilters
+from app.db.sqlite_store import SQLiteEmployeeStore, get_employee_store
+from app.models.employee import Employee
+from app.services.fuzzy_index import TrigramNameIndex, dice
+
+URL = "/api/v1/employees/search"
+
+
+def _fuzzy(client: TestClient, **params) -> dict:
+    r = client.get(URL, params={"match": "fuzzy", **params})
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def test_typos_still_match(client: TestClient) -> None:
+    data = _fuzzy(client, org_id="org_b", name="Jon Smtih")
+    assert [item["name"] for item in data["items"]] == ["John Smith"]
+    assert data["total"] == 1
+    assert data["next_cursor"] is None
+    # Plain substring matching finds nothing for the same input.
+    assert client.get(URL, params={"org_id": "org_b", "name": "Jon Smtih"}).json()["total"] == 0
+
+
+def test_ranked_by_score_then_id(client: TestClient) -> None:
+    data = _fuzzy(client, org_id="org_a", name="john")
+    names = [item["name"] for item in data["items"]]
+    assert names == ["John Doe", "Bob Johnson"]
+    assert dice("john", "John Doe") > dice("john", "Bob Johnson")
+
+    store = get_employee_store()
+    store.upsert_employees(
+        [
+            Employee("fz2", "org_fz", "Mara Lind", "m2@x.com", "Ops", "HN", "SE"),
+            Employee("fz1", "org_fz", "Mara Lind", "m1@x.com", "Ops", "DN", "SE"),
+        ]
+    )
+    data = _fuzzy(client, org_id="org_fz", name="mara lynd")
+    assert [item["email"] for item in data["items"]] == ["m1@x.com", "m2@x.com"]
+    data = _fuzzy(client, org_id="org_fz", name="mara lynd", location="HN", limit=1)
+    assert [item["email"] for item in data["items"]] == ["m2@x.com"]
+    assert data["total"] == 1 and not data["has_more"]
+    page = _fuzzy(client, org_id="org_fz", name="mara lynd", limit=1, offset=1, count="none")
+    assert [item["email"] for item in page["items"]] == ["m2@x.com"]
+    assert page["total"] is None
+
+
+def test_index_follows_other_processes_writes(client: TestClient) -> None:
+    assert _fuzzy(client, org_id="org_fz_ext", name="zedd")["total"] == 0
+    other = SQLiteEmployeeStore(get_employee_store().db_path)
+    try:
+        other.upsert_employees([Employee("fx1", "org_fz_ext", "Zed Ames", "z@x.com", "Ops", "HN", "SE")])
+    finally:
+        other.close()
+    data = _fuzzy(client, org_id="org_fz_ext", name="zedd ames")
+    assert [item["name"] for item in data["items"]] == ["Zed Ames"]
+
+
+def test_invalid_fuzzy_requests(client: TestClient) -> None:
+    assert client.get(URL, params={"org_id": "org_a", "match": "fuzzy"}).status_code == 400
+    params = {"org_id": "org_a", "name": "john", "match": "fuzzy", "cursor": "abc"}
+    assert client.get(URL, params=params).status_code == 400
+    body = {"searches": [{"org_id": "org_a", "name": "john", "match": "fuzzy"}]}
+    r = client.post("/api/v1/employees/search/batch", params={"org_id": "org_a"}, json=body)
+    assert r.status_code == 400
+
+
+def test_index_matches_brute_force() -> None:
+    rng = random.Random(5)
+    syllables = ["ka", "ri", "to", "mi", "jo", "han", "son", "smi", "th", "le", "an"]
+
+    def name() -> str:
+        return " ".join(
+            "".join(rng.choice(syllables) for _ in range(rng.randint(1, 3))).capitalize()
+            for _ in range(2)
+        )
+
+    employees = {
+        f"e{i:04d}": Employee(f"e{i:04d}", "o", name(), "", rng.choice("AB"), "L", "P")
+        for i in range(1500)
+    }
+    index = TrigramNameIndex.build((e, (e.id,)) for e in employees.values())
+    # Replace or remove enough employees to force a compaction.
+    for emp_id in list(employees)[:1200]:
+        if rng.random() < 0.5:
+            index.remove(emp_id)
+            del employees[emp_id]
+        else:
+            e = Employee(emp_id, "o", name(), "", rng.choice("AB"), "L", "P")
+            index.put(e, (emp_id,))
+            employees[emp_id] = e
+
+    for _ in range(100):
+        query, threshold, department = name(), rng.choice([0.3, 0.5]), rng.choice([None, "A"])
+        expected = sorted(
+            (-dice(query, e.name), e.id)
+            for e in employees.values()
+            if dice(query, e.name) >= threshold and department in (None, e.department)
+        )
+        limit = rng.choice([1, 10, 50])
+        rows, total = index.search(query, SearchFilters("o", department=department), limit, threshold)
+        assert total == len(expected)
+        assert [row[0] for row in rows] == [emp_id for _, emp_id in expected[:limit]]
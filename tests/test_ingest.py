@@ -0,0 +1,109 @@
+"""Unit tests for the streaming bulk loader."""
+import dataclasses
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from app.config import STORE_CONFIG
+from app.db.ingest import IngestError, ingest_file, main
+from app.db.sqlite_store import SearchFilters, SQLiteEmployeeStore, _init_db
+
+HEADER = "id,org_id,name,email,department,location,position\n"
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> SQLiteEmployeeStore:
+    path = tmp_path / "ingest.sqlite3"
+    _init_db(path, seed=False)
+    s = SQLiteEmployeeStore(path)
+    yield s
+    s.close()
+
+
+def _index_names(path: Path) -> set[str]:
+    conn = sqlite3.connect(path)
+    names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger')")}
+    conn.close()
+    return names
+
+
+def test_csv_load_in_batches_rebuilds_indexes(store: SQLiteEmployeeStore, tmp_path: Path) -> None:
+    src = tmp_path / "employees.csv"
+    src.write_text(
+        HEADER + "".join(f"i{n:03d},org_x,Person {n},p{n}@x.com,Eng,HN,SE\n" for n in range(250))
+    )
+    assert store.bulk_load([], batch_size=10).rows == 0
+
+    version = store.data_version
+    report = ingest_file(store, src, batch_size=100, rebuild_indexes=True)
+    assert (report.rows, report.orgs) == (250, 1)
+    assert report.rows_per_second > 0
+    assert store.data_version > version
+
+    names = _index_names(store.db_path)
+    assert {"idx_emp_org", "idx_emp_org_id", "idx_emp_org_dept_id", "employees_fts_ai"} <= names
+    conn = sqlite3.connect(store.db_path)
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0  # ANALYZE ran
+    conn.close()
+
+    employees, total = store.search(SearchFilters(org_id="org_x", name="son 12"))
+    assert total == 11  # Person 12, Person 120..129
+
+
+def test_indexes_are_only_rebuilt_for_large_loads(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """By default a load keeps its indexes until it outgrows the rebuild threshold."""
+    path = tmp_path / "auto.sqlite3"
+    _init_db(path, seed=True)
+    config = dataclasses.replace(STORE_CONFIG, bulk_rebuild_min_rows=100, bulk_rebuild_fraction=0)
+    store = SQLiteEmployeeStore(path, config)
+    drops = []
+    monkeypatch.setattr(store, "_drop_indexes", lambda conn: drops.append(conn))
+    try:
+        rows = [(f"a{n:03d}", "org_auto", f"Auto {n}", "a@x.com", "HR", "HN", "SE") for n in range(250)]
+        store.bulk_load(rows[:50], batch_size=50)
+        assert drops == []
+        assert store.search(SearchFilters(org_id="org_auto", name="auto 1"))[1] == 11
+        store.bulk_load(rows[50:], batch_size=50)
+        assert len(drops) == 1  # at the batch that crossed 100 rows
+        assert store.search(SearchFilters(org_id="org_auto", name="auto 1"))[1] == 111
+    finally:
+        store.close()
+
+
+def test_ndjson_upserts_existing_ids(store: SQLiteEmployeeStore, tmp_path: Path) -> None:
+    src = tmp_path / "employees.ndjson"
+    rows = [
+        {"id": "n1", "org_id": "org_y", "name": "Ann Lee", "email": "a@y.com",
+         "department": "HR", "location": "DN", "position": "SE"},
+        {"id": "n1", "org_id": "org_y", "name": "Ann Leeson", "email": "a@y.com",
+         "department": "HR", "location": "DN", "position": "Lead"},
+    ]
+    src.write_text("\n".join(json.dumps(r) for r in rows) + "\n\n")
+    report = ingest_file(store, src, rebuild_indexes=False)
+    assert report.rows == 2
+    employees, total = store.search(SearchFilters(org_id="org_y", name="leeson"))
+    assert total == 1 and employees[0].position == "Lead"
+
+
+def test_bad_record_is_reported(store: SQLiteEmployeeStore, tmp_path: Path) -> None:
+    src = tmp_path / "bad.csv"
+    src.write_text(HEADER + "b1,org_z,No Email,,HR,HN,SE\n")
+    with pytest.raises(IngestError, match="email"):
+        ingest_file(store, src, rebuild_indexes=True)
+    # Indexes come back even when the load fails.
+    assert "idx_emp_org_pos_id" in _index_names(store.db_path)
+
+
+def test_cli_loads_file(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    src = tmp_path / "cli.csv"
+    src.write_text(HEADER + "c1,org_cli,Cli Person,c@x.com,HR,HN,SE\n")
+    db = tmp_path / "cli.sqlite3"
+    assert main([str(src), "--db", str(db)]) == 0
+    assert "Loaded 1 rows for 1 orgs" in capsys.readouterr().out
+    conn = sqlite3.connect(db)
+    assert conn.execute("SELECT COUNT(*) FROM employees").fetchone()[0] == 1  # no demo seed
+    conn.close()
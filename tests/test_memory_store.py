@@ -0,0 +1,181 @@
+"""Unit tests for the in-memory columnar store engine."""
+import dataclasses
+import itertools
+import random
+from array import array
+from pathlib import Path
+
+import pytest
+
+from app.config import STORE_CONFIG
+from app.db.bitmaps import set_bits
+from app.db.filters import SearchFilters
+from app.db.memory_store import InMemoryEmployeeStore
+from app.db.sqlite_store import EMPLOYEE_COLUMNS, SQLiteEmployeeStore, _init_db
+from app.models.employee import Employee
+
+DEPARTMENTS = ["Engineering", "HR", "Finance", "Sales"]
+LOCATIONS = ["HN", "HCM", "DN"]
+POSITIONS = ["SE", "Lead", "Manager"]
+
+
+@pytest.fixture(scope="module")
+def stores(tmp_path_factory: pytest.TempPathFactory):
+    """A SQLite store and a memory store over the same random dataset."""
+    path = tmp_path_factory.mktemp("memory") / "employees.sqlite3"
+    _init_db(path, seed=False)
+    rng = random.Random(7)
+    rows = [
+        (
+            f"m{i:05d}",
+            f"org_{i % 3}",
+            f"{rng.choice(['John', 'Jane', 'Ann', 'Bob'])} {rng.choice(['Smith', 'Johnson', 'Lee'])}",
+            f"u{i}@example.com",
+            rng.choice(DEPARTMENTS),
+            rng.choice(LOCATIONS),
+            rng.choice(POSITIONS),
+        )
+        for i in range(600)
+    ]
+    sqlite = SQLiteEmployeeStore(path)
+    sqlite.bulk_load(rows)
+    memory = InMemoryEmployeeStore(path)
+    yield sqlite, memory
+    memory.close()
+    sqlite.close()
+
+
+def _filter_combinations() -> list[SearchFilters]:
+    out = []
+    for department, location, position, name in itertools.product(
+        [None, "Engineering", "Nope"], [None, "HN"], [None, "Lead"], [None, "john", "an"]
+    ):
+        out.append(
+            SearchFilters("org_1", name=name, department=department, location=location, position=position)
+        )
+    return out
+
+
+@pytest.mark.parametrize("filters", _filter_combinations())
+def test_results_match_sqlite(stores, filters: SearchFilters) -> None:
+    sqlite, memory = stores
+    for page in (filters, filters._replace(limit=7, offset=5), filters._replace(after_id="m00300")):
+        assert memory.search(page) == sqlite.search(page)
+    assert memory.facet_counts(filters)[1] == sqlite.search(filters._replace(limit=0))[1]
+
+
+def test_projection_and_count_skip(stores) -> None:
+    sqlite, memory = stores
+    filters = SearchFilters("org_2", department="HR", count_total=False)
+    assert memory.search_rows(filters, ("email", "id")) == sqlite.search_rows(filters, ("email", "id"))
+    assert memory.search_rows(filters, ("id",))[1] is None
+    with pytest.raises(ValueError):
+        memory.search_rows(filters, ("salary",))
+
+
+def test_facets_and_statistics_match_sqlite(stores) -> None:
+    sqlite, memory = stores
+    filters = SearchFilters("org_0", location="DN", name="smith")
+    assert memory.facet_counts(filters) == sqlite.facet_counts(filters)
+    assert memory.org_statistics("org_0") == sqlite.org_statistics("org_0")
+    assert memory.estimate_count(SearchFilters("org_0", department="HR")) == sqlite.search(
+        SearchFilters("org_0", department="HR")
+    )[1]
+
+
+def test_unknown_org_is_empty(stores) -> None:
+    _, memory = stores
+    assert memory.search(SearchFilters("org_missing")) == ([], 0)
+    assert list(memory.iter_rows(SearchFilters("org_missing"), EMPLOYEE_COLUMNS)) == []
+
+
+def test_writes_rebuild_touched_segments(tmp_path: Path) -> None:
+    path = tmp_path / "w.sqlite3"
+    _init_db(path)
+    memory = InMemoryEmployeeStore(path)
+    try:
+        assert [e.id for e in memory.search(SearchFilters("org_b", department="HR"))[0]] == []
+        # Move e1 from org_a to org_b: both orgs' segments must be rebuilt.
+        assert memory.search(SearchFilters("org_a"))[1] == 4
+        memory.upsert_employees([Employee("e1", "org_b", "John Doe", "j@x.com", "HR", "HN", "SE")])
+        assert [e.id for e in memory.search(SearchFilters("org_b", department="HR"))[0]] == ["e1"]
+        assert memory.search(SearchFilters("org_a"))[1] == 3
+    finally:
+        memory.close()
+
+
+def test_rare_values_are_stored_sparse(tmp_path: Path) -> None:
+    path = tmp_path / "sparse.sqlite3"
+    _init_db(path, seed=False)
+    rng = random.Random(11)
+    # Half the rows share one position; the rest spread over 100 rare ones.
+    rows = [
+        (
+            f"s{i:04d}",
+            "org_s",
+            f"Name {i % 50}",
+            f"s{i}@example.com",
+            rng.choice(DEPARTMENTS),
+            "HN",
+            "SE" if i % 2 else f"P{rng.randrange(100):02d}",
+        )
+        for i in range(800)
+    ]
+    sqlite = SQLiteEmployeeStore(path)
+    sqlite.bulk_load(rows)
+    memory = InMemoryEmployeeStore(path)
+    try:
+        dim = memory._segment("org_s").dimensions["position"]
+        assert isinstance(dim.rows[dim.code_of["SE"]], int)
+        rare = [value for value in dim.values if value != "SE"]
+        assert all(isinstance(dim.rows[dim.code_of[value]], array) for value in rare)
+
+        for filters in (
+            SearchFilters("org_s", sort="position", limit=500),
+            SearchFilters("org_s", sort="position", order="desc", department="HR", limit=500),
+            SearchFilters("org_s", position=rare[3], name="name 1"),
+            SearchFilters("org_s", sort="position", after_key=rare[5], after_id="s0400"),
+            SearchFilters("org_s", sort="position", order="desc", after_key=rare[5], after_id="s0400"),
+        ):
+            assert memory.search(filters) == sqlite.search(filters)
+            assert memory.facet_counts(filters) == sqlite.facet_counts(filters)
+        assert memory.org_statistics("org_s") == sqlite.org_statistics("org_s")
+    finally:
+        memory.close()
+        sqlite.close()
+
+
+def test_segments_are_evicted_least_recently_used(tmp_path: Path) -> None:
+    path = tmp_path / "lru.sqlite3"
+    _init_db(path, seed=False)
+    sqlite = SQLiteEmployeeStore(path)
+    sqlite.bulk_load(
+        (f"l{i:03d}", f"org_{i % 3}", f"Name {i}", f"l{i}@x.com", "HR", "HN", "SE")
+        for i in range(30)
+    )
+    config = dataclasses.replace(STORE_CONFIG, memory_max_orgs=2, memory_max_rows=25)
+    memory = InMemoryEmployeeStore(path, config)
+    try:
+        for org_id in ("org_0", "org_1", "org_0", "org_2"):
+            assert memory.search(SearchFilters(org_id))[1] == 10
+        # org_1 was the least recently used when org_2 came in.
+        assert list(memory._segments) == ["org_0", "org_2"]
+        assert memory.stats() == {"orgs": 2, "rows": 20, "evictions": 1}
+
+        # Row-bounded: two 10-row orgs fit in 15 rows only one at a time.
+        memory.close()
+        memory = InMemoryEmployeeStore(path, dataclasses.replace(config, memory_max_rows=15))
+        memory.warm("org_0")
+        memory.warm("org_1")
+        assert list(memory._segments) == ["org_1"]
+        assert memory.search(SearchFilters("org_0"))[1] == 10
+    finally:
+        memory.close()
+        sqlite.close()
+
+
+def test_set_bits_skips_whole_words() -> None:
+    mask = (1 << 3) | (1 << 64) | (1 << 70) | (1 << 200)
+    assert list(set_bits(mask, 201)) == [3, 64, 70, 200]
+    assert list(set_bits(mask, 201, skip=2)) == [70, 200]
+    assert list(set_bits(0, 0)) == []
@@ -0,0 +1,101 @@
+"""Unit tests for per-stage search timings, /metrics and Server-Timing."""
+import dataclasses
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import metrics
+from app.config import METRICS_CONFIG
+from app.db.filters import SearchFilters
+from app.metrics import SearchMetrics, filter_shape
+from app.middleware import timing
+
+URL = "/api/v1/employees/search"
+
+
+def test_stages_are_noops_outside_a_request() -> None:
+    assert metrics.current_timings() is None
+    with metrics.stage("count"):
+        pass
+    metrics.start_stage("serialize")
+    metrics.label_request("org_a", SearchFilters("org_a"))
+    assert metrics.current_timings() is None
+
+
+def test_stages_accumulate_and_follow_executor_threads() -> None:
+    timings, token = metrics.begin_request()
+    try:
+        with metrics.stage("acquire"):
+            pass
+        with metrics.stage("acquire"):
+            pass
+
+        def work() -> None:
+            with metrics.stage("page"):
+                pass
+
+        thread = threading.Thread(target=metrics.propagate(work))
+        thread.start()
+        thread.join()
+    finally:
+        metrics.end_request(timings, token, 200)
+    assert set(timings.stages) == {"acquire", "queue", "page"}
+    assert all(seconds >= 0 for seconds in timings.stages.values())
+    assert metrics.current_timings() is None
+
+
+def test_filter_shape() -> None:
+    assert filter_shape(SearchFilters("org_a")) == "none"
+    assert filter_shape(SearchFilters("org_a", name="jo", location="HN")) == "name+location"
+
+
+def test_histogram_rendering() -> None:
+    histograms = SearchMetrics(buckets=(0.001, 0.01), max_org_labels=1)
+    histograms.observe("org_a", "none", {"page": 0.0005, "total": 0.02}, 200)
+    histograms.observe("org_a", "none", {"page": 0.005}, 504)
+    histograms.observe('org_"b"', "none", {"page": 0.5}, 200)  # over the org label limit
+    text = histograms.render()
+    assert "# TYPE search_stage_duration_seconds histogram" in text
+    page = 'stage="page",org="org_a",shape="none"'
+    assert f'search_stage_duration_seconds_bucket{{{page},le="0.001"}} 1' in text
+    assert f'search_stage_duration_seconds_bucket{{{page},le="0.01"}} 2' in text
+    assert f'search_stage_duration_seconds_bucket{{{page},le="+Inf"}} 2' in text
+    assert f"search_stage_duration_seconds_count{{{page}}} 2" in text
+    assert 'org="other"' in text and "org_\\\"b\\\"" not in text
+    assert 'search_responses_total{org="org_a",shape="none",status="504"} 1' in text
+
+
+def test_search_stages_are_exported(client: TestClient) -> None:
+    params = {"org_id": "org_b", "department": "Engineering", "limit": 13}
+    assert client.get(URL, params=params).status_code == 200
+    text = client.get("/metrics").text
+    for stage in ("rate_limit", "queue", "acquire", "count", "page", "project", "serialize"):
+        labels = f'stage="{stage}",org="org_b",shape="department"'
+        assert f"search_stage_duration_seconds_count{{{labels}}}" in text, stage
+
+
+def test_batch_searches_are_measured_like_searches(client: TestClient) -> None:
+    body = {"searches": [{"org_id": "org_b", "department": "Engineering"}]}
+    r = client.post(URL + "/batch", params={"org_id": "org_b"}, json=body)
+    assert r.status_code == 200
+    text = client.get("/metrics").text
+    for stage in ("rate_limit", "queue", "total"):
+        labels = f'stage="{stage}",org="org_b",shape="batch"'
+        assert f"search_stage_duration_seconds_count{{{labels}}}" in text, stage
+    assert 'search_responses_total{org="org_b",shape="batch",status="200"}' in text
+
+
+def test_server_timing_header(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    params = {"org_id": "org_a", "limit": 17}
+    assert "server-timing" not in client.get(URL, params=params).headers
+
+    monkeypatch.setattr(
+        timing, "METRICS_CONFIG", dataclasses.replace(METRICS_CONFIG, server_timing=True)
+    )
+    header = client.get(URL, params={**params, "offset": 1}).headers["server-timing"]
+    stages = dict(part.split(";dur=") for part in header.split(", "))
+    assert {"rate_limit", "count", "page", "serialize", "total"} <= set(stages)
+    assert float(stages["total"]) >= float(stages["page"])
+    # Only labelled (search) requests get the header.
+    assert "server-timing" not in client.get("/api/v1/admin/search-cache").headers
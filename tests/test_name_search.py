@@ -0,0 +1,97 @@
+"""Unit tests for the trigram-indexed name filter."""
+from pathlib import Path
+
+import pytest
+
+from app.db.sqlite_store import SearchFilters, SQLiteEmployeeStore, _get_connection, _init_db
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> SQLiteEmployeeStore:
+    path = tmp_path / "names.sqlite3"
+    _init_db(path)
+    s = SQLiteEmployeeStore(path)
+    yield s
+    s.close()
+
+
+def _names(store: SQLiteEmployeeStore, **kwargs) -> list[str]:
+    employees, total = store.search(SearchFilters(**kwargs))
+    assert total == len(employees)
+    return [e.name for e in employees]
+
+
+def test_fts_index_is_available(store: SQLiteEmployeeStore) -> None:
+    assert store.has_fts
+
+
+def test_substring_match_is_case_insensitive(store: SQLiteEmployeeStore) -> None:
+    """Matches inside words, regardless of case, within the org only."""
+    assert _names(store, org_id="org_a", name="OHNS") == ["Bob Johnson"]
+    assert _names(store, org_id="org_a", name="john") == ["John Doe", "Bob Johnson"]
+    assert _names(store, org_id="org_b", name="john") == ["John Smith"]
+
+
+def test_short_terms_fall_back_to_like(store: SQLiteEmployeeStore) -> None:
+    """Terms shorter than a trigram still do partial matching."""
+    assert _names(store, org_id="org_a", name="Jo") == ["John Doe", "Bob Johnson"]
+
+
+def test_name_combines_with_exact_filters(store: SQLiteEmployeeStore) -> None:
+    assert _names(store, org_id="org_a", name="john", department="Finance") == []
+    assert _names(store, org_id="org_a", name="john", position="Lead") == ["Bob Johnson"]
+
+
+def test_index_follows_writes(store: SQLiteEmployeeStore) -> None:
+    """Triggers keep the FTS table in sync with inserts, updates and deletes."""
+    conn = _get_connection(store.db_path)
+    conn.execute(
+        "INSERT INTO employees VALUES ('e8', 'org_a', 'Johanna Berg', 'jb@org-a.com', 'HR', 'HN', 'SE')"
+    )
+    conn.commit()
+    assert _names(store, org_id="org_a", name="hanna") == ["Johanna Berg"]
+
+    conn.execute("UPDATE employees SET name = 'Anna Berg' WHERE id = 'e8'")
+    conn.commit()
+    assert _names(store, org_id="org_a", name="hanna") == []
+    assert _names(store, org_id="org_a", name="anna b") == ["Anna Berg"]
+
+    conn.execute("DELETE FROM employees WHERE id = 'e8'")
+    conn.commit()
+    conn.close()
+    assert _names(store, org_id="org_a", name="anna b") == []
+
+
+def test_index_follows_moves_between_orgs(store: SQLiteEmployeeStore) -> None:
+    conn = _get_connection(store.db_path)
+    conn.execute("UPDATE employees SET org_id = 'org_b' WHERE id = 'e3'")
+    conn.commit()
+    conn.close()
+    assert _names(store, org_id="org_a", name="john") == ["John Doe"]
+    assert _names(store, org_id="org_b", name="john") == ["Bob Johnson", "John Smith"]
+
+
+def _vm_steps(store: SQLiteEmployeeStore, filters: SearchFilters) -> int:
+    where_sql, params = store._where(filters)
+    steps = 0
+
+    def step() -> int:
+        nonlocal steps
+        steps += 1
+        return 0
+
+    conn = _get_connection(store.db_path)
+    conn.set_progress_handler(step, 1)
+    conn.execute(f"SELECT id FROM employees WHERE {where_sql}", params).fetchall()
+    conn.close()
+    return steps
+
+
+def test_match_reads_only_the_orgs_rows(store: SQLiteEmployeeStore) -> None:
+    """Other orgs' matches cost nothing: the match is limited to the org's rowid range."""
+    store.bulk_load(
+        (f"x{i}", "org_big", f"John {i}", f"j{i}@big.com", "HR", "HN", "SE") for i in range(5000)
+    )
+    assert _names(store, org_id="org_a", name="john") == ["John Doe", "Bob Johnson"]
+    # Unscoped, the 5000 other-org matches take over 100k steps.
+    assert _vm_steps(store, SearchFilters(org_id="org_a", name="john")) < 5000
@@ -1,4 +1,6 @@
 """Unit tests for rate limiting."""
+import time
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -64,3 +66,189 @@ def test_non_search_endpoint_not_rate_limited(client: TestClient) -> None:
     # /docs might redirect or return 200
     r = client.get("/docs")
     assert r.status_code in (200, 307)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_gcra_allows_burst_then_refills() -> None:
+    """GCRA admits max_requests at once, then one per window/max_requests."""
+    from app.middleware.rate_limit import GCRARateLimiter
+
+    clock = FakeClock()
+    limiter = GCRARateLimiter(max_requests=3, window_seconds=60, clock=clock)
+    assert [limiter.is_allowed("org:a") for _ in range(4)] == [True, True, True, False]
+    assert limiter.is_allowed("org:b")  # keys are independent
+
+    clock.now += 19
+    assert not limiter.is_allowed("org:a")
+    clock.now += 1  # one interval (20s) later a single slot is free again
+    assert limiter.is_allowed("org:a")
+    assert not limiter.is_allowed("org:a")
+
+
+def test_gcra_sweep_evicts_idle_keys() -> None:
+    from app.middleware.rate_limit import GCRARateLimiter
+
+    clock = FakeClock()
+    limiter = GCRARateLimiter(max_requests=2, window_seconds=60, shards=4, clock=clock)
+    for i in range(100):
+        limiter.is_allowed(f"ip:10.0.0.{i}")
+    assert len(limiter) == 100
+    assert limiter.sweep() == 0
+    clock.now += 30
+    assert limiter.sweep() == 100
+    assert len(limiter) == 0
+
+
+def test_sliding_window_sweep_evicts_idle_keys() -> None:
+    from app.middleware import rate_limit as rl_mod
+
+    limiter = rl_mod.SlidingWindowRateLimiter(max_requests=2, window_seconds=0)
+    limiter.is_allowed("ip:1.2.3.4")
+    time.sleep(0.001)
+    assert limiter.sweep() == 1
+    assert len(limiter) == 0
+
+
+def test_create_rate_limiter_from_config() -> None:
+    from app.config import RateLimitConfig
+    from app.middleware.rate_limit import GCRARateLimiter, SlidingWindowRateLimiter, create_rate_limiter
+
+    assert isinstance(create_rate_limiter(RateLimitConfig()), SlidingWindowRateLimiter)
+    gcra = create_rate_limiter(RateLimitConfig(algorithm="gcra", requests_per_minute=5))
+    assert isinstance(gcra, GCRARateLimiter) and gcra.max_requests == 5
+    with pytest.raises(ValueError):
+        create_rate_limiter(RateLimitConfig(algorithm="token_bucket"))
+
+
+def test_gcra_limiter_returns_429(client: TestClient) -> None:
+    from app.middleware import rate_limit as rl_mod
+
+    original = rl_mod._limiter
+    rl_mod._limiter = rl_mod.GCRARateLimiter(max_requests=2, window_seconds=60)
+    try:
+        for _ in range(2):
+            assert client.get("/api/v1/employees/search", params={"org_id": "org_gcra"}).status_code == 200
+        assert client.get("/api/v1/employees/search", params={"org_id": "org_gcra"}).status_code == 429
+    finally:
+        rl_mod._limiter = original
+
+
+def test_sqlite_backend_shares_quota_between_workers(tmp_path) -> None:
+    """Two limiter instances on one file behave like one quota (e.g. two workers)."""
+    from app.middleware.shared_rate_limit import SQLiteRateLimiter
+
+    clock = FakeClock()
+    path = tmp_path / "ratelimit.sqlite3"
+    worker_1 = SQLiteRateLimiter(max_requests=3, window_seconds=60, db_path=path, clock=clock)
+    worker_2 = SQLiteRateLimiter(max_requests=3, window_seconds=60, db_path=path, clock=clock)
+    assert worker_1.is_allowed("org:a")
+    assert worker_2.is_allowed("org:a")
+    assert worker_1.is_allowed("org:a")
+    assert not worker_2.is_allowed("org:a")
+    assert worker_2.is_allowed("org:b")
+
+    clock.now += 20
+    assert worker_2.is_allowed("org:a")
+    assert not worker_1.is_allowed("org:a")
+
+    # State outlives the instance, like a restarted worker.
+    restarted = SQLiteRateLimiter(max_requests=3, window_seconds=60, db_path=path, clock=clock)
+    assert not restarted.is_allowed("org:a")
+
+    clock.now += 60
+    assert restarted.sweep() == 2
+    assert len(restarted) == 0
+
+
+def test_create_shared_backend_from_config(tmp_path) -> None:
+    from app.config import RateLimitConfig
+    from app.middleware.rate_limit import create_rate_limiter
+    from app.middleware.shared_rate_limit import SQLiteRateLimiter
+
+    path = str(tmp_path / "shared.sqlite3")
+    limiter = create_rate_limiter(RateLimitConfig(backend="sqlite", algorithm="gcra", shared_db_path=path))
+    assert isinstance(limiter, SQLiteRateLimiter)
+    with pytest.raises(ValueError):
+        create_rate_limiter(RateLimitConfig(backend="sqlite", shared_db_path=path))
+    with pytest.raises(ValueError):
+        create_rate_limiter(RateLimitConfig(backend="redis"))
+
+
+@pytest.mark.parametrize("backend", ["sliding_window", "gcra", "sqlite"])
+def test_weighted_requests_draw_from_the_same_quota(backend: str, tmp_path) -> None:
+    """A request with cost n is admitted only if n slots are free, and uses all n."""
+    from app.middleware.rate_limit import GCRARateLimiter, SlidingWindowRateLimiter
+    from app.middleware.shared_rate_limit import SQLiteRateLimiter
+
+    clock = FakeClock()
+    limiter = {
+        "sliding_window": lambda: SlidingWindowRateLimiter(max_requests=4, window_seconds=60),
+        "gcra": lambda: GCRARateLimiter(max_requests=4, window_seconds=60, clock=clock),
+        "sqlite": lambda: SQLiteRateLimiter(
+            max_requests=4, window_seconds=60, db_path=tmp_path / "rl.sqlite3", clock=clock
+        ),
+    }[backend]()
+    assert not limiter.is_allowed("org:a", 5)  # more than the whole quota
+    assert limiter.is_allowed("org:a", 3)
+    assert not limiter.is_allowed("org:a", 2)
+    assert limiter.is_allowed("org:a", 1)
+    assert not limiter.is_allowed("org:a")
+
+
+@pytest.mark.parametrize("fail_open", [True, False])
+def test_sqlite_backend_gives_up_on_a_locked_database(fail_open: bool, tmp_path) -> None:
+    """A check waits only the busy timeout, then admits or rejects per config."""
+    import sqlite3
+
+    from app.middleware.shared_rate_limit import SQLiteRateLimiter
+
+    path = tmp_path / "locked.sqlite3"
+    limiter = SQLiteRateLimiter(
+        max_requests=3, db_path=path, busy_timeout_seconds=0.05, fail_open=fail_open
+    )
+    assert limiter.is_allowed("org:a")
+    holder = sqlite3.connect(path, isolation_level=None)
+    holder.execute("BEGIN EXCLUSIVE")
+    try:
+        started = time.monotonic()
+        assert limiter.is_allowed("org:a") is fail_open
+        assert time.monotonic() - started < 1
+        assert limiter.errors == 1
+    finally:
+        holder.execute("ROLLBACK")
+        holder.close()
+    assert limiter.is_allowed("org:a")
+
+
+def test_sqlite_backend_checks_run_off_the_event_loop(client: TestClient, tmp_path) -> None:
+    import threading
+
+    from app.middleware import rate_limit as rl_mod
+    from app.middleware.shared_rate_limit import SQLiteRateLimiter
+
+    threads = []
+
+    class RecordingLimiter(SQLiteRateLimiter):
+        def is_allowed(self, key: str, cost: int = 1) -> bool:
+            threads.append(threading.current_thread().name)
+            return super().is_allowed(key, cost)
+
+    original = rl_mod._limiter
+    rl_mod._limiter = RecordingLimiter(max_requests=1, db_path=tmp_path / "rl.sqlite3")
+    try:
+        params = {"org_id": "org_shared_loop"}
+        assert client.get("/api/v1/employees/search", params=params).status_code == 200
+        assert client.get("/api/v1/employees/search", params=params).status_code == 429
+        body = {"searches": [{"org_id": "org_shared_loop"}]}
+        assert client.post("/api/v1/employees/search/batch", params=params, json=body).status_code == 429
+    finally:
+        rl_mod._limiter = original
+    assert len(threads) == 3
+    assert all(name.startswith("AnyIO worker thread") for name in threads)
@@ -0,0 +1,71 @@
+"""Unit tests for the search result cache."""
+from fastapi.testclient import TestClient
+
+from app.db.sqlite_store import get_employee_store
+from app.models.employee import Employee
+from app.services.search_cache import SearchResultCache
+
+URL = "/api/v1/employees/search"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_eviction_by_entries() -> None:
+    cache = SearchResultCache(max_entries=2)
+    cache.put("a", 1, 10)
+    cache.put("b", 2, 10)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.put("c", 3, 10)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_memory_cap() -> None:
+    cache = SearchResultCache(max_bytes=100)
+    cache.put("a", 1, 60)
+    cache.put("b", 2, 60)
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 60
+    cache.put("huge", 3, 101)
+    assert cache.get("huge") is None
+
+
+def test_ttl_expiry() -> None:
+    clock = FakeClock()
+    cache = SearchResultCache(ttl_seconds=5, clock=clock)
+    cache.put("a", 1, 10)
+    clock.now = 4.9
+    assert cache.get("a") == 1
+    clock.now = 5.0
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["expirations"] == 1
+    assert stats["entries"] == 0
+
+
+def test_repeated_search_is_served_from_cache(client: TestClient) -> None:
+    params = {"org_id": "org_a", "department": "HR"}
+    first = client.get(URL, params=params).json()
+    before = client.get("/api/v1/admin/search-cache").json()
+    assert client.get(URL, params=params).json() == first
+    after = client.get("/api/v1/admin/search-cache").json()
+    assert after["hits"] == before["hits"] + 1
+
+
+def test_write_invalidates_cached_pages(client: TestClient) -> None:
+    params = {"org_id": "org_cache", "name": "Cache"}
+    assert client.get(URL, params=params).json()["total"] == 0
+
+    get_employee_store().upsert_employees(
+        [Employee("c1", "org_cache", "Cache Person", "c@x.com", "HR", "HN", "SE")]
+    )
+    data = client.get(URL, params={**params, "name": "cache"}).json()
+    assert data["total"] == 1
+    assert data["items"][0]["name"] == "Cache Person"
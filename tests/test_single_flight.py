@@ -0,0 +1,189 @@
+"""Unit tests for request coalescing of identical concurrent searches."""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.schemas.employee import EmployeeSearchRequest
+from app.services import employee_search
+from app.services.employee_search import EmployeeSearchService
+from app.services.single_flight import SingleFlight
+
+
+def _wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+class _Gate:
+    """Work that blocks until released, counting how often it ran."""
+
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.calls = 0
+
+    def __call__(self, value: object) -> object:
+        self.calls += 1
+        assert self.release.wait(5)
+        return value
+
+
+def test_concurrent_threads_share_one_execution() -> None:
+    flight, gate = SingleFlight(), _Gate()
+    result = object()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(flight.do, "k", gate, result) for _ in range(8)]
+        _wait_for(lambda: flight.stats()["coalesced"] == 7)
+        gate.release.set()
+        assert all(f.result() is result for f in futures)
+    assert gate.calls == 1
+    assert flight.stats() == {"in_flight": 0, "executions": 1, "coalesced": 7}
+
+
+def test_distinct_keys_do_not_coalesce() -> None:
+    flight = SingleFlight()
+    assert flight.do("a", str.upper, "x") == "X"
+    assert flight.do("a", str.upper, "y") == "Y"  # not running any more
+    assert flight.stats()["coalesced"] == 0
+
+
+def test_async_tasks_and_threads_join_one_flight() -> None:
+    flight, gate = SingleFlight(), _Gate()
+    executor = ThreadPoolExecutor(max_workers=2)
+
+    async def run(fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+    async def main() -> list[str]:
+        leader = asyncio.create_task(flight.do_async("k", run, gate, "page"))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(flight.do_async("k", run, gate, "page")) for _ in range(5)]
+        thread = asyncio.create_task(asyncio.to_thread(flight.do, "k", gate, "page"))
+        await asyncio.to_thread(_wait_for, lambda: flight.stats()["coalesced"] == 6)
+        gate.release.set()
+        return await asyncio.gather(leader, *waiters, thread)
+
+    try:
+        assert asyncio.run(main()) == ["page"] * 7
+    finally:
+        executor.shutdown()
+    assert gate.calls == 1
+
+
+def test_cancelled_leader_still_serves_waiters() -> None:
+    flight, gate = SingleFlight(), _Gate()
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    async def run(fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+    async def main() -> str:
+        leader = asyncio.create_task(flight.do_async("k", run, gate, "page"))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flight.do_async("k", run, gate, "page"))
+        await asyncio.to_thread(_wait_for, lambda: gate.calls == 1)
+        leader.cancel()
+        gate.release.set()
+        return await waiter
+
+    try:
+        assert asyncio.run(main()) == "page"
+    finally:
+        executor.shutdown()
+
+
+def test_cancelled_waiter_does_not_cancel_the_flight() -> None:
+    flight, gate = SingleFlight(), _Gate()
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    async def run(fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+    async def main() -> list:
+        leader = asyncio.create_task(flight.do_async("k", run, gate, "page"))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(flight.do_async("k", run, gate, "page")) for _ in range(3)]
+        await asyncio.to_thread(_wait_for, lambda: gate.calls == 1)
+        waiters[0].cancel()
+        await asyncio.sleep(0)
+        gate.release.set()
+        return await asyncio.gather(leader, *waiters, return_exceptions=True)
+
+    try:
+        leader, cancelled, *others = asyncio.run(main())
+    finally:
+        executor.shutdown()
+    assert isinstance(cancelled, asyncio.CancelledError)
+    assert [leader, *others] == ["page"] * 3
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_errors_reach_every_waiter_and_release_the_key() -> None:
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fail() -> None:
+        assert release.wait(5)
+        raise RuntimeError("boom")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(flight.do, "k", fail) for _ in range(3)]
+        _wait_for(lambda: flight.stats()["coalesced"] == 2)
+        release.set()
+        for f in futures:
+            with pytest.raises(RuntimeError, match="boom"):
+                f.result()
+    assert flight.stats()["in_flight"] == 0
+    assert flight.do("k", int, "3") == 3
+
+
+def test_refused_submission_fails_waiters() -> None:
+    flight = SingleFlight()
+
+    class Refused(Exception):
+        pass
+
+    async def run(fn, *args):
+        await asyncio.sleep(0.01)  # let the waiter join first
+        raise Refused()
+
+    async def main() -> list:
+        leader = asyncio.create_task(flight.do_async("k", run, int, "1"))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flight.do_async("k", run, int, "1"))
+        return await asyncio.gather(leader, waiter, return_exceptions=True)
+
+    assert [type(r) for r in asyncio.run(main())] == [Refused, Refused]
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_identical_service_searches_coalesce(monkeypatch: pytest.MonkeyPatch) -> None:
+    gate = _Gate()
+    real = employee_search._EXECUTORS["substring"]
+
+    def slow(store, filters, count):
+        gate(None)
+        return real(store, filters, count)
+
+    monkeypatch.setitem(employee_search._EXECUTORS, "substring", slow)
+    before = EmployeeSearchService.coalescing_stats()
+    req = EmployeeSearchRequest(org_id="org_b", department="Engineering", sort="name")
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(EmployeeSearchService.search, req) for _ in range(4)]
+        coalesced = before["coalesced"] + 3
+        _wait_for(lambda: EmployeeSearchService.coalescing_stats()["coalesced"] == coalesced)
+        gate.release.set()
+        responses = [f.result() for f in futures]
+    assert gate.calls == 1
+    assert all(r is responses[0] for r in responses)
+    assert [i["name"] for i in responses[0].items] == ["Charlie Wilson", "John Smith"]
+
+
+def test_coalescing_stats_endpoint(client) -> None:
+    r = client.get("/api/v1/admin/search-coalescing")
+    assert r.status_code == 200
+    assert set(r.json()) == {"in_flight", "executions", "coalesced"}
@@ -0,0 +1,95 @@
+"""Unit tests for the slow-query log and its EXPLAIN QUERY PLAN capture."""
+import dataclasses
+import sqlite3
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import STORE_CONFIG
+from app.db.filters import SearchFilters
+from app.db.slow_queries import explain, is_full_scan, normalize_sql
+from app.db.sqlite_store import SQLiteEmployeeStore, _init_db, get_employee_store
+
+
+def _store(tmp_path: Path, **config) -> SQLiteEmployeeStore:
+    _init_db(tmp_path / "slow.sqlite3", seed=True)
+    return SQLiteEmployeeStore(
+        tmp_path / "slow.sqlite3", dataclasses.replace(STORE_CONFIG, **config)
+    )
+
+
+def test_queries_over_the_threshold_are_logged_with_their_plan(tmp_path: Path) -> None:
+    store = _store(tmp_path, slow_query_ms=0)
+    try:
+        store.search(SearchFilters("org_a", department="Engineering", limit=5))
+        page, count = store.slow_queries.entries()
+    finally:
+        store.close()
+    assert (page.kind, count.kind) == ("page", "count")
+    assert page.sql.startswith("SELECT id, org_id, name") and "\n" not in page.sql
+    assert page.param_types == ("str", "str", "int", "int")
+    assert "Engineering" not in repr(page)
+    assert page.rows == 2 and count.rows == 1
+    assert page.duration_ms >= 0
+    assert any("USING INDEX idx_emp_org_dept_id" in line for line in page.plan)
+    assert not page.full_scan
+
+
+def test_log_is_a_bounded_ring_buffer(tmp_path: Path) -> None:
+    store = _store(tmp_path, slow_query_ms=0, slow_query_log_size=3)
+    try:
+        for org_id in ("org_a", "org_b"):
+            store.search(SearchFilters(org_id))
+        assert store.slow_queries.stats() == {"recorded": 4, "entries": 3}
+        assert store.slow_queries.entries()[0].kind == "page"  # newest first
+    finally:
+        store.close()
+
+
+def test_disabled_log_records_nothing(tmp_path: Path) -> None:
+    store = _store(tmp_path, slow_query_ms=None)
+    try:
+        store.search(SearchFilters("org_a"))
+        assert store.slow_queries.stats() == {"recorded": 0, "entries": 0}
+    finally:
+        store.close()
+
+
+def test_full_scans_are_flagged(tmp_path: Path) -> None:
+    _init_db(tmp_path / "plan.sqlite3", seed=True)
+    conn = sqlite3.connect(tmp_path / "plan.sqlite3")
+    try:
+        scan = explain(conn, "SELECT id FROM employees WHERE email = ?", ["a@b.c"])
+        seek = explain(conn, "SELECT id FROM employees WHERE org_id = ?", ["org_a"])
+    finally:
+        conn.close()
+    assert is_full_scan(scan)
+    assert not is_full_scan(seek)
+    assert not is_full_scan(["SCAN employees_fts VIRTUAL TABLE INDEX 0:M3"])
+    assert not is_full_scan(["SCAN employees USING COVERING INDEX idx_emp_org_id"])
+
+
+def test_normalize_sql() -> None:
+    sql = "SELECT *\n  FROM employees\n  WHERE department IN (?, ?,?) AND org_id = ?"
+    assert normalize_sql(sql) == (
+        "SELECT * FROM employees WHERE department IN (?, ...) AND org_id = ?"
+    )
+
+
+def test_admin_endpoint(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    log = get_employee_store().slow_queries
+    monkeypatch.setattr(log, "threshold", 0.0)
+    params = {"org_id": "org_b", "name": "jo", "limit": 11}
+    assert client.get("/api/v1/employees/search", params=params).status_code == 200
+    body = client.get("/api/v1/admin/slow-queries", params={"limit": 2}).json()
+    assert body["threshold_ms"] == STORE_CONFIG.slow_query_ms
+    assert body["recorded"] >= 2
+    page = body["queries"][0]
+    assert page["kind"] == "page" and "LIKE ?" in page["sql"]
+    assert set(page) == {
+        "timestamp", "kind", "sql", "param_types", "rows", "duration_ms", "plan", "full_scan",
+        "aborted",
+    }
+    only_scans = client.get("/api/v1/admin/slow-queries", params={"full_scan_only": True})
+    assert all(q["full_scan"] for q in only_scans.json()["queries"])
@@ -0,0 +1,168 @@
+"""Unit tests for sorted search and sorted keyset pagination."""
+import random
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.filters import SORT_FIELDS, SORT_ORDERS, SearchFilters
+from app.db.memory_store import InMemoryEmployeeStore
+from app.db.sqlite_store import SQLiteEmployeeStore, _init_db, _select_list
+
+URL = "/api/v1/employees/search"
+
+SORT_INDEXES = {
+    "id": "idx_emp_org_id",
+    "name": "idx_emp_org_name_id",
+    "department": "idx_emp_org_dept_id",
+    "location": "idx_emp_org_loc_id",
+    "position": "idx_emp_org_pos_id",
+}
+
+
+@pytest.fixture(scope="module")
+def stores(tmp_path_factory: pytest.TempPathFactory):
+    """A SQLite store and a memory store over the same random dataset (with ties)."""
+    path = tmp_path_factory.mktemp("sorting") / "employees.sqlite3"
+    _init_db(path, seed=False)
+    rng = random.Random(11)
+    rows = [
+        (
+            f"s{i:05d}",
+            f"org_{i % 2}",
+            f"{rng.choice(['Ann', 'Bob', 'Cy', 'Dee'])} {rng.choice(['Lee', 'Ng', 'Ortiz'])}",
+            f"u{i}@example.com",
+            rng.choice(["Engineering", "HR", "Sales"]),
+            rng.choice(["HN", "HCM", "DN"]),
+            rng.choice(["SE", "Lead"]),
+        )
+        for i in range(2000)
+    ]
+    sqlite = SQLiteEmployeeStore(path)
+    sqlite.bulk_load(rows)
+    memory = InMemoryEmployeeStore(path)
+    yield sqlite, memory
+    memory.close()
+    sqlite.close()
+
+
+def _page_plan(store: SQLiteEmployeeStore, filters: SearchFilters) -> list[str]:
+    """EXPLAIN QUERY PLAN details of the page query `search_rows` runs for `filters`."""
+    statements = []
+    conn = sqlite3.connect(store.db_path)
+    try:
+        conn.set_trace_callback(statements.append)
+        select_sql = _select_list(("name", "id"))
+        store._search_page(conn.cursor(), filters._replace(count_total=False), select_sql)
+        conn.set_trace_callback(None)
+        (page_sql,) = [sql for sql in statements if "ORDER BY" in sql]
+        return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {page_sql}")]
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize("order", SORT_ORDERS)
+@pytest.mark.parametrize("sort", SORT_FIELDS)
+def test_each_sort_is_index_backed(stores, sort: str, order: str) -> None:
+    sqlite, _ = stores
+    first = SearchFilters("org_1", sort=sort, order=order)
+    after = first._replace(after_id="s01000", after_key=None if sort == "id" else "M")
+    for filters in (first, after):
+        plan = " | ".join(_page_plan(sqlite, filters))
+        assert f"INDEX {SORT_INDEXES[sort]} " in plan
+        assert "TEMP B-TREE" not in plan
+
+
+def test_sort_on_filtered_column_is_index_backed(stores) -> None:
+    sqlite, _ = stores
+    filters = SearchFilters("org_0", department="HR", sort="department", order="desc")
+    plan = " | ".join(_page_plan(sqlite, filters))
+    assert "idx_emp_org_dept_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.parametrize("order", SORT_ORDERS)
+@pytest.mark.parametrize("sort", SORT_FIELDS)
+def test_sorted_keyset_walk_matches_full_sort(stores, sort: str, order: str) -> None:
+    """Keyset pages on both engines equal a Python sort by (column, id)."""
+    sqlite, memory = stores
+    columns = ("name", "department", "location", "position", "id")
+    base = SearchFilters("org_0", location="HN", sort=sort, order=order, limit=2000)
+    everything, _ = sqlite.search_rows(base._replace(sort="id", order="asc"), columns)
+    col = columns.index(sort)
+    expected = sorted(everything, key=lambda row: (row[col], row[-1]), reverse=order == "desc")
+    assert sqlite.search_rows(base, columns)[0] == expected
+
+    for store in (sqlite, memory):
+        seen, filters = [], base._replace(limit=37)
+        while True:
+            rows, _ = store.search_rows(filters, columns)
+            seen.extend(rows)
+            if len(rows) < filters.limit:
+                break
+            last = rows[-1]
+            after_key = None if sort == "id" else last[col]
+            filters = filters._replace(after_id=last[-1], after_key=after_key)
+        assert seen == expected
+        offset_page = base._replace(limit=10, offset=55)
+        assert store.search_rows(offset_page, columns)[0] == expected[55:65]
+
+
+def test_merged_batch_keeps_sort(stores) -> None:
+    sqlite, _ = stores
+    batch = [
+        SearchFilters("org_1", department=dept, sort="name", order="desc", limit=5, offset=3)
+        for dept in ("HR", "Sales", "Engineering")
+    ]
+    columns = ("name", "id")
+    assert sqlite.search_many(batch, columns) == [sqlite.search_rows(f, columns) for f in batch]
+
+
+def test_unknown_sort_is_rejected_by_both_engines(stores) -> None:
+    for store in stores:
+        with pytest.raises(ValueError):
+            store.search_rows(SearchFilters("org_0", sort="email"), ("id",))
+
+
+def test_sorted_search_api(client: TestClient) -> None:
+    r = client.get(URL, params={"org_id": "org_a", "sort": "name", "order": "desc"})
+    assert r.status_code == 200
+    assert [i["name"] for i in r.json()["items"]] == [
+        "John Doe",
+        "Jane Smith",
+        "Bob Johnson",
+        "Alice Brown",
+    ]
+
+
+def test_sorted_cursor_walks_all_pages(client: TestClient) -> None:
+    """Sort ties on department are broken by id, across cursor pages."""
+    params = {"org_id": "org_a", "sort": "department", "limit": 100}
+    full = client.get(URL, params=params).json()["items"]
+    assert [i["department"] for i in full] == ["Engineering", "Engineering", "Finance", "HR"]
+    assert [i["name"] for i in full[:2]] == ["John Doe", "Bob Johnson"]
+
+    seen, params = [], {**params, "limit": 1}
+    while True:
+        data = client.get(URL, params=params).json()
+        seen.extend(data["items"])
+        if data["next_cursor"] is None:
+            break
+        params["cursor"] = data["next_cursor"]
+    assert seen == full
+
+
+def test_cursor_from_other_sort_is_rejected(client: TestClient) -> None:
+    params = {"org_id": "org_a", "limit": 1, "sort": "name"}
+    first = client.get(URL, params=params).json()
+    r = client.get(URL, params={**params, "order": "desc", "cursor": first["next_cursor"]})
+    assert r.status_code == 400
+
+
+def test_sort_rejections(client: TestClient) -> None:
+    # org_a does not show position; org_b does not show location.
+    assert client.get(URL, params={"org_id": "org_a", "sort": "position"}).status_code == 400
+    assert client.get(URL, params={"org_id": "org_b", "sort": "location"}).status_code == 400
+    assert client.get(URL, params={"org_id": "org_a", "sort": "email"}).status_code == 422
+    fuzzy = {"org_id": "org_b", "name": "Jon", "match": "fuzzy", "sort": "name"}
+    assert client.get(URL, params=fuzzy).status_code == 400
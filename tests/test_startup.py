@@ -0,0 +1,90 @@
+"""Unit tests for eager store initialization, warm-up and readiness."""
+import dataclasses
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import STARTUP_CONFIG
+from app.db import sqlite_store
+from app.db.memory_store import InMemoryEmployeeStore
+from app.db.sqlite_store import SQLiteEmployeeStore, _init_db
+from app.main import app
+from app.services import startup
+
+
+def test_concurrent_first_calls_initialize_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    sqlite_store.close_employee_store()
+    calls, real = [], sqlite_store._init_db
+    release = threading.Event()
+
+    def slow_init(*args, **kwargs) -> None:
+        calls.append(1)
+        assert release.wait(5)
+        real(*args, **kwargs)
+
+    monkeypatch.setattr(sqlite_store, "_init_db", slow_init)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(sqlite_store.get_employee_store) for _ in range(8)]
+        time.sleep(0.05)
+        release.set()
+        stores = [f.result() for f in futures]
+    assert len(calls) == 1
+    assert all(store is stores[0] for store in stores)
+
+
+def test_largest_orgs_and_warm(tmp_path: Path) -> None:
+    _init_db(tmp_path / "warm.sqlite3", seed=True)
+    store = SQLiteEmployeeStore(tmp_path / "warm.sqlite3")
+    memory = InMemoryEmployeeStore(tmp_path / "warm.sqlite3")
+    try:
+        sizes = {org: store.org_statistics(org).total for org in ("org_a", "org_b")}
+        store.invalidate_statistics()
+        assert store.largest_orgs(2) == sorted(sizes, key=sizes.get, reverse=True)
+        store.warm("org_b")
+        assert "org_b" in store._stats
+        memory.warm("org_a")
+        assert "org_a" in memory._segments
+    finally:
+        store.close()
+        memory.close()
+
+
+def _wait_until_ready(client: TestClient) -> dict:
+    deadline = time.monotonic() + 5
+    while (r := client.get("/health/ready")).status_code != 200:
+        assert r.status_code == 503 and r.json()["status"] in ("starting", "warming")
+        assert time.monotonic() < deadline, "warm-up did not finish"
+        time.sleep(0.01)
+    return r.json()
+
+
+def test_lifespan_initializes_warms_and_reports_ready() -> None:
+    with TestClient(app) as client:
+        progress = _wait_until_ready(client)
+        assert progress["warmed_orgs"] >= 2
+        assert progress["init_seconds"] >= 0 and progress["warmup_seconds"] >= 0
+        assert progress["warmup_error"] is None
+        text = client.get("/metrics").text
+        assert 'startup_duration_seconds{phase="init"}' in text
+        assert 'startup_duration_seconds{phase="warmup"}' in text
+        assert client.get("/api/v1/employees/search", params={"org_id": "org_a"}).status_code == 200
+    # Shut down: no longer ready.
+    r = TestClient(app).get("/health/ready")
+    assert r.status_code == 503 and r.json()["status"] == "stopped"
+
+
+def test_foreground_warmup_and_disabled_warmup() -> None:
+    try:
+        startup.start(dataclasses.replace(STARTUP_CONFIG, warmup_in_background=False))
+        ready, progress = startup.readiness()
+        assert ready and progress["warmed_orgs"] >= 2
+
+        startup.start(dataclasses.replace(STARTUP_CONFIG, warmup=False))
+        ready, progress = startup.readiness()
+        assert ready and progress["warmed_orgs"] == 0
+    finally:
+        startup.stop()